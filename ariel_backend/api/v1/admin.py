@@ -0,0 +1,63 @@
+# ariel_backend/api/v1/admin.py
+import logging
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+
+from ariel_backend.services.stt_manager import stt_manager, ModelCapacityError
+from ariel_backend.services.executor import stt_executor, ocr_executor
+from ariel_backend.services.client_quota import client_quotas, RATE_LIMITS
+
+router = APIRouter()
+logger = logging.getLogger("root")
+
+# --- 관리자 API: 재시작 없이 STT 모델을 조회/로드/언로드/고정 ---
+@router.get("/models")
+async def list_models_endpoint():
+    """모든 엔진의 STT 모델 로드 상태와 메모리 예산 사용량을 반환합니다."""
+    return stt_manager.list_models()
+
+async def _run_model_action(action, language: str, engine: Optional[str]) -> dict:
+    try:
+        # 모델 로딩은 수십 초가 걸릴 수 있으므로 이벤트 루프 밖에서 실행합니다.
+        return await run_in_threadpool(action, language, engine)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ModelCapacityError as e:
+        raise HTTPException(status_code=507, detail=str(e))
+    except Exception as e:
+        logger.error(f"Model admin action failed for '{language}': {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An error occurred while managing the model: {e}")
+
+@router.post("/models/{language}/load")
+async def load_model_endpoint(language: str, engine: Optional[str] = Query(None, description="STT engine (default: server default engine).")):
+    return await _run_model_action(stt_manager.load, language, engine)
+
+@router.post("/models/{language}/unload")
+async def unload_model_endpoint(language: str, engine: Optional[str] = Query(None, description="STT engine (default: server default engine).")):
+    return await _run_model_action(stt_manager.unload, language, engine)
+
+@router.post("/models/{language}/pin")
+async def pin_model_endpoint(language: str, engine: Optional[str] = Query(None, description="STT engine (default: server default engine).")):
+    return await _run_model_action(stt_manager.pin, language, engine)
+
+@router.delete("/models/{language}/pin")
+async def unpin_model_endpoint(language: str, engine: Optional[str] = Query(None, description="STT engine (default: server default engine).")):
+    return await _run_model_action(stt_manager.unpin, language, engine)
+
+# --- 관리자 API: 클라이언트별 사용량 ---
+@router.get("/clients")
+async def list_clients_endpoint():
+    """
+    클라이언트(X-Ariel-Client-Id)별 서비스 사용량을 반환합니다.
+    requests/rate_limited/errors/지연 시간은 요청 단위, scheduler 는 실행기 작업 단위(대기/실행 중 작업 수, 가중치, 워커 사용 시간)입니다.
+    """
+    clients = client_quotas.stats()
+    for kind, executor in (("stt", stt_executor), ("ocr", ocr_executor)):
+        for client_id, scheduler in executor.client_stats().items():
+            clients.setdefault(client_id, {}).setdefault(kind, {})["scheduler"] = scheduler
+    return {
+        "rate_limits_per_s": RATE_LIMITS,
+        "client_max_concurrency": {"stt": stt_executor.client_max_concurrency, "ocr": ocr_executor.client_max_concurrency},
+        "clients": clients,
+    }
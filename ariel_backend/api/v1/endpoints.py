@@ -1,58 +1,928 @@
 # ariel_backend/api/v1/endpoints.py
+import asyncio
+import json
 import logging
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
+import time
+from fastapi import APIRouter, UploadFile, File, HTTPException, Form, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.requests import ClientDisconnect
 
 # pydantic은 FastAPI에서 자동으로 import 되므로 명시적 import는 필요 없음
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional, Tuple
 
 # OCR 서비스는 그대로 유지
-from ariel_backend.services import ocr_service 
+from ariel_backend.services import config, ocr_service
+from ariel_backend.services.ocr_engine import ocr_engine
+from ariel_backend.services.ocr_preprocess import preprocess_stats, RawFrame, raw_frame_bytes
+from ariel_backend.services.ocr_profile import region_profiles, to_tesseract_languages
 # 새로운 STT 매니저를 import
-from ariel_backend.services.stt_manager import stt_manager
+from ariel_backend.services.stt_manager import stt_manager, accept_slices, ModelCapacityError, SAMPLE_RATE, MAX_AUDIO_AGE_S
+from ariel_backend.services.resource_pool import PoolTimeoutError
+from ariel_backend.services.translator import (
+    translation_service, get_translator, TranslatorUnavailableError, TranslationError,
+)
+from ariel_backend.services.single_flight import stt_flights, ocr_flights, flight_key
+from ariel_backend.services.executor import (
+    stt_executor, ocr_executor, current_client, QueueFullError, DeadlineExceededError, WorkCancelledError,
+)
+from ariel_backend.services.audio_gate import silence_gate
+from ariel_backend.services.audio_fingerprint import result_cache
+from ariel_backend.services.audio_codec import make_decoder, decode_audio, supported_encodings
+from ariel_backend.services.audio_segmenter import SilenceSplitter
+from ariel_backend.services.stt_engines import DEFAULT_ENGINE, MODEL_SIZE_ENGINES
+from ariel_backend.services import language_id
+from ariel_backend.services.stt_grammar import grammar_registry
 
 router = APIRouter()
 logger = logging.getLogger("root")
 
+# 작업을 기다리는 동안 클라이언트 연결이 끊겼는지 확인하는 주기(초)
+DISCONNECT_POLL_S = 0.1
+# /stt/raw 에서 세션을 열기 전에 모아 두는 최대 PCM 크기 (기본 2초, 16-bit mono).
+# 이보다 짧은 본문은 무음 게이트를 거쳐 한 번에 디코딩합니다.
+RAW_BUFFER_BYTES = config.get_int("ARIEL_STT_RAW_BUFFER_BYTES", SAMPLE_RATE * 2 * 2)
+# single-flight 키를 이벤트 루프에서 바로 해시할 최대 본문 크기. 이보다 크면 스레드에서 해시합니다.
+INLINE_HASH_BYTES = 64 * 1024
+
 # --- 응답 모델 정의 ---
+class OcrWord(BaseModel):
+    text: str
+    box: List[int]  # 원본 이미지 좌표 [x, y, w, h]
+    confidence: float  # 0~100
+
+class OcrLine(BaseModel):
+    text: str
+    box: List[int]
+    confidence: float
+    block: int
+    paragraph: int
+    words: List[OcrWord]
+
 class OcrResponse(BaseModel):
     text: str
+    # layout=true 일 때만 채워집니다.
+    width: Optional[int] = None
+    height: Optional[int] = None
+    lines: Optional[List[OcrLine]] = None
+    # 인식에 쓴 Tesseract 언어 조합과 페이지 분할 모드
+    languages: Optional[str] = None
+    psm: Optional[int] = None
+
+class TranslatedPatch(BaseModel):
+    original: str
+    translated: str
+    box: List[int]  # 원본 이미지 좌표 [x, y, w, h]
+    confidence: float
+
+class OcrTranslateResponse(BaseModel):
+    text: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    languages: Optional[str] = None
+    psm: Optional[int] = None
+    translator: str
+    target_lang: str
+    patches: List[TranslatedPatch]
+    # 단계별 소요 시간 (ocr: 대기열 포함 인식, translate: 번역 API)
+    timings_ms: dict
 
 class STTResponse(BaseModel):
     text: str
+    language: Optional[str] = None
 
-# --- API 엔드포인트 ---
-@router.post("/ocr", response_model=OcrResponse)
-async def ocr_image_endpoint(image_file: UploadFile = File(...)):
-    """이미지 파일에서 텍스트를 추출합니다."""
-    image_bytes = await image_file.read()
+class STTBatchItem(BaseModel):
+    index: int
+    language: str
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+class STTBatchResponse(BaseModel):
+    results: List[STTBatchItem]
+
+class GrammarRequest(BaseModel):
+    language: str
+    phrases: List[str]
+
+class GrammarResponse(BaseModel):
+    grammar_id: str
+    language: str
+    phrases: int
+
+class TranscriptSegment(BaseModel):
+    start: float
+    end: float
+    text: str
+
+class TranscriptResponse(BaseModel):
+    language: str
+    duration_s: float
+    text: str
+    segments: List[TranscriptSegment]
+
+def _busy_exception(e: QueueFullError) -> HTTPException:
+    """실행기 대기열이 가득 찼을 때 반환할 429 응답."""
+    logger.warning(str(e))
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def _stt_exception(e: Exception) -> HTTPException:
+    """STT 처리 중 발생한 예외를 HTTP 응답으로 변환합니다."""
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, QueueFullError):
+        return _busy_exception(e)
+    if isinstance(e, (DeadlineExceededError, WorkCancelledError)):
+        # 실행 도중 마감이 지나 스스로 멈춘 작업(WorkCancelledError)도 마감 초과로 응답합니다.
+        logger.info(f"Dropped stale STT request: {e}")
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, ValueError):
+        return HTTPException(status_code=400, detail=str(e))
+    if isinstance(e, PoolTimeoutError):
+        logger.warning(f"STT recognizer pool exhausted: {e}")
+        return HTTPException(status_code=503, detail=str(e))
+    if isinstance(e, ModelCapacityError):
+        logger.warning(f"STT model could not be loaded: {e}")
+        return HTTPException(status_code=503, detail=str(e))
+    logger.error(f"STT Error: {e}", exc_info=e)
+    return HTTPException(status_code=500, detail=f"An error occurred during STT processing: {e}")
+
+def _request_deadline(headers, deadline: Optional[float] = None,
+                      capture_time: Optional[float] = None) -> Tuple[Optional[float], Optional[float]]:
+    """
+    요청의 마감 시각과 녹음 시각(epoch 초)을 구합니다.
+    마감은 deadline(X-Ariel-Deadline) → X-Ariel-Timeout-Ms(지금부터 남은 ms) 순으로 찾고,
+    둘 다 없이 녹음 시각(capture_time / X-Ariel-Capture-Time)만 있으면 녹음 후 MAX_AUDIO_AGE_S 초를 마감으로 봅니다.
+    """
     try:
-        extracted_text = ocr_service.process_image_with_ocr(image_bytes)
+        if deadline is None and headers.get("x-ariel-deadline"):
+            deadline = float(headers["x-ariel-deadline"])
+        if deadline is None and headers.get("x-ariel-timeout-ms"):
+            deadline = time.time() + float(headers["x-ariel-timeout-ms"]) / 1000
+        if capture_time is None and headers.get("x-ariel-capture-time"):
+            capture_time = float(headers["x-ariel-capture-time"])
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Ariel-Deadline, X-Ariel-Timeout-Ms and X-Ariel-Capture-Time must be numbers.")
+    if deadline is None and capture_time is not None and MAX_AUDIO_AGE_S > 0:
+        deadline = capture_time + MAX_AUDIO_AGE_S
+    return deadline, capture_time
+
+async def _run_until_disconnect(request: Request, executor, fn, *args, deadline: Optional[float] = None,
+                                captured_at: Optional[float] = None, flights=None, key=None, **kwargs):
+    """
+    작업을 실행기에서 실행하고 결과를 기다리되, 그 사이 클라이언트 연결이 끊기면 작업을 취소합니다.
+    대기 중인 작업은 실행되지 않고, 실행 중인 작업은 check_cancelled() 지점에서 중단됩니다.
+    flights 와 key 를 주면 같은 key 로 진행 중인 작업이 있을 때 새로 실행하지 않고 그 결과를 함께 받습니다.
+    (같은 작업을 기다리는 다른 요청이 남아 있으면 연결이 끊겨도 작업은 계속됩니다)
+    """
+    def start():
+        return executor.submit(fn, args, kwargs, deadline=deadline, captured_at=captured_at)
+
+    task = asyncio.ensure_future(flights.run(key, start) if flights is not None else start())
+    while not task.done():
+        await asyncio.wait({task}, timeout=DISCONNECT_POLL_S)
+        if not task.done() and await request.is_disconnected():
+            task.cancel()
+            logger.info(f"Client disconnected. Cancelled {getattr(fn, '__name__', fn)}.")
+            raise HTTPException(status_code=499, detail="Client closed the request.")
+    return task.result()
+
+async def _flight_key(flights, payload, *params):
+    """
+    single-flight 키를 만듭니다. 합치기를 끈 경우에는 해시하지 않고 None 을 반환합니다.
+    화면 프레임처럼 큰 본문의 해시는 이벤트 루프를 막지 않도록 스레드에서 계산합니다.
+    """
+    if not flights.enabled:
+        return None
+    if len(payload) <= INLINE_HASH_BYTES:
+        return flight_key(payload, *params)
+    return await asyncio.to_thread(flight_key, payload, *params)
+
+def _stt_flight_params(language: str, session_id: Optional[str]) -> tuple:
+    # 'auto' 는 세션별로 캐시된 감지 결과(decision_cache)가 디코딩할 모델을 정하므로 세션이 다르면 합치지 않습니다.
+    return (language, session_id) if language == language_id.AUTO_LANGUAGE else (language,)
+
+async def _recognize(request: Request, image, layout: bool, tesseract_languages: Optional[str], region_id: Optional[str]):
+    """OCR 실행기에서 이미지(PNG 등의 bytes 또는 RawFrame)를 인식합니다. 같은 화면의 동시 요청은 한 번만 인식합니다."""
+    # Tesseract 호출은 블로킹이므로 OCR 전용 실행기에서 실행합니다.
+    fn = ocr_service.process_image_with_layout if layout else ocr_service.process_image_with_ocr
+    # 같은 화면을 동시에 보낸 요청(같은 스트림을 보는 여러 클라이언트, 시간 초과 후 재전송)은 한 번만 인식합니다.
+    # region_id 를 주면 클라이언트의 감시 영역별 프로필(방향/문자 체계 감지, 자동 언어)로 인식 설정이 달라지므로
+    # 그때만 클라이언트와 영역을 키에 넣습니다. (region_id 가 없으면 자동 언어도 감지 없이 기본 언어를 씀)
+    params = (fn.__name__, tesseract_languages) + ((current_client.get(), region_id) if region_id else ())
+    if isinstance(image, RawFrame):
+        key = await _flight_key(ocr_flights, image.buffer, *params, image.pixel_format, image.width, image.height, image.stride)
+    else:
+        key = await _flight_key(ocr_flights, image, *params)
+    return await _run_until_disconnect(request, ocr_executor, fn, image, tesseract_languages, region_id,
+                                       flights=ocr_flights, key=key)
+
+async def _ocr_response(request: Request, image, layout: bool, tesseract_languages: Optional[str], region_id: Optional[str]):
+    try:
+        result = await _recognize(request, image, layout, tesseract_languages, region_id)
+        if layout:
+            return result
+        extracted_text = result
         return {"text": extracted_text}
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise _busy_exception(e)
     except Exception as e:
         logger.error(f"OCR Error: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"An error occurred during OCR processing: {e}")
 
+async def _ocr_languages(languages: Optional[str]) -> Optional[str]:
+    try:
+        if ocr_engine.installed_languages_loaded:
+            return to_tesseract_languages(languages)
+        # 워밍업이 끝나기 전이면 설치된 언어 목록 조회가 tesseract 를 실행하므로 스레드에서 검사합니다.
+        return await asyncio.to_thread(to_tesseract_languages, languages)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _raw_frame(request: Request, pixel_format: str, width: int, height: int, stride: Optional[int]) -> RawFrame:
+    """
+    application/octet-stream 본문을 원시 프레임으로 받습니다. (multipart 파싱/임시 파일 없이)
+    본문은 프레임 크기(stride * height)까지만 받으며, 그보다 크면 버퍼에 모으기 전에 413 으로 거부합니다.
+    """
+    try:
+        max_bytes = raw_frame_bytes(width, height, pixel_format, stride)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    too_large = HTTPException(status_code=413, detail=f"Frame body is larger than {max_bytes} bytes for {width}x{height} {pixel_format}.")
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    chunks, received = [], 0
+    async for chunk in request.stream():
+        received += len(chunk)
+        if received > max_bytes:
+            raise too_large
+        chunks.append(chunk)
+    try:
+        return RawFrame(b"".join(chunks), width, height, pixel_format, stride)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# --- API 엔드포인트 ---
+@router.post("/ocr", response_model=OcrResponse)
+async def ocr_image_endpoint(
+    request: Request,
+    image_file: UploadFile = File(...),
+    layout: bool = Query(False, description="Also return lines and words with bounding boxes and confidences."),
+    languages: Optional[str] = Query(None, description="Source languages, e.g. 'JA', 'ko,en' or 'kor+eng'. 'auto' detects the script per region."),
+    region_id: Optional[str] = Query(None, max_length=64, description="Identifies the monitored region so its detected profile is reused."),
+):
+    """
+    이미지 파일에서 텍스트를 추출합니다. 결과를 기다리던 클라이언트가 떠나면 대기 중인 OCR 은 실행하지 않습니다.
+    layout=true 이면 text 와 함께 글줄/단어별 위치(원본 이미지 좌표)와 신뢰도를 lines 로 반환합니다.
+    languages 를 주면 그 언어의 traineddata 만으로 인식하고, region_id 를 주면 영역마다 처음 한 번 감지한
+    문자 체계/방향/분할 모드를 이후 프레임에 다시 씁니다.
+    """
+    tesseract_languages = await _ocr_languages(languages)
+    image_bytes = await image_file.read()
+    return await _ocr_response(request, image_bytes, layout, tesseract_languages, region_id)
+
+@router.post("/ocr/raw", response_model=OcrResponse)
+async def ocr_raw_endpoint(
+    request: Request,
+    width: int = Query(..., description="Frame width in pixels."),
+    height: int = Query(..., description="Frame height in pixels."),
+    pixel_format: str = Query("bgra", alias="format", description="Pixel format: 'bgra' (screen capture as-is) or 'gray' (8-bit)."),
+    stride: Optional[int] = Query(None, description="Bytes per row. Defaults to width * bytes per pixel."),
+    layout: bool = Query(False, description="Also return lines and words with bounding boxes and confidences."),
+    languages: Optional[str] = Query(None, description="Source languages, e.g. 'JA', 'ko,en' or 'kor+eng'. 'auto' detects the script per region."),
+    region_id: Optional[str] = Query(None, max_length=64, description="Identifies the monitored region so its detected profile is reused."),
+):
+    """
+    /ocr 과 같지만 PNG 대신 화면 캡처 픽셀 버퍼(application/octet-stream)를 그대로 받습니다.
+    클라이언트의 PNG 인코딩과 서버의 디코딩을 모두 건너뛰며, 버퍼는 복사 없이 NumPy 배열로 감싸 전처리합니다.
+    """
+    tesseract_languages = await _ocr_languages(languages)
+    frame = await _raw_frame(request, pixel_format, width, height, stride)
+    return await _ocr_response(request, frame, layout, tesseract_languages, region_id)
+
+def _translation_source(source_lang: Optional[str]) -> Optional[str]:
+    """OCR 언어 지정을 번역기 원문 언어로 바꿉니다. 자동이거나 여러 언어를 지정했으면 번역기가 감지하도록 None."""
+    if not source_lang or source_lang.lower() == "auto" or any(sep in source_lang for sep in ",+"):
+        return None
+    return source_lang.strip()
+
+def _translator(name: Optional[str]):
+    try:
+        return get_translator(name)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _ocr_translate_response(request: Request, image, target_lang: str, source_lang: Optional[str],
+                                  region_id: Optional[str], engine, tesseract_languages: Optional[str]):
+    api_key = request.headers.get("x-ariel-deepl-key")
+    try:
+        started = time.monotonic()
+        # /ocr?layout=true 와 같은 키를 써서, 같은 화면의 인식 요청과도 합쳐집니다.
+        result = await _recognize(request, image, True, tesseract_languages, region_id)
+        ocr_s = time.monotonic() - started
+        lines = result["lines"]
+        started = time.monotonic()
+        translated = await translation_service.translate_async(
+            [line["text"] for line in lines], _translation_source(source_lang), target_lang, engine.name, api_key,
+        ) if lines else []
+        translate_s = time.monotonic() - started
+    except HTTPException:
+        raise
+    except QueueFullError as e:
+        raise _busy_exception(e)
+    except TranslatorUnavailableError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except TranslationError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=502, detail=str(e))
+    except Exception as e:
+        logger.error(f"OCR translate Error: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"An error occurred during OCR translation: {e}")
+
+    return {
+        "text": result["text"],
+        "width": result.get("width"),
+        "height": result.get("height"),
+        "languages": result.get("languages"),
+        "psm": result.get("psm"),
+        "translator": engine.name,
+        "target_lang": target_lang.upper(),
+        # 합쳐진 요청끼리 결과를 공유하므로 인식 결과는 고치지 않고 새 패치를 만듭니다.
+        "patches": [
+            {"original": line["text"], "translated": text, "box": line["box"], "confidence": line["confidence"]}
+            for line, text in zip(lines, translated)
+        ],
+        "timings_ms": {"ocr": round(ocr_s * 1000, 2), "translate": round(translate_s * 1000, 2)},
+    }
+
+@router.post("/ocr/translate", response_model=OcrTranslateResponse)
+async def ocr_translate_endpoint(
+    request: Request,
+    image_file: UploadFile = File(...),
+    target_lang: str = Query(..., description="Target language code, e.g. 'KO' or 'EN-US'."),
+    source_lang: Optional[str] = Query(None, description="Source language, e.g. 'JA'. Used for OCR and translation. 'auto' detects."),
+    region_id: Optional[str] = Query(None, max_length=64, description="Identifies the monitored region so its detected profile is reused."),
+    translator: Optional[str] = Query(None, description="Translator name ('deepl', 'echo'). Defaults to ARIEL_TRANSLATOR."),
+):
+    """
+    이미지에서 글줄을 인식하고, 글줄들을 한 번의 번역 호출로 번역하여 바로 그릴 수 있는 패치(원문, 번역, 원본 이미지 좌표 상자)로 반환합니다.
+    클라이언트가 OCR 과 번역을 따로 요청하는 두 번의 왕복을 한 번으로 줄입니다.
+    이전 화면에서 번역한 글줄은 서버의 번역 캐시를 쓰며, DeepL 키는 서버 설정(ARIEL_DEEPL_API_KEY) 또는 X-Ariel-DeepL-Key 헤더로 줍니다.
+    """
+    tesseract_languages = await _ocr_languages(source_lang)
+    engine = _translator(translator)
+    image_bytes = await image_file.read()
+    return await _ocr_translate_response(request, image_bytes, target_lang, source_lang, region_id, engine, tesseract_languages)
+
+@router.post("/ocr/translate/raw", response_model=OcrTranslateResponse)
+async def ocr_translate_raw_endpoint(
+    request: Request,
+    width: int = Query(..., description="Frame width in pixels."),
+    height: int = Query(..., description="Frame height in pixels."),
+    target_lang: str = Query(..., description="Target language code, e.g. 'KO' or 'EN-US'."),
+    pixel_format: str = Query("bgra", alias="format", description="Pixel format: 'bgra' (screen capture as-is) or 'gray' (8-bit)."),
+    stride: Optional[int] = Query(None, description="Bytes per row. Defaults to width * bytes per pixel."),
+    source_lang: Optional[str] = Query(None, description="Source language, e.g. 'JA'. Used for OCR and translation. 'auto' detects."),
+    region_id: Optional[str] = Query(None, max_length=64, description="Identifies the monitored region so its detected profile is reused."),
+    translator: Optional[str] = Query(None, description="Translator name ('deepl', 'echo'). Defaults to ARIEL_TRANSLATOR."),
+):
+    """/ocr/translate 와 같지만 PNG 대신 화면 캡처 픽셀 버퍼(application/octet-stream)를 그대로 받습니다. (/ocr/raw 참고)"""
+    tesseract_languages = await _ocr_languages(source_lang)
+    engine = _translator(translator)
+    frame = await _raw_frame(request, pixel_format, width, height, stride)
+    return await _ocr_translate_response(request, frame, target_lang, source_lang, region_id, engine, tesseract_languages)
+
 @router.post("/stt", response_model=STTResponse)
 async def stt_audio_endpoint(
+    request: Request,
     audio_file: UploadFile = File(...),
-    language: str = Form("ko", description="Language for transcription (e.g., 'en', 'ko', 'ja').")
+    language: str = Form("ko", description="Language for transcription (e.g., 'en', 'ko', 'ja')."),
+    silence_threshold_db: Optional[float] = Form(None, description="Chunks quieter than this (dBFS) are skipped without decoding."),
+    encoding: str = Form("pcm", description="Audio transport encoding. See GET /stt/encodings."),
+    model_size: Optional[str] = Form(None, description="'tiny'/'base'/'small' (fast) or 'medium'/'large' (accurate), or an engine name."),
+    session_id: Optional[str] = Form(None, description="Client session id. With language='auto', the detected language is reused for this session."),
+    grammar_id: Optional[str] = Form(None, description="Restrict recognition to a phrase list registered with POST /stt/grammars."),
+    deadline: Optional[float] = Form(None, description="Epoch seconds after which the result is useless. Falls back to X-Ariel-Deadline."),
+    capture_time: Optional[float] = Form(None, description="Epoch seconds when the audio was captured. Falls back to X-Ariel-Capture-Time.")
 ):
     """
     오디오 파일을 받아 지정된 언어로 음성 인식을 수행합니다.
-    - language: 'ko', 'en', 'ja' 등 STT 매니저에 의해 지원되는 언어 코드
+    - language: 'ko', 'en', 'ja' 등 STT 매니저에 의해 지원되는 언어 코드, 또는 자동 감지 'auto'
+    - silence_threshold_db: 무음 게이트 임계값. 지정하지 않으면 언어별/기본 설정값을 사용합니다.
+    - encoding: 'pcm'(기본), 'zlib-delta', 'mulaw', 'flac' 등 오디오 전송 인코딩
+    - model_size: 지연 시간(소형 모델)과 정확도(대형 모델) 중 우선할 쪽. GET /stt/engines 참고
+    - session_id: 'auto' 일 때 감지된 언어를 세션별로 캐시하여 다음 요청부터 감지를 건너뜁니다.
+    - grammar_id: 등록된 구문 목록만 인식하는 빠른 디코딩 모드 (명령어, 캐릭터 이름 등)
+    - deadline / capture_time: 마감이 지나도록 대기열에 있던 요청은 디코딩하지 않고 504 로 버립니다.
+      과부하 시에는 녹음 시각이 최근인 오디오를 먼저 디코딩하며, 클라이언트가 연결을 끊으면 작업을 취소합니다.
     """
     logger.debug(f"STT request received for language '{language}'.")
     audio_bytes = await audio_file.read()
-    
+    deadline, capture_time = _request_deadline(request.headers, deadline, capture_time)
+
     try:
-        transcribed_text = stt_manager.process_stt_request(
+        # 압축 해제도 CPU 작업이므로 이벤트 루프를 막지 않도록 STT 실행기에서 실행합니다.
+        audio_bytes = await stt_executor.submit(decode_audio, (audio_bytes, encoding), deadline=deadline, captured_at=capture_time)
+        # recognizer 풀에서 병렬로 디코딩할 수 있도록 STT 전용 실행기에서 실행합니다.
+        # 같은 오디오를 동시에 보낸 요청은 한 번만 디코딩합니다.
+        key = await _flight_key(stt_flights, audio_bytes, *_stt_flight_params(language, session_id),
+                                silence_threshold_db, model_size, grammar_id)
+        transcribed_text = await _run_until_disconnect(
+            request,
+            stt_executor,
+            stt_manager.process_stt_request,
+            deadline=deadline,
+            captured_at=capture_time,
+            flights=stt_flights,
+            key=key,
             audio_data=audio_bytes,
-            language=language
+            language=language,
+            silence_threshold_db=silence_threshold_db,
+            model_size=model_size,
+            session_id=session_id,
+            grammar_id=grammar_id
         )
         return {"text": transcribed_text}
+    except Exception as e:
+        raise _stt_exception(e)
+
+def _feed_session(session, decoder, chunk: bytes) -> List[str]:
+    return accept_slices(session, decoder.decode(chunk))
+
+def _finish_session(session, decoder) -> List[str]:
+    texts = accept_slices(session, decoder.flush())
+    texts.append(session.finish()["text"])
+    return [text for text in texts if text]
+
+def _split_chunk(decoder, splitter, chunk: bytes) -> List[Tuple[float, bytes]]:
+    return splitter.feed(decoder.decode(chunk))
+
+def _split_tail(decoder, splitter) -> List[Tuple[float, bytes]]:
+    return splitter.feed(decoder.flush()) + splitter.flush()
+
+@router.post("/stt/raw", response_model=STTResponse)
+async def stt_raw_endpoint(
+    request: Request,
+    language: Optional[str] = Query(None, description="Language code. Falls back to the X-Ariel-Language header."),
+    sample_format: Optional[str] = Query(None, description="'s16le' (default) or 'f32le'. Falls back to X-Ariel-Sample-Format."),
+    sample_rate: Optional[int] = Query(None, description="Must be 16000. Falls back to X-Ariel-Sample-Rate."),
+    encoding: Optional[str] = Query(None, description="Audio transport encoding. Falls back to X-Ariel-Audio-Encoding."),
+    model_size: Optional[str] = Query(None, description="Model size or engine name. Falls back to X-Ariel-Model-Size."),
+    session_id: Optional[str] = Query(None, description="Client session id for 'auto' language. Falls back to X-Ariel-Session-Id."),
+    grammar_id: Optional[str] = Query(None, description="Registered grammar id. Falls back to X-Ariel-Grammar-Id."),
+    silence_threshold_db: Optional[float] = Query(None, description="Short bodies quieter than this (dBFS) are skipped without decoding."),
+):
+    """
+    application/octet-stream 으로 보낸 Mono PCM 본문을 multipart 파싱 없이 받아 음성 인식을 수행합니다.
+    RAW_BUFFER_BYTES 이하의 짧은 본문(실시간 자막 청크)은 모아서 무음 게이트를 거친 뒤 한 번에 디코딩하고,
+    그보다 긴 본문은 전체를 메모리에 모으지 않고 도착하는 대로 (압축되어 있다면 풀어서) recognizer에 이어서 넣습니다.
+    X-Ariel-Deadline / X-Ariel-Timeout-Ms / X-Ariel-Capture-Time 을 주면 마감이 지난 요청은 504 로 버리고,
+    클라이언트가 연결을 끊으면 남은 디코딩을 취소합니다.
+    """
+    headers = request.headers
+    deadline, capture_time = _request_deadline(headers)
+    language = language or headers.get("x-ariel-language", "ko")
+    sample_format = sample_format or headers.get("x-ariel-sample-format", "s16le")
+    encoding = encoding or headers.get("x-ariel-audio-encoding", "pcm")
+    model_size = model_size or headers.get("x-ariel-model-size")
+    session_id = session_id or headers.get("x-ariel-session-id")
+    grammar_id = grammar_id or headers.get("x-ariel-grammar-id")
+    try:
+        sample_rate = sample_rate or int(headers.get("x-ariel-sample-rate", SAMPLE_RATE))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Ariel-Sample-Rate must be an integer.")
+    if sample_rate != SAMPLE_RATE:
+        raise HTTPException(status_code=400, detail=f"Unsupported sample rate: {sample_rate}. Only {SAMPLE_RATE} Hz is supported.")
+    try:
+        decoder = make_decoder(encoding, sample_format)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+
+    logger.debug(f"Raw STT request received for language '{language}' ({encoding}, {sample_format}).")
+    # 세션을 열기 전까지 모아 둔 PCM. 본문이 RAW_BUFFER_BYTES 를 넘으면 세션을 열어 이어서 디코딩합니다.
+    buffered = []
+    buffered_bytes = 0
+    session = None
+    texts = []
+
+    def submit(fn, *args):
+        # 본문을 받는 동안 제출하는 작업에도 모두 같은 마감을 적용합니다. (마감이 지나면 504)
+        return stt_executor.submit(fn, args, deadline=deadline, captured_at=capture_time)
+
+    try:
+        async for chunk in request.stream():
+            if not chunk:
+                continue
+            if session is not None:
+                texts += await submit(_feed_session, session, decoder, chunk)
+                continue
+            pcm = await submit(decoder.decode, chunk)
+            buffered.append(pcm)
+            buffered_bytes += len(pcm)
+            if buffered_bytes > RAW_BUFFER_BYTES:
+                session = await submit(stt_manager.open_session, language, model_size, session_id, grammar_id)
+                texts += await submit(accept_slices, session, b"".join(buffered))
+                buffered = []
+
+        # 본문을 다 받은 뒤의 마지막 디코딩은 클라이언트 연결이 끊기면 취소합니다.
+        if session is None:
+            # 같은 오디오를 동시에 보낸 짧은 본문은 /stt 와 같이 한 번만 디코딩합니다. (응답 형식이 달라 /stt 와는 키를 나눔)
+            pcm = b"".join(buffered) + decoder.flush()
+            key = await _flight_key(stt_flights, pcm, "raw", *_stt_flight_params(language, session_id),
+                                    silence_threshold_db, model_size, grammar_id)
+            result = await _run_until_disconnect(
+                request,
+                stt_executor,
+                stt_manager.process_raw_request,
+                pcm,
+                language,
+                model_size,
+                session_id,
+                grammar_id,
+                silence_threshold_db,
+                deadline=deadline,
+                captured_at=capture_time,
+                flights=stt_flights,
+                key=key,
+            )
+            logger.info(f"Raw transcription result for '{result['language']}': {result['text']}")
+            return result
+
+        texts += await _run_until_disconnect(request, stt_executor, _finish_session, session, decoder,
+                                             deadline=deadline, captured_at=capture_time)
+    except ClientDisconnect:
+        logger.info("Client disconnected while uploading raw STT audio.")
+        raise HTTPException(status_code=499, detail="Client closed the request.")
     except Exception as e:
-        logger.error(f"STT Error: {e}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"An error occurred during STT processing: {e}")
\ No newline at end of file
+        raise _stt_exception(e)
+    finally:
+        if session is not None:
+            session.close()
+
+    text = " ".join(texts)
+    logger.info(f"Raw transcription result for '{session.language}': {text}")
+    return {"text": text, "language": session.language}
+
+def _split_batch(languages: List[str], parallelism: int) -> List[tuple]:
+    """
+    세그먼트를 언어별로 묶은 뒤, 언어별 세그먼트 수에 비례하여 최대 parallelism 개의 작업으로 나눕니다.
+    각 작업은 recognizer 하나로 세그먼트를 차례대로 처리합니다.
+    """
+    groups = {}
+    for index, lang in enumerate(languages):
+        groups.setdefault(lang, []).append(index)
+
+    shards = []
+    for lang, indices in groups.items():
+        count = max(1, min(len(indices), round(parallelism * len(indices) / len(languages))))
+        for i in range(count):
+            shards.append((lang, indices[i::count]))
+    return shards
+
+async def _run_batch(payloads: List[bytes], languages: List[str], results: asyncio.Queue,
+                     silence_threshold_db: Optional[float] = None, model_size: Optional[str] = None,
+                     session_id: Optional[str] = None, grammar_id: Optional[str] = None,
+                     deadline: Optional[float] = None, captured_at: Optional[float] = None):
+    """배치 작업을 STT 실행기에 분배하고, 끝나는 순서대로 (index, text, error) 를 results 큐에 넣습니다."""
+    loop = asyncio.get_running_loop()
+
+    def on_result(index: int, text: str):
+        loop.call_soon_threadsafe(results.put_nowait, (index, text, None))
+
+    async def run_shard(lang: str, indices: List[int]):
+        try:
+            await stt_executor.submit(
+                stt_manager.process_stt_batch,
+                ([(i, payloads[i]) for i in indices], lang, on_result, silence_threshold_db, model_size, session_id, grammar_id),
+                deadline=deadline,
+                captured_at=captured_at,
+            )
+        except Exception as e:
+            # 대여/모델 로드 단계의 오류는 디코딩 전에 발생하므로, 작업의 모든 세그먼트를 실패로 보고합니다.
+            for i in indices:
+                results.put_nowait((i, None, e))
+
+    await asyncio.gather(*(run_shard(lang, indices) for lang, indices in _split_batch(languages, stt_executor.max_workers)))
+
+def _decode_batch(encoded: List[bytes], encoding: str) -> List[bytes]:
+    return [decode_audio(data, encoding) for data in encoded]
+
+def _batch_error_detail(e: Exception) -> str:
+    if isinstance(e, (ValueError, QueueFullError, PoolTimeoutError, ModelCapacityError, DeadlineExceededError)):
+        return str(e)
+    logger.error(f"STT batch error: {e}", exc_info=e)
+    return f"An error occurred during STT processing: {e}"
+
+@router.post("/stt/batch", response_model=STTBatchResponse)
+async def stt_batch_endpoint(
+    request: Request,
+    segments: List[UploadFile] = File(..., description="16kHz, 16-bit, Mono PCM segments."),
+    languages: List[str] = Form([], description="Per-segment languages. Falls back to 'language' when omitted."),
+    language: str = Form("ko", description="Default language for all segments."),
+    stream: bool = Query(False, description="Stream results as NDJSON in completion order."),
+    silence_threshold_db: Optional[float] = Form(None, description="Segments quieter than this (dBFS) are skipped without decoding."),
+    encoding: str = Form("pcm", description="Audio transport encoding shared by all segments."),
+    model_size: Optional[str] = Form(None, description="Model size or engine name shared by all segments."),
+    session_id: Optional[str] = Form(None, description="Client session id for segments with language 'auto'."),
+    grammar_id: Optional[str] = Form(None, description="Registered grammar id shared by all segments."),
+    deadline: Optional[float] = Form(None, description="Epoch seconds after which results are useless. Falls back to X-Ariel-Deadline."),
+    capture_time: Optional[float] = Form(None, description="Epoch seconds when the audio was captured. Falls back to X-Ariel-Capture-Time."),
+):
+    """
+    여러 오디오 세그먼트를 한 번의 요청으로 받아 recognizer 풀에 나누어 디코딩합니다.
+    기본적으로 모든 결과를 입력 순서대로 반환하며, stream=true 이면 끝나는 순서대로 NDJSON 한 줄씩 내보냅니다.
+    클라이언트가 연결을 끊으면 남은 세그먼트는 디코딩하지 않습니다.
+    """
+    if languages and len(languages) != len(segments):
+        raise HTTPException(status_code=400, detail="The number of languages must match the number of segments.")
+    segment_languages = languages or [language] * len(segments)
+    deadline, capture_time = _request_deadline(request.headers, deadline, capture_time)
+    encoded = [await segment.read() for segment in segments]
+    try:
+        # 압축 해제(FLAC 등)도 CPU 작업이므로 이벤트 루프를 막지 않도록 STT 실행기에서 실행합니다.
+        payloads = await stt_executor.submit(_decode_batch, (encoded, encoding), deadline=deadline, captured_at=capture_time)
+    except Exception as e:
+        raise _stt_exception(e)
+    logger.debug(f"STT batch request received: {len(payloads)} segments.")
+
+    results = asyncio.Queue()
+    batch_task = asyncio.ensure_future(_run_batch(payloads, segment_languages, results, silence_threshold_db,
+                                              model_size, session_id, grammar_id, deadline, capture_time))
+
+    if stream:
+        async def ndjson_lines():
+            try:
+                for _ in range(len(payloads)):
+                    index, text, error = await results.get()
+                    item = {"index": index, "language": segment_languages[index]}
+                    if error is None:
+                        item["text"] = text
+                    else:
+                        item["error"] = _batch_error_detail(error)
+                    yield json.dumps(item, ensure_ascii=False) + "\n"
+            finally:
+                # 모든 결과를 보내기 전에 연결이 끊겼다면 남은 작업을 취소합니다.
+                if not batch_task.done():
+                    batch_task.cancel()
+                    logger.info("STT batch stream closed early. Cancelled remaining segments.")
+
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+    while not batch_task.done():
+        await asyncio.wait({batch_task}, timeout=DISCONNECT_POLL_S)
+        if not batch_task.done() and await request.is_disconnected():
+            batch_task.cancel()
+            logger.info("Client disconnected. Cancelled STT batch.")
+            raise HTTPException(status_code=499, detail="Client closed the request.")
+    batch_task.result()
+    # 일부 세그먼트가 실패해도 나머지 결과는 버리지 않고, 실패한 항목에만 error 를 채워 돌려줍니다.
+    items = [None] * len(payloads)
+    while not results.empty():
+        index, text, error = results.get_nowait()
+        items[index] = {"index": index, "language": segment_languages[index], "text": text}
+        if error is not None:
+            items[index]["error"] = _batch_error_detail(error)
+    return {"results": items}
+
+def _srt_timestamp(seconds: float) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3600000)
+    minutes, millis = divmod(millis, 60000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+def _to_srt(segments: List[dict]) -> str:
+    blocks = [
+        f"{number}\n{_srt_timestamp(seg['start'])} --> {_srt_timestamp(seg['end'])}\n{seg['text']}\n"
+        for number, seg in enumerate(segments, start=1)
+    ]
+    return "\n".join(blocks)
+
+@router.post("/stt/transcribe", response_model=TranscriptResponse)
+async def stt_transcribe_endpoint(
+    request: Request,
+    language: Optional[str] = Query(None, description="Language code or 'auto'. Falls back to the X-Ariel-Language header."),
+    encoding: Optional[str] = Query(None, description="'wav' or a transport encoding. Defaults to 'wav' for audio/wav bodies, otherwise 'pcm'."),
+    sample_format: Optional[str] = Query(None, description="'s16le' (default) or 'f32le' for raw PCM bodies."),
+    output: str = Query("json", description="'json' or 'srt'."),
+    silence_threshold_db: Optional[float] = Query(None, description="Frames quieter than this (dBFS) count as silence when splitting."),
+    model_size: Optional[str] = Query(None, description="Model size or engine name. Falls back to X-Ariel-Model-Size."),
+    session_id: Optional[str] = Query(None, description="Client session id for 'auto' language. Falls back to X-Ariel-Session-Id."),
+):
+    """
+    회의 녹음, VOD 등 긴 오디오 파일을 받아 타임스탬프가 붙은 전사 결과(JSON 또는 SRT)를 반환합니다.
+    본문을 받는 대로 무음 경계에서 조각으로 나누어 recognizer 풀에서 병렬로 디코딩하고, 결과를 순서대로 이어 붙입니다.
+    동시에 디코딩하는 조각 수를 STT 워커 수로 제한하므로, 파일 길이와 상관없이 메모리 사용량이 일정합니다.
+    X-Ariel-Deadline / X-Ariel-Timeout-Ms 를 주면 마감이 지난 조각은 디코딩하지 않고 504 로 끝내며,
+    클라이언트가 연결을 끊으면 남은 조각의 디코딩을 모두 취소합니다.
+    """
+    headers = request.headers
+    deadline, capture_time = _request_deadline(headers)
+    language = language or headers.get("x-ariel-language", "ko")
+    model_size = model_size or headers.get("x-ariel-model-size")
+    session_id = session_id or headers.get("x-ariel-session-id")
+    if not encoding:
+        content_type = headers.get("content-type", "")
+        encoding = "wav" if content_type.startswith(("audio/wav", "audio/x-wav", "audio/wave")) else "pcm"
+    if output not in ("json", "srt"):
+        raise HTTPException(status_code=400, detail=f"Unsupported output format: {output}. Use 'json' or 'srt'.")
+    try:
+        decoder = make_decoder(encoding, sample_format or "s16le")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    splitter = SilenceSplitter(silence_gate.threshold_for(language, silence_threshold_db))
+    in_flight = asyncio.Semaphore(stt_executor.max_workers)
+    tasks = []
+
+    async def decode_chunk(start_s: float, pcm: bytes) -> List[dict]:
+        try:
+            return await stt_executor.submit(stt_manager.transcribe_chunk,
+                                             (pcm, language, start_s, silence_threshold_db, model_size),
+                                             deadline=deadline, captured_at=capture_time)
+        finally:
+            in_flight.release()
+
+    async def submit(chunks):
+        nonlocal language
+        for start_s, pcm in chunks:
+            if language == language_id.AUTO_LANGUAGE:
+                language = await stt_executor.submit(stt_manager.detect_language, (pcm, model_size, session_id),
+                                                     deadline=deadline, captured_at=capture_time)
+            # 디코딩 중인 조각이 워커 수만큼 쌓이면 본문 읽기를 멈추고 기다립니다. (업로드 쪽으로 역압 전달)
+            await in_flight.acquire()
+            tasks.append(asyncio.ensure_future(decode_chunk(start_s, pcm)))
+
+    logger.debug(f"Long-form transcription request received for language '{language}' ({encoding}).")
+    started = asyncio.get_running_loop().time()
+    try:
+        # 디코딩과 무음 분할도 CPU 작업이므로 스레드에서 실행합니다. (STT 실행기를 쓰면 대기열이 찼을 때
+        # 업로드 도중에 429 로 끊기므로 쓰지 않음. 호출은 순서대로 await 하므로 디코더 상태는 한 스레드만 만짐)
+        async for chunk in request.stream():
+            if chunk:
+                await submit(await asyncio.to_thread(_split_chunk, decoder, splitter, chunk))
+        await submit(await asyncio.to_thread(_split_tail, decoder, splitter))
+        # 본문을 다 받은 뒤에는 남은 조각을 기다리는 동안 연결이 끊겼는지 확인합니다.
+        # (업로드 도중의 연결 끊김은 request.stream() 이 ClientDisconnect 로 알려 줌)
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, timeout=DISCONNECT_POLL_S, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+            if pending and await request.is_disconnected():
+                raise ClientDisconnect()
+        chunk_results = [task.result() for task in tasks]
+    except ClientDisconnect:
+        for task in tasks:
+            task.cancel()
+        logger.info("Client disconnected. Cancelled long-form transcription.")
+        raise HTTPException(status_code=499, detail="Client closed the request.")
+    except Exception as e:
+        for task in tasks:
+            task.cancel()
+        raise _stt_exception(e)
+
+    segments = [segment for chunk_segments in chunk_results for segment in chunk_segments]
+    logger.info(f"Long-form transcription for '{language}': {splitter.duration_s:.1f}s of audio in {len(tasks)} chunks, "
+                f"{asyncio.get_running_loop().time() - started:.1f}s")
+    if output == "srt":
+        return PlainTextResponse(_to_srt(segments), media_type="application/x-subrip")
+    return {
+        "language": language,
+        "duration_s": round(splitter.duration_s, 3),
+        "text": " ".join(segment["text"] for segment in segments),
+        "segments": segments,
+    }
+
+@router.websocket("/stt/stream")
+async def stt_stream_endpoint(websocket: WebSocket, language: str = "ko", encoding: str = "pcm",
+                              model_size: Optional[str] = None, session_id: Optional[str] = None,
+                              grammar_id: Optional[str] = None):
+    """
+    WebSocket 스트리밍 STT. 연결 하나에 recognizer 하나가 세션 수명 동안 묶입니다.
+    - 클라이언트 → 서버: 16kHz, 16-bit, Mono PCM 바이너리 프레임 (길이 제한 없음, ?encoding= 으로 압축 전송 가능)
+    - 클라이언트 → 서버: 텍스트 제어 메시지 {"type": "flush"} (확정 결과 요청) / {"type": "eof"} (확정 후 종료)
+    - 서버 → 클라이언트: {"type": "partial" | "final", "text": "..."} / 오류 시 {"type": "error", "detail": "..."}
+    - grammar_id 를 주면 등록된 구문만 인식하는 recognizer로 세션을 엽니다. (명령어 인식용 저지연 모드)
+    - language=auto 이면 처음 몇 초 동안 후보 언어를 병렬로 디코딩하여 언어를 정하고, 이후 결과에 "language" 를 함께 보냅니다.
+    """
+    await websocket.accept()
+    logger.debug(f"STT stream opened for language '{language}' ({encoding}).")
+    try:
+        decoder = make_decoder(encoding)
+        session = await stt_executor.run(stt_manager.open_session, language, model_size, session_id, grammar_id)
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1008)
+        return
+    except (QueueFullError, PoolTimeoutError, ModelCapacityError) as e:
+        logger.warning(f"STT stream rejected: {e}")
+        await websocket.send_json({"type": "error", "detail": str(e)})
+        await websocket.close(code=1013)
+        return
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                result = await stt_executor.run(_feed_session, session, decoder, message["bytes"])
+                if result:
+                    await websocket.send_json(result)
+                continue
+
+            try:
+                control = json.loads(message.get("text") or "{}")
+            except json.JSONDecodeError:
+                control = {"type": message.get("text")}
+            control_type = control.get("type") if isinstance(control, dict) else None
+
+            if control_type in ("flush", "eof"):
+                if control_type == "eof":
+                    tail = decoder.flush()
+                    result = await stt_executor.run(session.accept, tail) if tail else None
+                    if result:
+                        await websocket.send_json(result)
+                await websocket.send_json(await stt_executor.run(session.finish))
+                if control_type == "eof":
+                    await websocket.close()
+                    break
+            else:
+                await websocket.send_json({"type": "error", "detail": f"Unknown control message: {message.get('text')}"})
+    except WebSocketDisconnect:
+        pass
+    except QueueFullError as e:
+        # 스트림 도중 프레임을 버리면 디코딩이 어긋나므로, 과부하 시에는 세션을 닫고 재연결을 유도합니다.
+        await websocket.send_json({"type": "error", "detail": str(e), "retry_after": e.retry_after})
+        await websocket.close(code=1013)
+    except Exception as e:
+        logger.error(f"STT stream error: {e}", exc_info=True)
+        await websocket.close(code=1011)
+    finally:
+        session.close()
+        logger.debug(f"STT stream closed for language '{language}'.")
+
+@router.post("/stt/grammars", response_model=GrammarResponse)
+async def stt_register_grammar_endpoint(grammar: GrammarRequest):
+    """
+    게임 명령어, 캐릭터 이름 등 인식할 구문 목록을 등록하고 grammar_id 를 반환합니다.
+    grammar_id 를 STT 요청에 함께 보내면 전체 언어 모델 대신 이 구문들로 제한된 recognizer로 디코딩합니다.
+    같은 구문 집합은 같은 grammar_id 를 받으며, recognizer 풀도 공유합니다.
+    """
+    try:
+        return stt_manager.register_grammar(grammar.language, grammar.phrases)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/stt/grammars")
+async def stt_list_grammars_endpoint():
+    """등록된 문법 목록을 반환합니다."""
+    return {"grammars": grammar_registry.list()}
+
+@router.delete("/stt/grammars/{grammar_id}")
+async def stt_delete_grammar_endpoint(grammar_id: str):
+    """문법 등록을 해제합니다. 이미 만들어진 recognizer 풀은 사용되지 않으면 LRU 순서로 정리됩니다."""
+    try:
+        grammar_registry.remove(grammar_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return {"grammar_id": grammar_id, "deleted": True}
+
+@router.get("/stt/encodings")
+async def stt_encodings_endpoint():
+    """백엔드가 받을 수 있는 오디오 전송 인코딩 목록(선호도 순)을 반환합니다. 클라이언트는 이 중 하나를 골라 보냅니다."""
+    return {"encodings": supported_encodings(), "sample_rate": SAMPLE_RATE}
+
+@router.get("/stt/engines")
+async def stt_engines_endpoint():
+    """등록된 STT 엔진과 등급(fast/accurate), 모델 크기 → 엔진 대응표, 엔진별 지연 시간을 반환합니다."""
+    return {
+        "default": DEFAULT_ENGINE,
+        "model_sizes": MODEL_SIZE_ENGINES,
+        "engines": stt_manager.get_engine_stats(),
+    }
+
+@router.get("/stt/stats")
+async def stt_stats_endpoint():
+    """언어별 recognizer 풀의 깊이(크기/유휴/사용 중)와 대기 시간, STT 실행기 대기열, 무음 게이트, 결과 캐시, 언어 자동 감지, 동시 요청 합치기 통계를 반환합니다."""
+    return {
+        "pools": stt_manager.get_pool_stats(),
+        "engines": stt_manager.get_engine_stats(),
+        "executor": stt_executor.stats(),
+        "silence_gate": silence_gate.stats(),
+        "result_cache": result_cache.stats(),
+        "auto_language": language_id.stats(),
+        "single_flight": stt_flights.stats(),
+    }
+
+@router.get("/ocr/stats")
+async def ocr_stats_endpoint():
+    """OCR 실행기 대기열, 전처리 단계별 시간, Tesseract 엔진(백엔드 종류, 언어별 핸들 풀, 인식 지연 시간), 영역별 인식 설정 캐시, 동시 요청 합치기, 번역 캐시 통계를 반환합니다."""
+    return {"executor": ocr_executor.stats(), "preprocess": preprocess_stats.stats(), "engine": ocr_engine.stats(),
+            "region_profiles": region_profiles.stats(), "single_flight": ocr_flights.stats(),
+            "translation": translation_service.stats()}
@@ -0,0 +1,74 @@
+# ariel_backend/benchmarks/bench_audio_codec.py
+"""
+오디오 전송 인코딩별 대역폭 절감과 CPU 비용을 비교합니다.
+
+    python -m ariel_backend.benchmarks.bench_audio_codec [audio.wav]
+
+WAV 파일(16kHz, 16-bit, Mono)을 주지 않으면 음성과 비슷한 합성 신호(유성음 + 무음 구간 + 잡음)를 사용합니다.
+"""
+import io
+import sys
+import time
+import wave
+
+import numpy as np
+
+from ariel_backend.services import audio_codec
+
+SAMPLE_RATE = 16000
+REPEAT = 20
+
+def synthetic_speech(seconds: float = 10.0) -> bytes:
+    rng = np.random.default_rng(0)
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    voiced = sum(np.sin(2 * np.pi * k * np.cumsum(pitch) / SAMPLE_RATE) / k for k in range(1, 6))
+    envelope = (np.sin(2 * np.pi * 0.7 * t) > -0.2).astype(np.float64)
+    signal = 6000 * voiced * envelope + rng.normal(0, 150, t.shape)
+    return np.clip(signal, -32768, 32767).astype("<i2").tobytes()
+
+def read_wav(path: str) -> bytes:
+    with wave.open(path, "rb") as wav:
+        if wav.getframerate() != SAMPLE_RATE or wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise SystemExit("WAV must be 16kHz, 16-bit, Mono.")
+        return wav.readframes(wav.getnframes())
+
+def flac_encode(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    samples = np.frombuffer(pcm, dtype="<i2")
+    audio_codec.soundfile.write(buffer, samples, SAMPLE_RATE, format="FLAC", subtype="PCM_16")
+    return buffer.getvalue()
+
+def snr_db(reference: bytes, decoded: bytes) -> float:
+    ref = np.frombuffer(reference, dtype="<i2").astype(np.float64)
+    out = np.frombuffer(decoded, dtype="<i2").astype(np.float64)
+    noise = np.mean((ref - out) ** 2)
+    return float("inf") if noise == 0 else 10 * np.log10(np.mean(ref ** 2) / noise)
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        result = fn(*args)
+    return result, (time.perf_counter() - started) / REPEAT
+
+def main():
+    pcm = read_wav(sys.argv[1]) if len(sys.argv) > 1 else synthetic_speech()
+    seconds = len(pcm) / 2 / SAMPLE_RATE
+    encoders = {
+        "pcm": lambda data: data,
+        "zlib-delta": audio_codec.zlib_delta_encode,
+        "mulaw": audio_codec.mulaw_encode,
+    }
+    if audio_codec.soundfile is not None:
+        encoders["flac"] = flac_encode
+
+    print(f"{seconds:.1f}s of audio, {len(pcm) / seconds / 1000:.1f} KB/s uncompressed")
+    print(f"{'encoding':<12}{'KB/s':>8}{'saved':>8}{'enc ms/s':>10}{'dec ms/s':>10}{'SNR dB':>9}")
+    for name, encode in encoders.items():
+        encoded, encode_s = timed(encode, pcm)
+        decoded, decode_s = timed(audio_codec.decode_audio, encoded, name)
+        print(f"{name:<12}{len(encoded) / seconds / 1000:>8.1f}{1 - len(encoded) / len(pcm):>8.1%}"
+              f"{encode_s / seconds * 1000:>10.3f}{decode_s / seconds * 1000:>10.3f}{snr_db(pcm, decoded):>9.1f}")
+
+if __name__ == "__main__":
+    main()
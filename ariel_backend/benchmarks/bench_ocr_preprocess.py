@@ -0,0 +1,79 @@
+# ariel_backend/benchmarks/bench_ocr_preprocess.py
+"""
+OCR 전처리(흑백 변환/반전/여백 자르기/크기 조정/이진화)의 단계별 비용과 종단 간 OCR 시간/정확도 변화를 비교합니다.
+
+    python -m ariel_backend.benchmarks.bench_ocr_preprocess [image.png ...]
+
+이미지를 주지 않으면 게임 화면과 비슷한 합성 이미지(어두운 그라데이션 배경 위의 작은 밝은 글자)를 사용합니다.
+합성 이미지는 정답 문장을 알고 있으므로 문자 정확도도 함께 출력합니다.
+Tesseract 가 설치되어 있지 않으면 전처리 시간만 측정합니다.
+"""
+import difflib
+import shutil
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from ariel_backend.services import ocr_preprocess
+from ariel_backend.services.ocr_engine import ocr_engine, tesserocr
+
+REPEAT = 5
+SAMPLE_LINES = [
+    "Press E to talk to the merchant",
+    "Quest updated: Find the lost sword",
+    "HP 120/150   MP 45/80   Gold 3,210",
+]
+
+def synthetic_screens():
+    """(이름, 이미지, 정답) 목록. 1920x1080 화면 한쪽에 작은 글씨의 대화창이 있는 장면들."""
+    rng = np.random.default_rng(0)
+    screens = []
+    for font_px, dark in ((14, True), (18, True), (22, False)):
+        gradient = np.linspace(20 if dark else 200, 70 if dark else 250, 1920, dtype=np.float32)
+        background = np.tile(gradient, (1080, 1))[..., None] * np.array([0.9, 1.0, 1.1], dtype=np.float32)
+        background += rng.normal(0, 6, background.shape)
+        image = Image.fromarray(np.clip(background, 0, 255).astype(np.uint8), "RGB")
+        draw = ImageDraw.Draw(image)
+        font = ImageFont.load_default(size=font_px)
+        fill = (235, 235, 220) if dark else (30, 30, 40)
+        for i, line in enumerate(SAMPLE_LINES):
+            draw.text((640, 760 + i * font_px * 2), line, font=font, fill=fill)
+        screens.append((f"synthetic {font_px}px {'dark' if dark else 'light'}", image, "\n".join(SAMPLE_LINES)))
+    return screens
+
+def accuracy(expected: str, actual: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(expected.split()), " ".join(actual.split())).ratio()
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        result = fn(*args)
+    return result, (time.perf_counter() - started) / REPEAT
+
+def main():
+    if len(sys.argv) > 1:
+        screens = [(path, Image.open(path), None) for path in sys.argv[1:]]
+    else:
+        screens = synthetic_screens()
+    can_ocr = tesserocr is not None or shutil.which("tesseract") is not None
+
+    print(f"preprocess backend: {'opencv' if ocr_preprocess.cv2 is not None else 'numpy'}, "
+          f"steps: {['grayscale'] + ocr_preprocess.STEPS}, OCR backend: {ocr_engine.backend if can_ocr else 'unavailable'}")
+    for name, image, expected in screens:
+        (processed, timings, _), total_s = timed(ocr_preprocess.preprocess, image)
+        steps = "  ".join(f"{step} {seconds * 1000:.2f}" for step, seconds in timings.items())
+        print(f"\n{name}: {image.width}x{image.height} -> {processed.width}x{processed.height}")
+        print(f"  preprocess {total_s * 1000:.2f} ms  ({steps})")
+        if not can_ocr:
+            continue
+        raw_text, raw_s = timed(ocr_engine.recognize, image)
+        text, ocr_s = timed(ocr_engine.recognize, processed)
+        line = f"  OCR raw {raw_s * 1000:.1f} ms -> preprocessed {(total_s + ocr_s) * 1000:.1f} ms ({raw_s / (total_s + ocr_s):.2f}x)"
+        if expected is not None:
+            line += f", accuracy {accuracy(expected, raw_text):.1%} -> {accuracy(expected, text):.1%}"
+        print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# ariel_backend/benchmarks/bench_ocr_tiling.py
+"""
+큰 이미지를 가로 띠로 나누어 병렬 인식(ocr_tiling)할 때의 속도를 한 번에 인식할 때와 비교하고,
+나누기 시작하는 편이 빨라지는 이미지 크기(교차점)를 찾습니다. 그 값으로 ARIEL_OCR_TILE_MIN_PIXELS 를 정합니다.
+
+    python -m ariel_backend.benchmarks.bench_ocr_tiling [workers]
+
+문서 페이지와 비슷한 합성 이미지(흰 배경에 문단이 이어지는 검은 글자)를 크기별로 만들어 측정합니다.
+Tesseract 가 설치되어 있지 않으면 크기별 띠 분할 계획만 출력합니다.
+"""
+import shutil
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from ariel_backend.services import ocr_tiling
+from ariel_backend.services.ocr_engine import ocr_engine, tesserocr
+
+# (가로, 세로) 크기. 화면 일부 → 4K 화면 → 긴 웹 페이지
+SIZES = [(800, 600), (1280, 1024), (1920, 1080), (1920, 2160), (3840, 2160), (3840, 4320)]
+FONT_PX = 28
+WORDS = "the quick brown fox jumps over lazy dog while merchant sells sword and shield at dawn".split()
+
+def synthetic_page(width: int, height: int) -> Image.Image:
+    rng = np.random.default_rng(width * height)
+    image = Image.new("L", (width, height), 255)
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=FONT_PX)
+    y = FONT_PX
+    while y < height - FONT_PX * 2:
+        # 3~6 줄짜리 문단 사이에 빈 줄을 둡니다.
+        for _ in range(rng.integers(3, 7)):
+            words = rng.choice(WORDS, size=max(1, width // (FONT_PX * 4)))
+            draw.text((FONT_PX, y), " ".join(words), font=font, fill=0)
+            y += int(FONT_PX * 1.5)
+        y += FONT_PX
+    return image
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else ocr_tiling.TILE_WORKERS
+    can_ocr = tesserocr is not None or shutil.which("tesseract") is not None
+    # 교차점을 찾기 위해 크기 제한 없이 나누어 봅니다.
+    ocr_tiling.TILE_MIN_PIXELS = 0
+
+    print(f"workers: {workers}, OCR backend: {ocr_engine.backend if can_ocr else 'unavailable'}")
+    print(f"{'size':>11}{'MP':>6}{'bands':>7}{'single ms':>11}{'tiled ms':>10}{'speedup':>9}{'lines':>8}")
+    crossover = None
+    for width, height in SIZES:
+        page = synthetic_page(width, height)
+        bands = ocr_tiling.plan_bands(np.asarray(page), workers)
+        row = f"{width}x{height:<5}{width * height / 1e6:>6.1f}{len(bands):>7}"
+        if not can_ocr:
+            print(row + f"   bands at {[start for start, _ in bands[1:]]}")
+            continue
+        single, single_s = timed(ocr_engine.recognize_lines, page)
+        tiled, tiled_s = timed(ocr_tiling.recognize_tiled, page)
+        speedup = single_s / tiled_s
+        if crossover is None and speedup > 1.1:
+            crossover = width * height
+        print(row + f"{single_s * 1000:>11.0f}{tiled_s * 1000:>10.0f}{speedup:>8.2f}x{len(tiled):>5}/{len(single)}")
+    if crossover is not None:
+        print(f"\ntiling pays off from about {crossover / 1e6:.1f} MP (ARIEL_OCR_TILE_MIN_PIXELS={crossover})")
+
+if __name__ == "__main__":
+    main()
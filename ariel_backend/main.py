@@ -1,7 +1,11 @@
 # main.py
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from ariel_backend.api.v1 import endpoints
+from ariel_backend.api.v1 import endpoints, admin
+from ariel_backend.services.client_quota import ClientQuotaMiddleware
+from ariel_backend.services.ocr_engine import ocr_engine
 
 # 기본 로거 설정
 logging.basicConfig(
@@ -9,14 +13,25 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 기본 언어 조합의 Tesseract 핸들을 백그라운드에서 미리 만들어 첫 OCR 요청이 traineddata 로드를 기다리지 않게 합니다.
+    asyncio.get_running_loop().run_in_executor(None, ocr_engine.warm_up)
+    yield
+
 app = FastAPI(
     title="Project Ariel Backend",
     description="Provides STT and OCR services for the Ariel client.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
+# 요청을 보낸 클라이언트(X-Ariel-Client-Id)별 속도 제한과 사용량 기록
+app.add_middleware(ClientQuotaMiddleware)
+
 # API v1 라우터 포함
 app.include_router(endpoints.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
 
 @app.get("/", tags=["Root"])
 async def read_root():
@@ -0,0 +1,232 @@
+# ariel_backend/serve.py
+"""
+프로덕션용 백엔드 실행기.
+
+    python -m ariel_backend.serve --workers 4 --port 8000
+
+부모 프로세스에서 앱을 import 하여 Vosk 모델(ARIEL_STT_PINNED_LANGUAGES 또는 --preload)을 한 번만 로드한 뒤,
+리스닝 소켓을 열고 워커를 fork 합니다. 워커들은 부모가 로드한 모델 메모리를 copy-on-write 로 공유하므로
+워커 수를 늘려도 모델 메모리가 배로 늘지 않습니다. (fork 를 지원하지 않는 OS 에서는 단일 프로세스로 실행합니다.)
+
+--shards N 을 주면 언어를 N 개의 샤드 프로세스에 나누어 맡기고 언어별로 요청을 전달하는 라우터를 띄웁니다.
+(shard_router.py 참고)
+"""
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+
+import uvicorn
+
+logger = logging.getLogger("root")
+
+class RequestSizeLimitMiddleware:
+    """요청 본문이 max_bytes 를 넘으면 413 으로 거절하는 ASGI 미들웨어. (Content-Length 가 없는 스트리밍 본문도 검사)"""
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length" and value.isdigit() and int(value) > self.max_bytes:
+                await self._reject(send)
+                return
+
+        received = 0
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _RequestTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _RequestTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send):
+        body = b'{"detail":"Request body too large."}'
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+class _RequestTooLarge(Exception):
+    pass
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Project Ariel backend launcher (pre-fork, shared models).")
+    parser.add_argument("--host", default=os.getenv("ARIEL_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("ARIEL_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ARIEL_WORKERS", str(os.cpu_count() or 1))),
+                        help="Number of forked worker processes.")
+    parser.add_argument("--preload", default=os.getenv("ARIEL_PRELOAD_LANGUAGES", ""),
+                        help="Comma-separated languages to load in the parent before forking ('all' for every model).")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("ARIEL_KEEP_ALIVE_S", "5")),
+                        help="Seconds to keep idle HTTP connections open.")
+    parser.add_argument("--max-request-mb", type=float, default=float(os.getenv("ARIEL_MAX_REQUEST_MB", "32")),
+                        help="Reject request bodies larger than this (0 disables the limit).")
+    parser.add_argument("--limit-concurrency", type=int, default=int(os.getenv("ARIEL_LIMIT_CONCURRENCY", "0")) or None,
+                        help="Maximum concurrent connections per worker before returning 503.")
+    parser.add_argument("--shards", type=int, default=int(os.getenv("ARIEL_SHARDS", "0")),
+                        help="Split languages across this many shard processes behind a language router (0 disables).")
+    parser.add_argument("--shard-base-port", type=int, default=int(os.getenv("ARIEL_SHARD_BASE_PORT", "0")),
+                        help="First internal port for shard processes (defaults to --port + 1).")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default=os.getenv("ARIEL_LOG_LEVEL", "info"))
+    return parser.parse_args(argv)
+
+def _preload_models(languages: str):
+    """fork 전에 부모 프로세스에서 모델을 로드하고 고정합니다."""
+    from ariel_backend.services.stt_manager import stt_manager
+
+    if languages.strip().lower() == "all":
+        targets = list(stt_manager.supported_languages)
+    else:
+        targets = [lang.strip() for lang in languages.split(",") if lang.strip()]
+    for lang_code in targets:
+        try:
+            stt_manager.pin(lang_code)
+        except Exception as e:
+            logger.error(f"Failed to preload model for '{lang_code}': {e}", exc_info=True)
+
+def _bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket):
+    server = uvicorn.Server(config)
+    server.run(sockets=[sock])
+
+def _run_sharded(args):
+    """언어 샤드 프로세스들을 띄우고, 공개 포트에서 언어별 라우터를 실행합니다."""
+    from ariel_backend.shard_router import ShardRouter, start_shards, stop_shards
+
+    # 본문 크기 제한은 라우터에서 한 번만 검사합니다.
+    worker_args = ["--keep-alive", str(args.keep_alive), "--max-request-mb", "0", "--log-level", args.log_level]
+    shards = start_shards(args.shards, args.shard_base_port or args.port + 1, worker_args)
+    router = ShardRouter(shards)
+    config = uvicorn.Config(
+        RequestSizeLimitMiddleware(router, int(args.max_request_mb * 2**20)),
+        host=args.host,
+        port=args.port,
+        timeout_keep_alive=args.keep_alive,
+        limit_concurrency=args.limit_concurrency,
+        backlog=args.backlog,
+        log_level=args.log_level,
+    )
+    logger.info(f"Ariel router listening on {args.host}:{args.port} with {len(shards)} language shard(s).")
+    try:
+        uvicorn.Server(config).run()
+    finally:
+        stop_shards(shards)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.shards > 0:
+        _run_sharded(args)
+        return
+
+    # 앱과 모델은 부모에서 한 번만 import/로드합니다.
+    from ariel_backend.main import app
+    _preload_models(args.preload)
+
+    asgi_app = RequestSizeLimitMiddleware(app, int(args.max_request_mb * 2**20))
+    config = uvicorn.Config(
+        asgi_app,
+        timeout_keep_alive=args.keep_alive,
+        limit_concurrency=args.limit_concurrency,
+        backlog=args.backlog,
+        log_level=args.log_level,
+    )
+    sock = _bind_socket(args.host, args.port, args.backlog)
+    logger.info(f"Ariel backend listening on {args.host}:{args.port} with {args.workers} worker(s).")
+
+    if args.workers <= 1 or not hasattr(os, "fork"):
+        _run_worker(config, sock)
+        return
+
+    # fork 이후 자식의 GC가 부모 객체의 헤더를 건드려 공유 페이지가 복사되는 것을 줄입니다.
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+    children = {}
+
+    def spawn(slot: int):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            try:
+                _run_worker(config, sock)
+            finally:
+                os._exit(0)
+        children[pid] = slot
+        logger.info(f"Started worker {slot} (pid {pid}).")
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    for slot in range(args.workers):
+        spawn(slot)
+
+    # 죽은 워커는 같은 슬롯으로 다시 fork 하여, 공유 모델을 그대로 물려받게 합니다.
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        slot = children.pop(pid, None)
+        if slot is None:
+            continue
+        if not stopping:
+            logger.warning(f"Worker {slot} (pid {pid}) exited with status {status}. Restarting.")
+            time.sleep(1)
+            spawn(slot)
+
+    sock.close()
+    logger.info("Ariel backend stopped.")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+# ariel_backend/services/audio_codec.py
+import io
+import logging
+import struct
+import zlib
+from typing import List
+
+import numpy as np
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+# 인식기에 넣는 최종 형식: 16kHz, 16-bit little-endian, Mono PCM
+SAMPLE_RATE = 16000
+SAMPLE_FORMATS = ("s16le", "f32le")
+# WAV 헤더(data 청크 이전)로 허용하는 최대 크기. 메타데이터 청크가 비정상적으로 크면 거부합니다.
+MAX_WAV_HEADER_BYTES = 1 << 20
+_WAV_UNKNOWN_SIZE = 0xFFFFFFFF
+# zlib-delta 청크 하나(decode() 한 번)가 풀어낼 수 있는 최대 PCM 크기 (기본 10분). 넘으면 압축 폭탄으로 보고 거부합니다.
+MAX_INFLATE_BYTES = config.get_int("ARIEL_AUDIO_MAX_INFLATE_BYTES", SAMPLE_RATE * 2 * 600)
+# FLAC 본문은 끝까지 모았다가 디코딩하므로 모을 수 있는 크기를 제한합니다. (기본: 압축하지 않은 PCM 30분 분량)
+MAX_FLAC_BYTES = config.get_int("ARIEL_AUDIO_MAX_FLAC_BYTES", SAMPLE_RATE * 2 * 1800)
+
+# --- G.711 mu-law ---
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 32635
+
+def _build_mulaw_table() -> np.ndarray:
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + _MULAW_BIAS) << exponent) - _MULAW_BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype("<i2")
+
+_MULAW_TABLE = _build_mulaw_table()
+
+def mulaw_encode(pcm: bytes) -> bytes:
+    """16-bit PCM을 8-bit G.711 mu-law 로 압축합니다. (손실, 2:1)"""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).astype(np.int32)
+    sign = (samples < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(samples), _MULAW_CLIP) + _MULAW_BIAS
+    exponent = np.clip(np.floor(np.log2(magnitude)).astype(np.int32) - 7, 0, 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+def mulaw_decode(data: bytes) -> bytes:
+    return _MULAW_TABLE[np.frombuffer(data, dtype=np.uint8)].tobytes()
+
+# --- zlib + 1차 차분(delta) PCM ---
+def zlib_delta_encode(pcm: bytes, level: int = 6) -> bytes:
+    """인접 샘플의 차이를 저장한 뒤 zlib 으로 압축합니다. (무손실)"""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    deltas = np.diff(samples, prepend=np.int16(0)).astype("<i2")
+    return zlib.compress(deltas.tobytes(), level)
+
+def zlib_delta_decode(data: bytes) -> bytes:
+    decoder = ZlibDeltaDecoder()
+    return decoder.decode(data) + decoder.flush()
+
+# --- 스트리밍 디코더 ---
+class PcmDecoder:
+    """
+    임의의 크기로 잘려 들어오는 오디오 바이트를 16-bit PCM 으로 바꾸는 스트리밍 디코더.
+    샘플이 청크 경계에서 잘리면 남은 바이트를 다음 청크와 합쳐서 처리합니다.
+    """
+    def __init__(self, sample_format: str = "s16le"):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(f"Unsupported sample format: {sample_format}. Supported: {', '.join(SAMPLE_FORMATS)}")
+        self.sample_format = sample_format
+        self._sample_width = 4 if sample_format == "f32le" else 2
+        self._pending = b""
+
+    def decode(self, chunk: bytes) -> bytes:
+        data = self._pending + chunk if self._pending else chunk
+        usable = len(data) - len(data) % self._sample_width
+        self._pending = data[usable:]
+        if not usable:
+            return b""
+        if self.sample_format == "s16le":
+            return data[:usable]
+        samples = np.frombuffer(data, dtype="<f4", count=usable // 4)
+        return (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2").tobytes()
+
+    def flush(self) -> bytes:
+        """스트림 끝에서 샘플을 이루지 못하고 남은 바이트는 버립니다."""
+        if self._pending:
+            logger.debug(f"Dropping {len(self._pending)} trailing byte(s) that do not form a full sample.")
+        self._pending = b""
+        return b""
+
+class MuLawDecoder:
+    """mu-law 는 1바이트가 1샘플이므로 청크 경계를 신경 쓸 필요가 없습니다."""
+    def decode(self, chunk: bytes) -> bytes:
+        return mulaw_decode(chunk)
+
+    def flush(self) -> bytes:
+        return b""
+
+class ZlibDeltaDecoder:
+    """zlib 스트림을 풀고, 직전 청크의 마지막 샘플을 이어받아 차분을 누적합니다."""
+    def __init__(self):
+        self._inflater = zlib.decompressobj()
+        self._pending = b""
+        self._last_sample = np.int16(0)
+
+    def _integrate(self, raw: bytes) -> bytes:
+        data = self._pending + raw if self._pending else raw
+        usable = len(data) - len(data) % 2
+        self._pending = data[usable:]
+        if not usable:
+            return b""
+        deltas = np.frombuffer(data, dtype="<i2", count=usable // 2).copy()
+        deltas[:1] += self._last_sample
+        # int16 범위를 넘는 누적은 인코더의 차분과 같은 방식으로 순환(wrap)합니다.
+        samples = np.cumsum(deltas, dtype=np.int16)
+        self._last_sample = samples[-1]
+        return samples.astype("<i2").tobytes()
+
+    def decode(self, chunk: bytes) -> bytes:
+        try:
+            # 출력 크기를 제한하여, 작은 본문이 거대한 PCM 으로 풀리며 메모리를 다 쓰는 일을 막습니다.
+            raw = self._inflater.decompress(chunk, MAX_INFLATE_BYTES + 1)
+        except zlib.error as e:
+            raise ValueError(f"Invalid zlib-delta audio stream: {e}")
+        if len(raw) > MAX_INFLATE_BYTES or self._inflater.unconsumed_tail:
+            raise ValueError(f"zlib-delta audio chunk expands beyond {MAX_INFLATE_BYTES} bytes.")
+        return self._integrate(raw)
+
+    def flush(self) -> bytes:
+        return self._integrate(self._inflater.flush())
+
+class FlacDecoder:
+    """
+    FLAC 은 프레임 단위 스트리밍 디코딩이 번거로우므로 본문을 모았다가 끝에서 한 번에 디코딩합니다.
+    따라서 스트리밍 디코더가 아니며, 본문 전체(최대 MAX_FLAC_BYTES)를 메모리에 둡니다.
+    """
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def decode(self, chunk: bytes) -> bytes:
+        if len(self._buffer) + len(chunk) > MAX_FLAC_BYTES:
+            raise ValueError(f"FLAC audio is larger than {MAX_FLAC_BYTES} bytes. Split it or use a streaming encoding.")
+        self._buffer.extend(chunk)
+        return b""
+
+    def flush(self) -> bytes:
+        if not self._buffer:
+            return b""
+        try:
+            samples, sample_rate = soundfile.read(io.BytesIO(bytes(self._buffer)), dtype="int16", always_2d=True)
+        except Exception as e:
+            raise ValueError(f"Invalid FLAC audio: {e}")
+        self._buffer.clear()
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(f"Unsupported FLAC sample rate: {sample_rate}. Only {SAMPLE_RATE} Hz is supported.")
+        # 다채널이면 평균하여 Mono 로 만듭니다.
+        return samples.mean(axis=1).astype("<i2").tobytes()
+
+class WavDecoder:
+    """
+    RIFF/WAVE 헤더를 읽어 형식을 확인한 뒤, data 청크를 도착하는 대로 16-bit Mono PCM 으로 바꿉니다.
+    16kHz 의 16-bit 정수 또는 32-bit float PCM 만 받으며, 다채널이면 평균하여 Mono 로 만듭니다.
+    data 청크 크기만큼만 디코딩하고 그 뒤의 청크(LIST 등)는 버립니다.
+    """
+    def __init__(self):
+        self._header = bytearray()
+        self._pcm = None
+        self._channels = 1
+        self._pending = b""
+        self._remaining = None
+
+    def _parse_header(self):
+        """data 청크 시작까지 헤더를 읽었다면 그 뒤의 바이트를, 아직 부족하면 None 을 반환합니다."""
+        buf = self._header
+        if len(buf) < 12:
+            return None
+        if buf[:4] != b"RIFF" or buf[8:12] != b"WAVE":
+            raise ValueError("Invalid WAV audio: missing RIFF/WAVE header.")
+
+        offset, fmt = 12, None
+        while len(buf) >= offset + 8:
+            chunk_id = bytes(buf[offset:offset + 4])
+            size = int.from_bytes(buf[offset + 4:offset + 8], "little")
+            body = offset + 8
+            if chunk_id == b"data":
+                if fmt is None:
+                    raise ValueError("Invalid WAV audio: 'data' chunk appears before 'fmt '.")
+                self._start(*fmt)
+                # 스트리밍으로 쓴 WAV 는 길이를 모르므로 data 크기를 0xFFFFFFFF 로 둡니다. 이때는 끝까지 읽습니다.
+                self._remaining = None if size == _WAV_UNKNOWN_SIZE else size
+                return bytes(buf[body:])
+            if body + size > MAX_WAV_HEADER_BYTES:
+                raise ValueError(f"Invalid WAV audio: '{chunk_id.decode('latin-1')}' chunk is too large ({size} bytes).")
+            if chunk_id == b"fmt " and size < 16:
+                raise ValueError(f"Invalid WAV audio: 'fmt ' chunk is too short ({size} bytes).")
+            if len(buf) < body + size:
+                return None
+            if chunk_id == b"fmt ":
+                fmt = struct.unpack("<HHIIHH", bytes(buf[body:body + 16]))
+            offset = body + size + (size & 1)
+        return None
+
+    def _start(self, audio_format, channels, sample_rate, _byte_rate, _block_align, bits):
+        if sample_rate != SAMPLE_RATE:
+            raise ValueError(f"Unsupported WAV sample rate: {sample_rate}. Only {SAMPLE_RATE} Hz is supported.")
+        # 0xFFFE(WAVE_FORMAT_EXTENSIBLE)는 비트 수로 정수/실수를 구분합니다.
+        if audio_format in (1, 0xFFFE) and bits == 16:
+            sample_format = "s16le"
+        elif audio_format in (3, 0xFFFE) and bits == 32:
+            sample_format = "f32le"
+        else:
+            raise ValueError(f"Unsupported WAV format: format={audio_format}, bits={bits}. Use 16-bit PCM or 32-bit float.")
+        self._pcm = PcmDecoder(sample_format)
+        self._channels = max(1, channels)
+        self._header = None
+
+    def _downmix(self, pcm: bytes) -> bytes:
+        if self._channels == 1:
+            return pcm
+        data = self._pending + pcm
+        frame_bytes = 2 * self._channels
+        usable = len(data) - len(data) % frame_bytes
+        self._pending = data[usable:]
+        samples = np.frombuffer(data, dtype="<i2", count=usable // 2).reshape(-1, self._channels)
+        return samples.mean(axis=1).astype("<i2").tobytes()
+
+    def decode(self, chunk: bytes) -> bytes:
+        if self._pcm is None:
+            self._header.extend(chunk)
+            chunk = self._parse_header()
+            if chunk is None:
+                if len(self._header) > MAX_WAV_HEADER_BYTES:
+                    raise ValueError("Invalid WAV audio: header is too large or has no 'data' chunk.")
+                return b""
+        if self._remaining is not None:
+            chunk = chunk[:self._remaining]
+            self._remaining -= len(chunk)
+        return self._downmix(self._pcm.decode(chunk))
+
+    def flush(self) -> bytes:
+        if self._pcm is None:
+            if self._header:
+                raise ValueError("Invalid WAV audio: stream ended before the 'data' chunk.")
+            return b""
+        return self._downmix(self._pcm.flush())
+
+def supported_encodings() -> List[str]:
+    """백엔드가 받을 수 있는 오디오 전송 인코딩 목록. (선호도 순)"""
+    encodings = ["pcm", "zlib-delta", "mulaw", "wav"]
+    if soundfile is not None:
+        encodings.insert(1, "flac")
+    return encodings
+
+def make_decoder(encoding: str = "pcm", sample_format: str = "s16le"):
+    """전송 인코딩에 맞는 스트리밍 디코더를 만듭니다. sample_format 은 'pcm' 인코딩에만 적용됩니다."""
+    encoding = (encoding or "pcm").lower()
+    if encoding not in supported_encodings():
+        raise ValueError(f"Unsupported audio encoding: {encoding}. Supported: {', '.join(supported_encodings())}")
+    if encoding == "pcm":
+        return PcmDecoder(sample_format)
+    if encoding == "mulaw":
+        return MuLawDecoder()
+    if encoding == "zlib-delta":
+        return ZlibDeltaDecoder()
+    if encoding == "wav":
+        return WavDecoder()
+    return FlacDecoder()
+
+def decode_audio(data: bytes, encoding: str = "pcm", sample_format: str = "s16le") -> bytes:
+    """본문 전체를 한 번에 16-bit PCM 으로 디코딩합니다."""
+    decoder = make_decoder(encoding, sample_format)
+    return decoder.decode(data) + decoder.flush()
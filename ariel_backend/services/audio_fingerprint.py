@@ -0,0 +1,167 @@
+# ariel_backend/services/audio_fingerprint.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+SAMPLE_RATE = 16000
+# 32ms 프레임을 절반씩 겹쳐 스펙트럼을 구하고, 300Hz~3kHz 를 로그 간격 17개 대역으로 나눕니다.
+FRAME_SAMPLES = 512
+HOP_SAMPLES = 256
+N_BANDS = 17
+BITS_PER_FRAME = N_BANDS - 1
+_WINDOW = np.hanning(FRAME_SAMPLES).astype(np.float32)
+_BAND_EDGES = np.round(np.geomspace(300, 3000, N_BANDS + 1) * FRAME_SAMPLES / SAMPLE_RATE).astype(int)
+# 바이트별 1 비트 개수 (해밍 거리 계산용)
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8).reshape(-1, 1), axis=1).sum(axis=1).astype(np.uint16)
+
+# 캐시할 (지문, 모델) → 전사 결과 항목 수. 0 이면 캐시를 사용하지 않습니다.
+CACHE_SIZE = config.get_int("ARIEL_STT_RESULT_CACHE_SIZE", 4096)
+# 길이가 같은 지문끼리 비트가 이 비율 이하로만 다르면 같은 오디오로 봅니다. (0 이면 완전히 같은 지문만)
+MAX_BIT_ERROR_RATE = config.get_float("ARIEL_STT_RESULT_CACHE_MAX_BER", 0.1)
+
+def fingerprint(pcm: bytes) -> Optional[np.ndarray]:
+    """
+    16-bit PCM 의 스펙트럼 지문을 계산합니다. (Haitsma-Kalker 방식)
+    프레임마다 인접 대역 에너지 차이가 직전 프레임보다 커졌는지를 1비트로 기록하므로, 음량 변화와 약한 잡음에 강합니다.
+    결과는 프레임당 16비트를 packbits 한 uint8 배열이며, 오디오가 너무 짧으면 None 을 반환합니다.
+    """
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    n_frames = (len(samples) - FRAME_SAMPLES) // HOP_SAMPLES + 1
+    if n_frames < 2:
+        return None
+    frames = np.lib.stride_tricks.as_strided(
+        samples, shape=(n_frames, FRAME_SAMPLES), strides=(samples.strides[0] * HOP_SAMPLES, samples.strides[0]),
+    ).astype(np.float32) * _WINDOW
+    power = np.square(np.abs(np.fft.rfft(frames, axis=1)))
+    # reduceat 의 마지막 대역은 배열 끝까지 더하므로, 3kHz 위의 성분이 섞이지 않도록 먼저 잘라 냅니다.
+    bands = np.add.reduceat(power[:, :_BAND_EDGES[-1]], _BAND_EDGES[:-1], axis=1) + 1e-9
+    energy = np.log(bands)
+    diff = energy[:, :-1] - energy[:, 1:]
+    bits = (diff[1:] - diff[:-1]) > 0
+    return np.packbits(bits, axis=1)
+
+class _FingerprintIndex:
+    """같은 (모델, 길이) 지문들을 한 행렬에 모아 두어, 해밍 거리를 한 번의 벡터 연산으로 비교합니다."""
+    def __init__(self, row_bytes: int):
+        self.keys = []
+        self._positions = {}
+        self._rows = np.empty((16, row_bytes), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, key, fp: np.ndarray):
+        if key in self._positions:
+            return
+        if len(self.keys) == len(self._rows):
+            self._rows = np.concatenate([self._rows, np.empty_like(self._rows)])
+        self._rows[len(self.keys)] = fp.reshape(-1)
+        self._positions[key] = len(self.keys)
+        self.keys.append(key)
+
+    def remove(self, key):
+        # 마지막 행을 빈자리로 옮겨 행렬을 빈틈없이 유지합니다.
+        position = self._positions.pop(key)
+        last = self.keys.pop()
+        if position < len(self.keys):
+            self._rows[position] = self._rows[len(self.keys)]
+            self.keys[position] = last
+            self._positions[last] = position
+
+    def nearest(self, fp: np.ndarray):
+        errors = _POPCOUNT[self._rows[:len(self.keys)] ^ fp.reshape(1, -1)].sum(axis=1)
+        best = int(np.argmin(errors))
+        return self.keys[best], int(errors[best])
+
+class ResultCache:
+    """
+    (모델 키, 지문) → 전사 결과를 기억하는 LRU 캐시.
+    지문이 완전히 같으면 사전 조회로, 아니면 같은 모델/길이의 지문들과 해밍 거리를 한 번에 비교하여 거의 같은 반복을 찾습니다.
+    """
+    def __init__(self, max_size: int = CACHE_SIZE, max_bit_error_rate: float = MAX_BIT_ERROR_RATE):
+        self.max_size = max_size
+        self.max_bit_error_rate = max_bit_error_rate
+        self._entries = OrderedDict()
+        # (모델 키, 프레임 수) → 해당 항목 키들. 근사 비교 후보를 좁히는 데 사용합니다.
+        self._by_shape = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._near_hits = 0
+        self._misses = 0
+        self._saved_s = 0.0
+        self._lookup_s = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _near_match(self, model_key: str, fp: np.ndarray):
+        index = self._by_shape.get((model_key, fp.shape[0]))
+        if not index or self.max_bit_error_rate <= 0:
+            return None
+        key, errors = index.nearest(fp)
+        return key if errors <= self.max_bit_error_rate * fp.shape[0] * BITS_PER_FRAME else None
+
+    def get(self, model_key: str, fp: Optional[np.ndarray]) -> Optional[str]:
+        if fp is None or not self.enabled:
+            return None
+        started = time.perf_counter()
+        key = (model_key, fp.tobytes())
+        with self._lock:
+            near = False
+            if key not in self._entries:
+                key = self._near_match(model_key, fp)
+                near = key is not None
+            if key is None:
+                self._misses += 1
+                self._lookup_s += time.perf_counter() - started
+                return None
+            self._entries.move_to_end(key)
+            text, decode_s = self._entries[key][:2]
+            self._hits += 1
+            self._near_hits += int(near)
+            self._saved_s += decode_s
+            self._lookup_s += time.perf_counter() - started
+            return text
+
+    def put(self, model_key: str, fp: Optional[np.ndarray], text: str, decode_s: float):
+        if fp is None or not self.enabled:
+            return
+        key = (model_key, fp.tobytes())
+        with self._lock:
+            shape = (model_key, fp.shape[0])
+            self._entries[key] = (text, decode_s, shape)
+            self._entries.move_to_end(key)
+            if shape not in self._by_shape:
+                self._by_shape[shape] = _FingerprintIndex(fp.size)
+            self._by_shape[shape].add(key, fp)
+            while len(self._entries) > self.max_size:
+                old_key, (_, _, old_shape) = self._entries.popitem(last=False)
+                self._by_shape[old_shape].remove(old_key)
+                if not self._by_shape[old_shape]:
+                    del self._by_shape[old_shape]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self._hits,
+                "near_hits": self._near_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "avg_lookup_us": round(self._lookup_s / lookups * 1e6, 1) if lookups else 0.0,
+                "decode_saved_ms": round(self._saved_s * 1000, 3),
+            }
+
+result_cache = ResultCache()
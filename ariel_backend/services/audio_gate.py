@@ -0,0 +1,105 @@
+# ariel_backend/services/audio_gate.py
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+SAMPLE_RATE = 16000
+# 20ms 프레임 단위로 에너지와 영교차율(zero-crossing rate)을 계산합니다.
+FRAME_SAMPLES = SAMPLE_RATE // 50
+
+# 게이트 사용 여부 (0 이면 모든 청크를 디코딩)
+GATE_ENABLED = config.get_int("ARIEL_STT_SILENCE_GATE", 1) != 0
+# 이 값(dBFS)보다 조용한 프레임은 무음으로 봅니다. 클라이언트의 silence_db_threshold 기본값과 같습니다.
+DEFAULT_THRESHOLD_DB = config.get_float("ARIEL_STT_SILENCE_DB", -50.0)
+# 언어별 임계값 (예: "ko:-45,en:-50")
+THRESHOLD_DB_OVERRIDES = config.get_mapping("ARIEL_STT_SILENCE_DB_LANGUAGES")
+# 영교차율이 이보다 높은 프레임은 음성이 아닌 잡음(히스, 바람 소리 등)으로 봅니다.
+MAX_ZERO_CROSSING_RATE = config.get_float("ARIEL_STT_SILENCE_MAX_ZCR", 0.35)
+# 청크 안에 음성 프레임이 이 개수 이상 있어야 디코딩합니다. (기본 3 프레임 = 60ms)
+MIN_SPEECH_FRAMES = config.get_int("ARIEL_STT_SILENCE_MIN_FRAMES", 3)
+
+def frame_levels(pcm: bytes):
+    """16-bit PCM을 프레임으로 나누어 프레임별 RMS 레벨(dBFS)과 영교차율을 벡터 연산으로 계산합니다."""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    frame_len = min(FRAME_SAMPLES, len(samples)) or 1
+    n_frames = len(samples) // frame_len
+    frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len).astype(np.float32)
+
+    rms = np.sqrt(np.mean(np.square(frames), axis=1))
+    level_db = 20.0 * np.log10(rms / 32768.0 + 1e-10)
+    signs = np.signbit(frames)
+    zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1) if frame_len > 1 else np.zeros(n_frames)
+    return level_db, zcr
+
+class SilenceGate:
+    """
+    Kaldi 디코딩 앞에서 무음/배경 잡음 청크를 걸러내는 에너지 + 영교차율 게이트.
+    걸러낸 오디오 길이와 실제 디코딩 속도(오디오 1초당 디코딩 시간)로 절약한 디코딩 시간을 추정합니다.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = 0
+        self._skipped = 0
+        self._skipped_audio_s = 0.0
+        self._gate_time_s = 0.0
+        self._decoded_audio_s = 0.0
+        self._decode_time_s = 0.0
+
+    def threshold_for(self, language: str, threshold_db: Optional[float] = None) -> float:
+        """요청 값 > 언어별 설정 > 기본값 순으로 임계값을 고릅니다."""
+        if threshold_db is not None:
+            return threshold_db
+        try:
+            return float(THRESHOLD_DB_OVERRIDES.get(language, DEFAULT_THRESHOLD_DB))
+        except ValueError:
+            return DEFAULT_THRESHOLD_DB
+
+    def is_speech(self, pcm: bytes, language: str, threshold_db: Optional[float] = None) -> bool:
+        """청크에 음성으로 볼 만한 프레임이 있으면 True, 무음/잡음뿐이면 False 를 반환합니다."""
+        if not GATE_ENABLED:
+            return True
+        if len(pcm) < 2:
+            return False
+
+        started = time.perf_counter()
+        level_db, zcr = frame_levels(pcm)
+        voiced = (level_db > self.threshold_for(language, threshold_db)) & (zcr < MAX_ZERO_CROSSING_RATE)
+        speech = int(np.count_nonzero(voiced)) >= min(MIN_SPEECH_FRAMES, len(voiced))
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            self._checked += 1
+            self._gate_time_s += elapsed
+            if not speech:
+                self._skipped += 1
+                self._skipped_audio_s += len(pcm) / 2 / SAMPLE_RATE
+        return speech
+
+    def record_decode(self, audio_bytes: int, decode_s: float):
+        """게이트를 통과해 실제로 디코딩한 오디오 길이와 디코딩 시간을 기록합니다."""
+        with self._lock:
+            self._decoded_audio_s += audio_bytes / 2 / SAMPLE_RATE
+            self._decode_time_s += decode_s
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            decode_rtf = self._decode_time_s / self._decoded_audio_s if self._decoded_audio_s else 0.0
+            return {
+                "enabled": GATE_ENABLED,
+                "threshold_db": DEFAULT_THRESHOLD_DB,
+                "checked": self._checked,
+                "skipped": self._skipped,
+                "skipped_audio_s": round(self._skipped_audio_s, 3),
+                "gate_time_ms": round(self._gate_time_s * 1000, 3),
+                "decode_real_time_factor": round(decode_rtf, 4),
+                "estimated_decode_saved_ms": round(self._skipped_audio_s * decode_rtf * 1000, 3),
+            }
+
+silence_gate = SilenceGate()
@@ -0,0 +1,74 @@
+# ariel_backend/services/audio_segmenter.py
+import logging
+from typing import List, Tuple
+
+import numpy as np
+
+from ariel_backend.services import config
+from ariel_backend.services.audio_gate import FRAME_SAMPLES, SAMPLE_RATE, frame_levels
+
+logger = logging.getLogger("root")
+
+# 긴 오디오를 이 길이(초) 사이의 조각으로 나눕니다. 조각마다 recognizer 하나가 독립적으로 디코딩합니다.
+MIN_CHUNK_S = config.get_float("ARIEL_STT_LONGFORM_MIN_CHUNK_S", 10.0)
+MAX_CHUNK_S = config.get_float("ARIEL_STT_LONGFORM_MAX_CHUNK_S", 30.0)
+# 이 길이(초) 이상 이어지는 무음 구간이 있으면 그 가운데에서 자릅니다.
+MIN_SILENCE_S = config.get_float("ARIEL_STT_LONGFORM_MIN_SILENCE_S", 0.3)
+
+class SilenceSplitter:
+    """
+    스트리밍으로 들어오는 16-bit Mono PCM 을 무음 경계에서 잘라 조각으로 내보냅니다.
+    버퍼에는 최대 MAX_CHUNK_S 만큼만 쌓이므로, 입력 길이와 상관없이 메모리 사용량이 일정합니다.
+    MIN_CHUNK_S ~ MAX_CHUNK_S 구간에서 가장 긴 무음의 가운데를 자르고, 무음이 없으면 가장 조용한 프레임에서 자릅니다.
+    """
+    def __init__(self, threshold_db: float, min_chunk_s: float = MIN_CHUNK_S, max_chunk_s: float = MAX_CHUNK_S,
+                 min_silence_s: float = MIN_SILENCE_S):
+        frame_bytes = FRAME_SAMPLES * 2
+        self.threshold_db = threshold_db
+        self._min_frames = max(1, int(min_chunk_s * SAMPLE_RATE) // FRAME_SAMPLES)
+        self._max_frames = max(self._min_frames + 1, int(max_chunk_s * SAMPLE_RATE) // FRAME_SAMPLES)
+        self._min_silence_frames = max(1, int(min_silence_s * SAMPLE_RATE) // FRAME_SAMPLES)
+        self._max_bytes = self._max_frames * frame_bytes
+        self._buffer = bytearray()
+        # 버퍼 첫 샘플의 스트림 내 위치 (샘플 단위)
+        self._offset = 0
+
+    def _find_cut(self) -> int:
+        """버퍼 앞부분에서 자를 프레임 번호를 고릅니다."""
+        level_db, _ = frame_levels(bytes(self._buffer[:self._max_bytes]))
+        window = level_db[self._min_frames:self._max_frames]
+        silent = np.concatenate(([False], window < self.threshold_db, [False]))
+        edges = np.flatnonzero(silent[1:] != silent[:-1])
+        starts, ends = edges[::2], edges[1::2]
+        if len(starts):
+            longest = int(np.argmax(ends - starts))
+            if ends[longest] - starts[longest] >= self._min_silence_frames:
+                return self._min_frames + int((starts[longest] + ends[longest]) // 2)
+        return self._min_frames + int(np.argmin(window))
+
+    def _emit(self, n_bytes: int) -> Tuple[float, bytes]:
+        chunk = bytes(self._buffer[:n_bytes])
+        del self._buffer[:n_bytes]
+        start_s = self._offset / SAMPLE_RATE
+        self._offset += n_bytes // 2
+        return start_s, chunk
+
+    def feed(self, pcm: bytes) -> List[Tuple[float, bytes]]:
+        """PCM 을 추가하고, 잘라낼 수 있게 된 (시작 시각(초), PCM) 조각들을 반환합니다."""
+        self._buffer.extend(pcm)
+        chunks = []
+        while len(self._buffer) >= self._max_bytes:
+            chunks.append(self._emit(self._find_cut() * FRAME_SAMPLES * 2))
+        return chunks
+
+    def flush(self) -> List[Tuple[float, bytes]]:
+        """스트림 끝에서 남은 오디오를 마지막 조각으로 내보냅니다."""
+        if len(self._buffer) < 2:
+            self._buffer.clear()
+            return []
+        return [self._emit(len(self._buffer) - len(self._buffer) % 2)]
+
+    @property
+    def duration_s(self) -> float:
+        """지금까지 내보낸 오디오 길이(초)."""
+        return self._offset / SAMPLE_RATE
@@ -0,0 +1,227 @@
+# ariel_backend/services/client_quota.py
+import json
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs
+
+from ariel_backend.services import config
+from ariel_backend.services.executor import QueueFullError, current_client, DEFAULT_CLIENT_ID, MAX_TRACKED_CLIENTS
+
+logger = logging.getLogger("root")
+
+CLIENT_ID_HEADER = "x-ariel-client-id"
+MAX_CLIENT_ID_LENGTH = 128
+# 클라이언트마다 서비스별로 초당 받을 요청 수와, 순간적으로 몰아서 보낼 수 있는 요청 수 (0 이면 제한 없음)
+RATE_LIMITS = {
+    "stt": config.get_float("ARIEL_CLIENT_STT_RATE_PER_S", 0.0),
+    "ocr": config.get_float("ARIEL_CLIENT_OCR_RATE_PER_S", 0.0),
+}
+RATE_BURSTS = {
+    "stt": config.get_float("ARIEL_CLIENT_STT_BURST", 10.0),
+    "ocr": config.get_float("ARIEL_CLIENT_OCR_BURST", 5.0),
+}
+# 지연 시간 백분위수 계산에 쓰는 최근 요청 수
+LATENCY_WINDOW = 256
+
+class RateLimitedError(QueueFullError):
+    """클라이언트가 서비스별 요청 속도 제한을 넘었을 때 발생합니다. (429 로 응답)"""
+    def __init__(self, client_id: str, kind: str, retry_after: int):
+        super().__init__(kind, retry_after, f"Client '{client_id}' exceeded its {kind} rate limit. Retry after {retry_after} seconds.")
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """토큰을 하나 꺼냅니다. 성공하면 0, 부족하면 다음 토큰까지 기다려야 하는 시간(초)을 반환합니다."""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+class _ClientUsage:
+    """한 클라이언트의 서비스별 요청 수, 응답 상태, 종단 간 지연 시간."""
+    def __init__(self):
+        self.requests = 0
+        self.rate_limited = 0
+        self.errors = 0
+        self.bytes_in = 0
+        self.total_latency_s = 0.0
+        self.recent_latency_s = deque(maxlen=LATENCY_WINDOW)
+        self.last_seen = 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        recent = sorted(self.recent_latency_s)
+
+        def percentile(q: float) -> float:
+            return round(recent[min(len(recent) - 1, math.ceil(q * len(recent)) - 1)] * 1000, 3) if recent else 0.0
+
+        completed = self.requests - self.rate_limited
+        return {
+            "requests": self.requests,
+            "rate_limited": self.rate_limited,
+            "errors": self.errors,
+            "bytes_in": self.bytes_in,
+            "avg_latency_ms": round(self.total_latency_s / completed * 1000, 3) if completed else 0.0,
+            "p50_latency_ms": percentile(0.5),
+            "p95_latency_ms": percentile(0.95),
+            "last_seen": round(self.last_seen, 3),
+        }
+
+class ClientQuotas:
+    """
+    클라이언트(client_id)별 요청 속도 제한(토큰 버킷)과 사용량/지연 시간 통계.
+    워커 시간의 공정한 분배는 실행기(BoundedExecutor)의 클라이언트별 가중 공정 큐가 맡습니다.
+    """
+    def __init__(self, max_clients: int = MAX_TRACKED_CLIENTS):
+        self.max_clients = max_clients
+        self._buckets = {}
+        self._usage = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _usage_for(self, client_id: str, kind: str) -> _ClientUsage:
+        # self._lock 을 잡은 상태에서 호출됩니다.
+        key = (client_id, kind)
+        usage = self._usage.get(key)
+        if usage is None:
+            usage = self._usage[key] = _ClientUsage()
+            while len(self._usage) > self.max_clients:
+                old_key, _ = self._usage.popitem(last=False)
+                self._buckets.pop(old_key, None)
+        else:
+            self._usage.move_to_end(key)
+        return usage
+
+    def admit(self, client_id: str, kind: str):
+        """요청을 받을 수 있는지 확인합니다. 속도 제한을 넘으면 RateLimitedError 를 발생시킵니다."""
+        rate = RATE_LIMITS.get(kind, 0.0)
+        with self._lock:
+            usage = self._usage_for(client_id, kind)
+            usage.requests += 1
+            usage.last_seen = time.time()
+            if rate <= 0:
+                return
+            bucket = self._buckets.get((client_id, kind))
+            if bucket is None:
+                bucket = self._buckets[(client_id, kind)] = _TokenBucket(rate, RATE_BURSTS.get(kind, 1.0))
+            wait_s = bucket.take()
+            if wait_s > 0:
+                usage.rate_limited += 1
+                raise RateLimitedError(client_id, kind, max(1, math.ceil(wait_s)))
+
+    def record(self, client_id: str, kind: str, latency_s: float, status: int, bytes_in: int = 0):
+        """끝난 요청의 지연 시간과 응답 상태를 기록합니다."""
+        with self._lock:
+            usage = self._usage_for(client_id, kind)
+            usage.total_latency_s += latency_s
+            usage.recent_latency_s.append(latency_s)
+            usage.bytes_in += bytes_in
+            if status >= 400:
+                usage.errors += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            result = {}
+            for (client_id, kind), usage in self._usage.items():
+                result.setdefault(client_id, {})[kind] = usage.stats()
+            return result
+
+client_quotas = ClientQuotas()
+
+def normalize_client_id(raw: Optional[str]) -> str:
+    client_id = (raw or "").strip()[:MAX_CLIENT_ID_LENGTH]
+    return client_id or DEFAULT_CLIENT_ID
+
+def _service_kind(path: str) -> Optional[str]:
+    for kind in ("stt", "ocr"):
+        if path.startswith(f"/api/v1/{kind}"):
+            return kind
+    return None
+
+class ClientQuotaMiddleware:
+    """
+    STT/OCR 요청의 X-Ariel-Client-Id 헤더(또는 client_id 쿼리)를 읽어 현재 클라이언트로 설정하고,
+    속도 제한을 넘은 요청은 엔드포인트에 닿기 전에 429 로 거절하며, 요청마다 지연 시간을 기록합니다.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        kind = _service_kind(scope.get("path", "")) if scope["type"] in ("http", "websocket") else None
+        if scope["type"] == "http" and scope.get("method") == "GET":
+            # 통계/목록 조회는 제한하거나 사용량으로 세지 않습니다.
+            kind = None
+        if kind is None:
+            await self.app(scope, receive, send)
+            return
+
+        raw_id = None
+        for name, value in scope.get("headers", []):
+            if name == CLIENT_ID_HEADER.encode():
+                raw_id = value.decode("latin-1")
+                break
+        if raw_id is None:
+            raw_id = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("client_id", [None])[0]
+        client_id = normalize_client_id(raw_id)
+
+        try:
+            client_quotas.admit(client_id, kind)
+        except RateLimitedError as e:
+            logger.info(str(e))
+            await self._reject(scope, send, e)
+            return
+
+        started = time.monotonic()
+        status = 500
+        received = 0
+
+        async def counting_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            elif message["type"] == "websocket.receive":
+                received += len(message.get("bytes") or b"")
+            return message
+
+        async def tracking_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "websocket.accept":
+                status = 101
+            await send(message)
+
+        token = current_client.set(client_id)
+        try:
+            await self.app(scope, counting_receive, tracking_send)
+        finally:
+            current_client.reset(token)
+            client_quotas.record(client_id, kind, time.monotonic() - started, status, received)
+
+    async def _reject(self, scope, send, e: RateLimitedError):
+        if scope["type"] == "websocket":
+            # 1013: Try Again Later
+            await send({"type": "websocket.close", "code": 1013, "reason": str(e)[:120]})
+            return
+        body = json.dumps({"detail": str(e)}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(e.retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,60 @@
+# ariel_backend/services/config.py
+import os
+import logging
+from typing import Dict, List
+
+logger = logging.getLogger("root")
+
+# 백엔드 서비스 설정은 모두 ARIEL_ 접두사가 붙은 환경 변수로 주입합니다.
+# (docker-compose.yml 의 environment 항목 또는 셸에서 지정)
+
+def get_int(name: str, default: int) -> int:
+    """정수형 환경 변수를 읽습니다. 값이 잘못되었으면 기본값을 사용합니다."""
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        logger.warning(f"Invalid integer for {name}: {raw!r}. Using default {default}.")
+        return default
+
+def get_float(name: str, default: float) -> float:
+    """실수형 환경 변수를 읽습니다. 값이 잘못되었으면 기본값을 사용합니다."""
+    raw = os.getenv(name)
+    if raw is None or raw.strip() == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        logger.warning(f"Invalid number for {name}: {raw!r}. Using default {default}.")
+        return default
+
+def get_list(name: str, default: str = "") -> List[str]:
+    """쉼표로 구분된 환경 변수를 리스트로 읽습니다. (예: "ko,en,ja")"""
+    raw = os.getenv(name, default)
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+def get_mapping(name: str, default: str = "") -> Dict[str, str]:
+    """'key:value' 쌍을 쉼표로 구분한 환경 변수를 사전으로 읽습니다. (예: "ko:4,en:2")"""
+    mapping = {}
+    for item in get_list(name, default):
+        key, sep, value = item.partition(":")
+        if not sep:
+            logger.warning(f"Ignoring malformed entry in {name}: {item!r}")
+            continue
+        mapping[key.strip()] = value.strip()
+    return mapping
+
+def get_int_mapping(name: str, default: str = "") -> Dict[str, int]:
+    """
+    'key:정수' 쌍을 쉼표로 구분한 환경 변수를 사전으로 읽습니다. (예: "ko:8,en:4")
+    정수가 아닌 항목은 경고를 남기고 버리므로, 그 키는 호출하는 쪽의 기본값을 따릅니다.
+    """
+    mapping = {}
+    for key, value in get_mapping(name, default).items():
+        try:
+            mapping[key] = int(value)
+        except ValueError:
+            logger.warning(f"Invalid integer for '{key}' in {name}: {value!r}. Using the default.")
+    return mapping
@@ -0,0 +1,368 @@
+# ariel_backend/services/executor.py
+import asyncio
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Optional
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+# 가장 오래 기다린 작업이 이 시간(ms) 이상 밀려 있으면 과부하로 보고, 가장 최근에 녹음/요청된 작업부터 처리합니다.
+# (실시간 자막에서는 늦은 오디오보다 새 오디오가 더 가치 있으므로)
+LIFO_AFTER_MS = config.get_float("ARIEL_EXECUTOR_LIFO_AFTER_MS", 200.0)
+
+# 클라이언트별 가중 공정 큐(WFQ) 설정.
+# 가중치는 'client_id:weight' 목록으로 주며, 없는 클라이언트는 1 입니다. (예: "kiosk-1:2,batch-job:0.5")
+CLIENT_WEIGHTS = config.get_mapping("ARIEL_CLIENT_WEIGHTS")
+# 한 클라이언트가 실행기마다 동시에 쓸 수 있는 워커 수와 대기열에 쌓을 수 있는 작업 수 (0 이면 제한 없음)
+CLIENT_MAX_CONCURRENCY = config.get_int("ARIEL_CLIENT_MAX_CONCURRENCY", 0)
+CLIENT_MAX_QUEUE = config.get_int("ARIEL_CLIENT_MAX_QUEUE", 0)
+# 통계를 유지할 최대 클라이언트 수. 넘으면 유휴 상태인 클라이언트부터 잊습니다.
+MAX_TRACKED_CLIENTS = config.get_int("ARIEL_CLIENT_MAX_TRACKED", 1024)
+DEFAULT_CLIENT_ID = "anonymous"
+
+# 현재 요청을 보낸 클라이언트. 요청 처리 코루틴에서 설정하면 그 요청이 제출하는 모든 작업에 적용됩니다.
+current_client: contextvars.ContextVar = contextvars.ContextVar("ariel_client_id", default=DEFAULT_CLIENT_ID)
+
+class QueueFullError(RuntimeError):
+    """실행기의 대기열이 가득 차 작업을 받을 수 없을 때 발생합니다. retry_after 는 재시도 권장 시간(초)입니다."""
+    def __init__(self, name: str, retry_after: int, message: Optional[str] = None):
+        super().__init__(message or f"The {name} service is busy. Retry after {retry_after} seconds.")
+        self.retry_after = retry_after
+
+class DeadlineExceededError(RuntimeError):
+    """작업의 마감 시각이 지나 실행하지 않고 버렸을 때 발생합니다."""
+
+class WorkCancelledError(RuntimeError):
+    """실행 중인 작업을 기다리는 쪽이 없어져(연결 끊김, 마감 초과) 작업이 스스로 중단할 때 발생합니다."""
+
+def client_weight(client_id: str) -> float:
+    try:
+        return max(0.01, float(CLIENT_WEIGHTS.get(client_id, 1.0)))
+    except ValueError:
+        return 1.0
+
+class _WorkItem:
+    def __init__(self, fn: Callable, args: tuple, kwargs: dict, loop: asyncio.AbstractEventLoop, future: asyncio.Future,
+                 deadline: Optional[float] = None, captured_at: Optional[float] = None, client_id: str = DEFAULT_CLIENT_ID):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.loop = loop
+        self.future = future
+        self.enqueued_at = time.monotonic()
+        # 마감/녹음 시각은 벽시계(epoch) 로 받아 monotonic 시계로 바꿔 둡니다.
+        offset = self.enqueued_at - time.time()
+        self.deadline = deadline + offset if deadline is not None else None
+        self.fresh_at = captured_at + offset if captured_at is not None else self.enqueued_at
+        self.client_id = client_id
+        self.charge_s = 0.0
+        # 제출한 요청의 contextvars(current_client 등)를 워커 스레드에서도 그대로 보이게 합니다.
+        self.context = contextvars.copy_context()
+
+    def expired(self, now: float) -> bool:
+        return self.deadline is not None and now >= self.deadline
+
+class _ClientQueue:
+    """
+    한 클라이언트의 대기열과 스케줄링 상태. vtime 은 가중치로 나눈 누적 실행 시간(가상 시간)으로,
+    가장 작은 클라이언트의 작업을 먼저 실행하여 클라이언트 간에 워커 시간을 가중치 비율로 나눕니다.
+    """
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+        self.weight = client_weight(client_id)
+        self.queue = deque()
+        self.running = 0
+        self.vtime = 0.0
+
+        # 통계
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        self.total_run_s = 0.0
+
+    @property
+    def idle(self) -> bool:
+        return not self.queue and self.running == 0
+
+    def estimate_run_s(self, default: float) -> float:
+        return self.total_run_s / self.completed if self.completed else default
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "weight": self.weight,
+            "queued": len(self.queue),
+            "running": self.running,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "worker_ms": round(self.total_run_s * 1000, 3),
+            "avg_wait_ms": round(self.total_wait_s / self.completed * 1000, 3) if self.completed else 0.0,
+            "max_wait_ms": round(self.max_wait_s * 1000, 3),
+            "avg_run_ms": round(self.total_run_s / self.completed * 1000, 3) if self.completed else 0.0,
+        }
+
+_current = threading.local()
+
+def check_cancelled():
+    """
+    워커 스레드에서 실행 중인 작업이 더 이상 필요 없으면(기다리던 요청이 취소됨, 마감 초과) WorkCancelledError 를 발생시킵니다.
+    긴 작업은 세그먼트/조각 사이마다 호출하여 아무도 기다리지 않는 디코딩을 일찍 멈출 수 있습니다.
+    """
+    item = getattr(_current, "item", None)
+    if item is not None and (item.future.cancelled() or item.expired(time.monotonic())):
+        raise WorkCancelledError("The request was cancelled or its deadline passed.")
+
+def _set_future_result(future: asyncio.Future, result: Any):
+    if not future.done():
+        future.set_result(result)
+
+def _set_future_exception(future: asyncio.Future, exc: BaseException):
+    if not future.done():
+        future.set_exception(exc)
+
+class BoundedExecutor:
+    """
+    CPU를 많이 쓰는 블로킹 작업(STT 디코딩, OCR)을 asyncio 이벤트 루프 밖에서 실행하는 전용 워커 풀.
+    동시 실행 수는 max_workers 로, 대기열 길이는 max_queue 로 제한합니다.
+    대기열이 가득 차면 즉시 QueueFullError 를 발생시켜, 과부하 시 지연이 무한정 늘어나는 대신 429 로 거절합니다.
+    대기열은 클라이언트(current_client)별로 나뉘며, 워커가 비면 가중치 대비 워커를 가장 적게 쓴 클라이언트의 작업을 꺼냅니다.
+    워커 스레드는 첫 작업이 들어올 때 생성됩니다.
+    """
+    def __init__(self, name: str, max_workers: int, max_queue: int,
+                 client_max_concurrency: int = CLIENT_MAX_CONCURRENCY, client_max_queue: int = CLIENT_MAX_QUEUE):
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.client_max_concurrency = client_max_concurrency if client_max_concurrency > 0 else self.max_workers
+        self.client_max_queue = client_max_queue if client_max_queue > 0 else None
+        self._clients = OrderedDict()
+        self._queued = 0
+        # 가장 최근에 실행을 시작한 작업의 가상 시간. 새로 대기열에 들어온 클라이언트는 여기서 출발합니다.
+        self._vtime = 0.0
+        self._cond = threading.Condition()
+        self._threads = []
+        self._idle_workers = 0
+
+        # 통계
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait_s = 0.0
+        self._total_run_s = 0.0
+        # 아무도 기다리지 않는 작업: 대기 중 마감 초과(shed), 대기 중 취소(cancelled), 실행 도중 중단(abandoned)
+        self._shed = 0
+        self._cancelled = 0
+        self._abandoned = 0
+        self._wasted_run_s = 0.0
+
+    def _ensure_workers(self):
+        # self._cond 를 잡은 상태에서 호출됩니다. 대기 작업보다 유휴 워커가 적으면 워커를 하나 늘립니다.
+        if len(self._threads) < self.max_workers and self._idle_workers < self._queued:
+            thread = threading.Thread(target=self._worker, name=f"{self.name}-worker-{len(self._threads)}", daemon=True)
+            self._threads.append(thread)
+            self._idle_workers += 1
+            thread.start()
+
+    def _retry_after(self) -> int:
+        # 대기 중인 작업을 모두 처리하는 데 걸릴 예상 시간으로 재시도 시점을 안내합니다.
+        return max(1, math.ceil((self._queued + 1) * self._avg_run_s(1.0) / self.max_workers))
+
+    def _avg_run_s(self, default: float) -> float:
+        return self._total_run_s / self._completed if self._completed else default
+
+    def _client(self, client_id: str) -> _ClientQueue:
+        # self._cond 를 잡은 상태에서 호출됩니다.
+        client = self._clients.get(client_id)
+        if client is None:
+            client = self._clients[client_id] = _ClientQueue(client_id)
+            if len(self._clients) > MAX_TRACKED_CLIENTS:
+                for old_id in [cid for cid, c in self._clients.items() if c.idle and cid != client_id]:
+                    del self._clients[old_id]
+                    if len(self._clients) <= MAX_TRACKED_CLIENTS:
+                        break
+        else:
+            self._clients.move_to_end(client_id)
+        return client
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """fn(*args, **kwargs) 를 워커 스레드에서 실행하고 결과를 기다립니다."""
+        return await self.submit(fn, args, kwargs)
+
+    async def submit(self, fn: Callable, args: tuple = (), kwargs: Optional[dict] = None,
+                     deadline: Optional[float] = None, captured_at: Optional[float] = None) -> Any:
+        """
+        run() 과 같지만 마감 시각과 녹음 시각(모두 epoch 초)을 함께 받습니다.
+        마감이 지난 작업은 실행하지 않고 DeadlineExceededError 로 버리며, 과부하 시에는 녹음 시각이 최근인 작업을 먼저 처리합니다.
+        결과를 기다리는 코루틴이 취소되면 대기 중인 작업은 실행하지 않습니다.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        item = _WorkItem(fn, args, kwargs or {}, loop, future, deadline, captured_at, current_client.get())
+
+        with self._cond:
+            if item.expired(item.enqueued_at):
+                self._shed += 1
+                raise DeadlineExceededError(f"The {self.name} request deadline has already passed.")
+            client = self._client(item.client_id)
+            waiting = self._queued - self._idle_workers
+            if len(self._threads) >= self.max_workers and waiting >= self.max_queue:
+                self._rejected += 1
+                client.rejected += 1
+                raise QueueFullError(self.name, self._retry_after())
+            if self.client_max_queue is not None and len(client.queue) >= self.client_max_queue:
+                self._rejected += 1
+                client.rejected += 1
+                raise QueueFullError(self.name, self._retry_after(),
+                                     f"Client '{item.client_id}' has too many queued {self.name} requests.")
+            if client.idle:
+                # 쉬던 클라이언트가 그동안 쓰지 않은 몫을 한꺼번에 몰아 쓰지 못하도록 현재 가상 시간에서 출발합니다.
+                client.vtime = max(client.vtime, self._vtime)
+            client.queue.append(item)
+            client.submitted += 1
+            self._queued += 1
+            self._submitted += 1
+            self._ensure_workers()
+            self._cond.notify()
+
+        return await future
+
+    def _next_item(self) -> Optional[_WorkItem]:
+        """
+        self._cond 를 잡은 상태에서 호출됩니다. 취소되었거나 마감이 지난 작업은 버리고 다음에 실행할 작업을 고릅니다.
+        동시 실행 한도에 걸리지 않은 클라이언트 중 가상 시간이 가장 작은 클라이언트를 고르고,
+        그 클라이언트의 대기열에서는 평소에는 들어온 순서(FIFO)대로, 가장 오래된 작업이 LIFO_AFTER_MS 이상 밀려 있으면
+        가장 최신 작업부터 꺼냅니다.
+        """
+        now = time.monotonic()
+        for client in self._clients.values():
+            for item in [item for item in client.queue if item.future.cancelled() or item.expired(now)]:
+                client.queue.remove(item)
+                self._queued -= 1
+                if item.future.cancelled():
+                    self._cancelled += 1
+                else:
+                    self._shed += 1
+                    item.loop.call_soon_threadsafe(
+                        _set_future_exception, item.future,
+                        DeadlineExceededError(f"The {self.name} request deadline passed while it was queued."),
+                    )
+
+        eligible = [client for client in self._clients.values()
+                    if client.queue and client.running < self.client_max_concurrency]
+        if not eligible:
+            return None
+        client = min(eligible, key=lambda c: (c.vtime, c.queue[0].enqueued_at))
+        queue = client.queue
+        if (now - queue[0].enqueued_at) * 1000 < LIFO_AFTER_MS:
+            item = queue.popleft()
+        else:
+            item = max(queue, key=lambda item: item.fresh_at)
+            queue.remove(item)
+        self._queued -= 1
+
+        # 실행 시간을 미리 예상치로 청구하고, 끝나면 실제 실행 시간으로 정산합니다.
+        self._vtime = client.vtime
+        item.charge_s = client.estimate_run_s(self._avg_run_s(0.01))
+        client.vtime += item.charge_s / client.weight
+        client.running += 1
+        return item
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                # 대기 작업이 없거나 모두 동시 실행 한도에 걸린 클라이언트의 것이면 다른 작업이 끝날 때까지 기다립니다.
+                item = self._next_item()
+                while item is None:
+                    self._cond.wait()
+                    item = self._next_item()
+                self._idle_workers -= 1
+
+            started = time.monotonic()
+            _current.item = item
+            failed = False
+            try:
+                result = item.context.run(item.fn, *item.args, **item.kwargs)
+            except BaseException as e:
+                failed = not isinstance(e, WorkCancelledError)
+                item.loop.call_soon_threadsafe(_set_future_exception, item.future, e)
+            else:
+                item.loop.call_soon_threadsafe(_set_future_result, item.future, result)
+            finally:
+                _current.item = None
+            finished = time.monotonic()
+
+            with self._cond:
+                wait_s, run_s = started - item.enqueued_at, finished - started
+                self._completed += 1
+                self._failed += failed
+                self._total_wait_s += wait_s
+                self._total_run_s += run_s
+                if item.future.cancelled() or item.expired(finished):
+                    # 결과를 받을 쪽이 없는 작업에 쓴 시간
+                    self._abandoned += 1
+                    self._wasted_run_s += run_s
+                client = self._client(item.client_id)
+                client.running -= 1
+                client.vtime += (run_s - item.charge_s) / client.weight
+                client.completed += 1
+                client.failed += failed
+                client.total_wait_s += wait_s
+                client.max_wait_s = max(client.max_wait_s, wait_s)
+                client.total_run_s += run_s
+                self._idle_workers += 1
+                if client.queue:
+                    # 동시 실행 한도 때문에 기다리던 이 클라이언트의 작업을 실행할 수 있게 되었습니다.
+                    self._cond.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            busy = len(self._threads) - self._idle_workers
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "busy": busy,
+                "queued": self._queued,
+                "clients": sum(1 for client in self._clients.values() if not client.idle),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "shed": self._shed,
+                "cancelled": self._cancelled,
+                "abandoned": self._abandoned,
+                "wasted_run_ms": round(self._wasted_run_s * 1000, 3),
+                "avg_wait_ms": round(self._total_wait_s / self._completed * 1000, 3) if self._completed else 0.0,
+                "avg_run_ms": round(self._total_run_s / self._completed * 1000, 3) if self._completed else 0.0,
+            }
+
+    def client_stats(self) -> Dict[str, Dict[str, Any]]:
+        """클라이언트별 대기/실행 중 작업 수, 가중치, 워커 사용 시간(worker_ms), 대기/실행 시간을 반환합니다."""
+        with self._cond:
+            return {client_id: client.stats() for client_id, client in self._clients.items()}
+
+_CPU_COUNT = os.cpu_count() or 1
+
+# STT 디코딩과 OCR 은 서로의 대기열에 영향을 주지 않도록 별도의 실행기를 사용합니다.
+# Vosk(Kaldi)와 Tesseract 는 GIL 밖에서 동작하므로 스레드만으로도 여러 코어를 활용할 수 있습니다.
+stt_executor = BoundedExecutor(
+    "stt",
+    max_workers=config.get_int("ARIEL_STT_WORKERS", _CPU_COUNT),
+    max_queue=config.get_int("ARIEL_STT_QUEUE_SIZE", _CPU_COUNT * 4),
+)
+ocr_executor = BoundedExecutor(
+    "ocr",
+    max_workers=config.get_int("ARIEL_OCR_WORKERS", max(1, _CPU_COUNT // 2)),
+    max_queue=config.get_int("ARIEL_OCR_QUEUE_SIZE", _CPU_COUNT * 2),
+)
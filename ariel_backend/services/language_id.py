@@ -0,0 +1,201 @@
+# ariel_backend/services/language_id.py
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+AUTO_LANGUAGE = "auto"
+SAMPLE_RATE = 16000
+
+# 자동 감지 시 동시에 디코딩해 볼 후보 언어 (지원되지 않는 언어는 무시)
+AUTO_CANDIDATES = config.get_list("ARIEL_STT_AUTO_CANDIDATES", "ko,en,ja")
+# 이 길이(초)의 오디오를 후보 모두에게 넣어 본 뒤 승자를 정합니다.
+DETECTION_WINDOW_S = config.get_float("ARIEL_STT_AUTO_WINDOW_S", 3.0)
+# 창이 끝나도 아무 후보도 단어를 인식하지 못하면(무음 등) 이 길이까지 감지를 연장합니다.
+MAX_DETECTION_S = config.get_float("ARIEL_STT_AUTO_MAX_WINDOW_S", 10.0)
+# 한 후보가 이 점수 이상의 확정 결과를 내면 창이 끝나기 전에 나머지 후보를 중단합니다.
+EARLY_STOP_SCORE = config.get_float("ARIEL_STT_AUTO_EARLY_STOP_SCORE", 0.9)
+# 이 점수 이상으로 결정된 언어만 세션에 캐시합니다.
+CACHE_MIN_SCORE = config.get_float("ARIEL_STT_AUTO_CACHE_MIN_SCORE", 0.5)
+CACHE_TTL_S = config.get_float("ARIEL_STT_AUTO_CACHE_TTL_S", 600.0)
+CACHE_SIZE = config.get_int("ARIEL_STT_AUTO_CACHE_SIZE", 10000)
+
+# 후보 디코딩을 병렬로 돌리는 전용 스레드 풀. (STT 실행기 워커 안에서 호출되므로 별도 풀을 사용)
+_detect_pool = ThreadPoolExecutor(
+    max_workers=config.get_int("ARIEL_STT_AUTO_WORKERS", os.cpu_count() or 1),
+    thread_name_prefix="stt-langid",
+)
+
+def confidence_score(confidences: List[float]) -> float:
+    """
+    인식된 단어들의 신뢰도로 언어 적합도를 계산합니다.
+    단어가 너무 적은 결과가 우연히 높은 점수를 얻지 않도록, 3단어 미만은 부족한 만큼 0으로 채워 평균합니다.
+    """
+    if not confidences:
+        return 0.0
+    return sum(confidences) / max(len(confidences), 3)
+
+class DecisionCache:
+    """세션(session_id)별로 결정된 언어를 TTL 과 함께 기억하는 LRU 캐시."""
+    def __init__(self, max_size: int = CACHE_SIZE, ttl_s: float = CACHE_TTL_S):
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session_id: Optional[str]) -> Optional[str]:
+        if not session_id:
+            return None
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None or entry[1] < time.monotonic():
+                self._entries.pop(session_id, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, session_id: Optional[str], language: str):
+        if not session_id or self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[session_id] = (language, time.monotonic() + self.ttl_s)
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def forget(self, session_id: Optional[str]):
+        with self._lock:
+            self._entries.pop(session_id, None)
+
+class DetectionStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.detections = 0
+        self.early_stops = 0
+        self.total_candidates = 0
+        self.total_audio_s = 0.0
+        self.wins = {}
+
+    def record(self, language: str, candidates: int, audio_s: float, early: bool):
+        with self._lock:
+            self.detections += 1
+            self.early_stops += int(early)
+            self.total_candidates += candidates
+            self.total_audio_s += audio_s
+            self.wins[language] = self.wins.get(language, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "detections": self.detections,
+                "early_stops": self.early_stops,
+                "avg_candidates": round(self.total_candidates / self.detections, 2) if self.detections else 0.0,
+                "avg_detection_audio_s": round(self.total_audio_s / self.detections, 3) if self.detections else 0.0,
+                "wins": dict(self.wins),
+            }
+
+decision_cache = DecisionCache()
+detection_stats = DetectionStats()
+
+class AutoSTTSession:
+    """
+    언어 자동 감지 세션.
+    처음 DETECTION_WINDOW_S 동안 들어온 오디오를 후보 언어 세션 모두에 병렬로 넣고, 단어 신뢰도 점수가 가장 높은 언어를 고릅니다.
+    한 후보가 EARLY_STOP_SCORE 이상의 확정 결과를 내면 즉시 결정하여 나머지 후보를 중단합니다.
+    결정 후에는 승자 세션만 사용하므로, 승자는 감지 구간의 문맥을 그대로 이어 갑니다.
+    """
+    def __init__(self, sessions: Dict[str, Any], on_decided: Optional[Callable[[str, float], None]] = None,
+                 window_s: float = DETECTION_WINDOW_S):
+        self._candidates = dict(sessions)
+        self._on_decided = on_decided
+        self._window_s = window_s
+        self._fed_s = 0.0
+        self._finals = {lang: [] for lang in self._candidates}
+        self._winner = None
+
+    @property
+    def language(self) -> Optional[str]:
+        return self._winner.language if self._winner is not None else None
+
+    def _with_language(self, result: Optional[dict]) -> Optional[dict]:
+        if result is not None:
+            result["language"] = self._winner.language
+        return result
+
+    def accept(self, pcm: bytes) -> Optional[dict]:
+        if self._winner is not None:
+            return self._with_language(self._winner.accept(pcm))
+
+        langs = list(self._candidates)
+        results = list(_detect_pool.map(lambda lang: self._candidates[lang].accept(pcm), langs))
+        self._fed_s += len(pcm) / 2 / SAMPLE_RATE
+
+        early = None
+        for lang, result in zip(langs, results):
+            if result and result["type"] == "final":
+                self._finals[lang].append(result["text"])
+                if self._candidates[lang].score >= EARLY_STOP_SCORE:
+                    early = lang if early is None or self._candidates[lang].score > self._candidates[early].score else early
+        if early is not None:
+            return self._decide(early, early_stop=True)
+
+        if self._fed_s >= self._window_s:
+            scored = any(session.score > 0 for session in self._candidates.values())
+            if scored or self._fed_s >= MAX_DETECTION_S:
+                return self.finish()
+        return None
+
+    def finish(self) -> dict:
+        """아직 결정 전이라면 모든 후보의 남은 오디오를 병렬로 확정하여 승자를 고르고, 승자의 확정 결과를 반환합니다."""
+        if self._winner is not None:
+            return self._with_language(self._winner.finish())
+
+        langs = list(self._candidates)
+        results = list(_detect_pool.map(lambda lang: self._candidates[lang].finish(), langs))
+        for lang, result in zip(langs, results):
+            if result["text"]:
+                self._finals[lang].append(result["text"])
+        best = max(langs, key=lambda lang: self._candidates[lang].score)
+        return self._decide(best, early_stop=False)
+
+    def _decide(self, language: str, early_stop: bool) -> dict:
+        self._winner = self._candidates.pop(language)
+        score = self._winner.score
+        for loser in self._candidates.values():
+            loser.close()
+        self._candidates.clear()
+        self._winner.stop_tracking()
+
+        detection_stats.record(language, len(self._finals), self._fed_s, early_stop)
+        logger.info(f"Detected spoken language '{language}' (score {score:.2f}, "
+                    f"{self._fed_s:.1f}s of audio, early stop: {early_stop}).")
+        if self._on_decided is not None:
+            self._on_decided(language, score)
+        text = " ".join(t for t in self._finals[language] if t)
+        return {"type": "final", "text": text, "language": language}
+
+    def close(self):
+        if self._winner is not None:
+            self._winner.close()
+        for session in self._candidates.values():
+            session.close()
+        self._candidates.clear()
+
+def stats() -> Dict[str, Any]:
+    return {
+        "candidates": AUTO_CANDIDATES,
+        "cache_hits": decision_cache.hits,
+        "cache_misses": decision_cache.misses,
+        **detection_stats.stats(),
+    }
@@ -0,0 +1,235 @@
+# ariel_backend/services/ocr_engine.py
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pytesseract
+from PIL import Image
+
+from ariel_backend.services import config
+from ariel_backend.services.executor import ocr_executor
+from ariel_backend.services.resource_pool import ResourcePool
+from ariel_backend.services.stt_engines import LatencyStats
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+logger = logging.getLogger("root")
+
+# 기본 인식 언어 (Tesseract 언어 코드를 '+' 로 연결)
+DEFAULT_LANGUAGES = os.getenv("ARIEL_OCR_LANGUAGES", "kor+eng")
+# traineddata 폴더. 비워 두면 Tesseract 기본 경로(TESSDATA_PREFIX)를 사용합니다.
+TESSDATA_PATH = os.getenv("ARIEL_OCR_TESSDATA_PATH")
+# 언어 조합마다 유지할 Tesseract 핸들 수. 핸들 하나가 한 번에 한 장(큰 이미지는 띠 하나)만 처리하므로 최대 크기는 코어 수에 맞춥니다.
+POOL_MIN_SIZE = config.get_int("ARIEL_OCR_POOL_MIN_SIZE", 1)
+POOL_MAX_SIZE = config.get_int("ARIEL_OCR_POOL_MAX_SIZE", max(ocr_executor.max_workers, os.cpu_count() or 1))
+POOL_ACQUIRE_TIMEOUT_S = config.get_float("ARIEL_OCR_POOL_TIMEOUT_S", 10.0)
+# 'tesserocr'(프로세스 내 핸들 풀) 또는 'pytesseract'(호출마다 tesseract 프로세스 실행). tesserocr 가 없으면 pytesseract 를 씁니다.
+BACKEND = os.getenv("ARIEL_OCR_BACKEND", "tesserocr")
+
+# 페이지 분할 모드(PSM)를 주지 않았을 때 쓰는 값 (3: 자동 분할, Tesseract 기본값)
+DEFAULT_PSM = 3
+# 방향/문자 체계 감지(OSD) 전용 모드와 그에 필요한 traineddata
+OSD_PSM = 0
+OSD_LANGUAGE = "osd"
+
+# Tesseract TSV 출력의 단어 행(level 5) 열 순서
+TSV_COLUMNS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+               "left", "top", "width", "height", "conf", "text")
+WORD_LEVEL = 5
+
+def parse_tsv(tsv: str) -> List[Dict[str, Any]]:
+    """
+    Tesseract TSV 출력(image_to_data / GetTSVText)을 글줄 목록으로 묶습니다.
+    각 글줄은 text, box([x, y, w, h]), confidence(단어 신뢰도 평균, 0~100), words 를 가지며 block/paragraph 번호로 문단을 구분합니다.
+    """
+    lines = {}
+    for row in tsv.splitlines():
+        fields = row.split("\t")
+        if len(fields) != len(TSV_COLUMNS) or fields[0] != str(WORD_LEVEL):
+            continue
+        text = fields[11].strip()
+        confidence = float(fields[10])
+        if not text or confidence < 0:
+            continue
+        block, paragraph, line = (int(value) for value in fields[2:5])
+        box = [int(value) for value in fields[6:10]]
+        lines.setdefault((block, paragraph, line), []).append({"text": text, "box": box, "confidence": round(confidence, 2)})
+
+    result = []
+    for (block, paragraph, _), words in sorted(lines.items()):
+        left = min(word["box"][0] for word in words)
+        top = min(word["box"][1] for word in words)
+        right = max(word["box"][0] + word["box"][2] for word in words)
+        bottom = max(word["box"][1] + word["box"][3] for word in words)
+        result.append({
+            "text": " ".join(word["text"] for word in words),
+            "box": [left, top, right - left, bottom - top],
+            "confidence": round(sum(word["confidence"] for word in words) / len(words), 2),
+            "block": block,
+            "paragraph": paragraph,
+            "words": words,
+        })
+    return result
+
+def lines_to_text(lines: List[Dict[str, Any]]) -> str:
+    """글줄 목록을 일반 텍스트로 합칩니다. 문단이 바뀌면 빈 줄을 넣습니다."""
+    parts = []
+    previous = None
+    for line in lines:
+        paragraph = (line["block"], line["paragraph"])
+        if previous is not None and paragraph != previous:
+            parts.append("")
+        parts.append(line["text"])
+        previous = paragraph
+    return "\n".join(parts)
+
+class OcrEngine:
+    """
+    Tesseract 인식기.
+    tesserocr 가 설치되어 있으면 언어 조합마다 traineddata 를 한 번만 로드한 PyTessBaseAPI 핸들을 풀에 두고,
+    이미지를 메모리에서 바로 넘겨 인식합니다. 없으면 호출마다 tesseract 프로세스를 띄우는 pytesseract 로 대체합니다.
+    """
+    def __init__(self, backend: str = BACKEND):
+        if backend == "tesserocr" and tesserocr is None:
+            logger.warning("tesserocr is not installed. Falling back to pytesseract for OCR.")
+            backend = "pytesseract"
+        self.backend = backend
+        self.latency = LatencyStats()
+        self._pools = {}
+        self._installed = None
+        self._installed_loaded = False
+        self._installed_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def _create_handle(self, languages: str):
+        started = time.monotonic()
+        kwargs = {"lang": languages}
+        if TESSDATA_PATH:
+            kwargs["path"] = TESSDATA_PATH
+        handle = tesserocr.PyTessBaseAPI(**kwargs)
+        logger.info(f"Initialized Tesseract handle for '{languages}' in {time.monotonic() - started:.2f}s.")
+        return handle
+
+    def _pool(self, languages: str) -> ResourcePool:
+        with self._lock:
+            pool = self._pools.get(languages)
+            if pool is None:
+                pool = self._pools[languages] = ResourcePool(
+                    f"ocr:{languages}",
+                    lambda: self._create_handle(languages),
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    # 다음 요청에 이전 이미지와 결과가 남지 않도록 비웁니다. (언어 데이터는 유지)
+                    reset=lambda handle: handle.Clear(),
+                )
+            return pool
+
+    @property
+    def installed_languages_loaded(self) -> bool:
+        """설치된 언어 목록을 이미 조회했는지. (아니면 installed_languages() 가 tesseract 를 실행하므로 블로킹)"""
+        return self._installed_loaded
+
+    def installed_languages(self) -> Optional[List[str]]:
+        """설치된 traineddata 언어 코드 목록. 알 수 없으면(Tesseract 가 없는 등) None. 처음 한 번만 조회합니다."""
+        if self._installed_loaded:
+            return self._installed
+        # 워밍업과 첫 요청들이 동시에 tesseract --list-langs 를 여러 번 실행하지 않도록 한 스레드만 조회합니다.
+        with self._installed_lock:
+            if not self._installed_loaded:
+                try:
+                    if self.backend == "tesserocr":
+                        _, languages = tesserocr.get_languages(TESSDATA_PATH or "")
+                    else:
+                        languages = pytesseract.get_languages()
+                    self._installed = sorted(languages)
+                except Exception as e:
+                    logger.warning(f"Could not list installed Tesseract languages: {e}")
+                self._installed_loaded = True
+        return self._installed
+
+    def warm_up(self, languages: str = DEFAULT_LANGUAGES):
+        """
+        요청이 오기 전에 언어 조합의 핸들 풀을 미리 만들어 traineddata 로드 시간을 첫 요청에서 빼냅니다.
+        요청의 언어 검사에 쓰는 설치된 언어 목록도 이때 조회해 둡니다.
+        """
+        self.installed_languages()
+        if self.backend != "tesserocr":
+            return
+        try:
+            self._pool(languages)
+        except Exception as e:
+            logger.error(f"Failed to initialize Tesseract handles for '{languages}': {e}", exc_info=True)
+
+    def recognize(self, image: Image.Image, languages: Optional[str] = None, psm: Optional[int] = None) -> str:
+        """이미지에서 텍스트를 인식합니다. psm 은 Tesseract 페이지 분할 모드입니다. (기본 DEFAULT_PSM)"""
+        languages = languages or DEFAULT_LANGUAGES
+        psm = DEFAULT_PSM if psm is None else psm
+        started = time.monotonic()
+        if self.backend == "tesserocr":
+            with self._pool(languages).checkout(POOL_ACQUIRE_TIMEOUT_S) as handle:
+                # 핸들은 요청 사이에 공유되므로 분할 모드를 매번 설정합니다. (Clear() 는 모드를 되돌리지 않음)
+                handle.SetPageSegMode(psm)
+                handle.SetImage(image)
+                text = handle.GetUTF8Text()
+        else:
+            text = pytesseract.image_to_string(image, lang=languages, config=f"--psm {psm}")
+        self.latency.record(time.monotonic() - started)
+        return text
+
+    def recognize_lines(self, image: Image.Image, languages: Optional[str] = None, psm: Optional[int] = None) -> List[Dict[str, Any]]:
+        """이미지에서 글줄과 단어를 위치(이미지 좌표 상자)와 신뢰도와 함께 인식합니다. (parse_tsv 참고)"""
+        languages = languages or DEFAULT_LANGUAGES
+        psm = DEFAULT_PSM if psm is None else psm
+        started = time.monotonic()
+        if self.backend == "tesserocr":
+            with self._pool(languages).checkout(POOL_ACQUIRE_TIMEOUT_S) as handle:
+                handle.SetPageSegMode(psm)
+                handle.SetImage(image)
+                tsv = handle.GetTSVText(0)
+        else:
+            tsv = pytesseract.image_to_data(image, lang=languages, config=f"--psm {psm}")
+        self.latency.record(time.monotonic() - started)
+        return parse_tsv(tsv)
+
+    def detect_orientation(self, image: Image.Image) -> Dict[str, Any]:
+        """
+        글자의 방향과 문자 체계를 감지합니다. (osd.traineddata 필요)
+        rotate 는 글자를 바로 세우려면 이미지를 시계 방향으로 돌려야 하는 각도(0/90/180/270)이고,
+        script 는 Tesseract 문자 체계 이름(Latin, Hangul, Japanese, Han, Cyrillic ...)입니다.
+        """
+        if self.backend == "tesserocr":
+            with self._pool(OSD_LANGUAGE).checkout(POOL_ACQUIRE_TIMEOUT_S) as handle:
+                handle.SetPageSegMode(OSD_PSM)
+                handle.SetImage(image)
+                result = handle.DetectOrientationScript()
+            if not result:
+                raise RuntimeError("Tesseract could not detect orientation and script.")
+            return {
+                "rotate": (360 - result["orient_deg"]) % 360,
+                "orientation_conf": float(result["orient_conf"]),
+                "script": result["script_name"],
+                "script_conf": float(result["script_conf"]),
+            }
+        result = pytesseract.image_to_osd(image, output_type=pytesseract.Output.DICT)
+        return {
+            "rotate": int(result["rotate"]) % 360,
+            "orientation_conf": float(result["orientation_conf"]),
+            "script": result["script"],
+            "script_conf": float(result["script_conf"]),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pools = dict(self._pools)
+        return {
+            "backend": self.backend,
+            "latency": self.latency.stats(),
+            "pools": {languages: pool.stats() for languages, pool in pools.items()},
+        }
+
+ocr_engine = OcrEngine()
@@ -0,0 +1,286 @@
+# ariel_backend/services/ocr_preprocess.py
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from PIL import Image
+
+from ariel_backend.services import config
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+logger = logging.getLogger("root")
+
+# 흑백 변환 뒤 적용할 전처리 단계 (순서대로). 'none' 이면 전처리하지 않고 원본을 그대로 인식합니다.
+STEPS = [step for step in config.get_list("ARIEL_OCR_PREPROCESS", "invert,crop,rescale,binarize") if step != "none"]
+# Tesseract 가 가장 잘 읽는 글줄 높이(px). 화면 글자를 이 높이에 가깝게 확대/축소합니다.
+TARGET_LINE_PX = config.get_int("ARIEL_OCR_TARGET_LINE_PX", 32)
+MIN_SCALE = 0.5
+MAX_SCALE = 4.0
+# 배율이 이 범위 안이면 크기를 바꾸지 않습니다. (보간으로 글자가 흐려지는 것보다 이득이 작음)
+SCALE_TOLERANCE = 0.2
+# 적응형 이진화의 주변 영역 크기(px, 홀수)와, 주변 평균보다 이만큼 어두워야 글자로 봅니다.
+BINARIZE_BLOCK_PX = config.get_int("ARIEL_OCR_BINARIZE_BLOCK_PX", 31) | 1
+BINARIZE_OFFSET = config.get_int("ARIEL_OCR_BINARIZE_OFFSET", 10)
+# 주변 평균보다 이 값 이상 어두운 픽셀을 글자로 보고, 글자 픽셀이 MIN_INK_PIXELS 개 이상인 행/열만 내용으로 봅니다.
+# (그라데이션 배경과 잡음 점은 내용으로 치지 않도록)
+INK_CONTRAST = 24
+MIN_INK_PIXELS = 2
+# 내용 둘레에 남길 여백(px)
+CROP_MARGIN_PX = 8
+
+# 원시 프레임 픽셀 형식 -> 픽셀당 바이트 수 (bgra: mss/Windows 화면 캡처 그대로, gray: 8비트 흑백)
+PIXEL_FORMATS = {"bgra": 4, "gray": 1}
+# 원시 프레임의 최대 크기(px). 8K 화면(7680x4320)까지 받습니다.
+MAX_FRAME_PIXELS = config.get_int("ARIEL_OCR_MAX_FRAME_PIXELS", 7680 * 4320)
+# 원시 프레임 버퍼의 최대 크기(바이트). stride 로 행 끝에 여백을 붙여도 이보다 큰 본문은 받지 않습니다.
+MAX_FRAME_BYTES = MAX_FRAME_PIXELS * max(PIXEL_FORMATS.values())
+
+def raw_frame_bytes(width: int, height: int, pixel_format: str = "bgra", stride: Optional[int] = None) -> int:
+    """원시 프레임 형식을 검사하고, 버퍼가 가질 수 있는 최대 바이트 수(stride * height)를 반환합니다."""
+    pixel_format = pixel_format.lower()
+    if pixel_format not in PIXEL_FORMATS:
+        raise ValueError(f"Unknown pixel format '{pixel_format}'. Supported: {list(PIXEL_FORMATS)}")
+    if width <= 0 or height <= 0 or width * height > MAX_FRAME_PIXELS:
+        raise ValueError(f"Invalid frame size {width}x{height}.")
+    row_bytes = width * PIXEL_FORMATS[pixel_format]
+    stride = row_bytes if stride is None else stride
+    if stride < row_bytes:
+        raise ValueError(f"Stride {stride} is smaller than the row size {row_bytes}.")
+    if stride * height > MAX_FRAME_BYTES:
+        raise ValueError(f"Stride {stride} makes the frame larger than {MAX_FRAME_BYTES} bytes.")
+    return stride * height
+
+class RawFrame:
+    """
+    PNG 로 인코딩하지 않은 화면 캡처 픽셀 버퍼. 행마다 stride 바이트이며 각 행의 앞 width * 픽셀 크기 바이트가 픽셀입니다.
+    잘못된 크기/형식이면 ValueError 를 발생시킵니다.
+    """
+    def __init__(self, buffer: bytes, width: int, height: int, pixel_format: str = "bgra", stride: Optional[int] = None):
+        pixel_format = pixel_format.lower()
+        raw_frame_bytes(width, height, pixel_format, stride)
+        row_bytes = width * PIXEL_FORMATS[pixel_format]
+        stride = row_bytes if stride is None else stride
+        if len(buffer) < stride * (height - 1) + row_bytes:
+            raise ValueError(f"Frame buffer has {len(buffer)} bytes, expected {stride * height} for {width}x{height} {pixel_format}.")
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self.stride = stride
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.width, self.height
+
+    def to_array(self) -> np.ndarray:
+        """버퍼를 복사하지 않고 (height, width[, 4]) uint8 배열로 봅니다. (읽기 전용)"""
+        channels = PIXEL_FORMATS[self.pixel_format]
+        shape = (self.height, self.width, channels) if channels > 1 else (self.height, self.width)
+        strides = (self.stride, channels, 1) if channels > 1 else (self.stride, 1)
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.buffer, strides=strides)
+
+# 시계 방향 회전 각도별 PIL 변환 (PIL 의 ROTATE_* 는 반시계 방향)
+_ROTATIONS = {
+    90: Image.Transpose.ROTATE_270,
+    180: Image.Transpose.ROTATE_180,
+    270: Image.Transpose.ROTATE_90,
+}
+
+class ImageTransform:
+    """전처리로 잘리고 크기가 바뀐(그리고 방향을 바로잡은) 이미지의 좌표를 원본 이미지 좌표로 되돌립니다."""
+    def __init__(self):
+        self.left = 0
+        self.top = 0
+        self.scale = 1.0
+        # 전처리 뒤 시계 방향으로 돌린 각도와, 돌리기 전 이미지 크기 (rotate() 참고)
+        self.rotate = 0
+        self.size = (0, 0)
+
+    def _unrotate(self, box: Sequence[int]) -> List[int]:
+        x, y, w, h = box
+        width, height = self.size
+        if self.rotate == 90:
+            return [y, height - x - w, h, w]
+        if self.rotate == 180:
+            return [width - x - w, height - y - h, w, h]
+        if self.rotate == 270:
+            return [width - y - h, x, h, w]
+        return [x, y, w, h]
+
+    def to_original(self, box: Sequence[int]) -> List[int]:
+        """전처리된 이미지의 [x, y, w, h] 상자를 원본 이미지 좌표로 바꿉니다."""
+        x, y, w, h = self._unrotate(box)
+        return [
+            round(self.left + x / self.scale),
+            round(self.top + y / self.scale),
+            max(1, round(w / self.scale)),
+            max(1, round(h / self.scale)),
+        ]
+
+def _background_level(gray: np.ndarray) -> int:
+    # 화면 캡처는 대부분 배경이므로 중앙값을 배경 밝기로 봅니다.
+    return int(np.median(gray[::4, ::4]))
+
+def _invert(gray: np.ndarray, transform: ImageTransform) -> np.ndarray:
+    """어두운 배경에 밝은 글자(게임 UI 등)이면 반전하여 Tesseract 가 기대하는 밝은 배경의 어두운 글자로 만듭니다."""
+    return 255 - gray if _background_level(gray) < 128 else gray
+
+def _box_mean(gray: np.ndarray, block: int) -> np.ndarray:
+    """적분 영상으로 block x block 주변 평균을 구합니다. (가장자리는 바깥 픽셀을 복제, OpenCV 와 같은 방식)"""
+    half = block // 2
+    padded = np.pad(gray, half + 1, mode="edge").astype(np.float32)
+    integral = padded.cumsum(axis=0).cumsum(axis=1)
+    total = integral[block:, block:] - integral[:-block, block:] - integral[block:, :-block] + integral[:-block, :-block]
+    return total[:gray.shape[0], :gray.shape[1]] / (block * block)
+
+def _dark_mask(gray: np.ndarray, offset: int) -> np.ndarray:
+    """주변 BINARIZE_BLOCK_PX 영역의 평균보다 offset 이상 어두운 픽셀(글자)이면 True 인 마스크."""
+    if cv2 is not None:
+        return cv2.adaptiveThreshold(gray, 1, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV,
+                                     BINARIZE_BLOCK_PX, offset).view(bool)
+    return gray <= _box_mean(gray, BINARIZE_BLOCK_PX) - offset
+
+def _content_rows_cols(gray: np.ndarray):
+    ink = _dark_mask(gray, INK_CONTRAST)
+    return ink.sum(axis=1) >= MIN_INK_PIXELS, ink.sum(axis=0) >= MIN_INK_PIXELS
+
+def content_rows(gray: np.ndarray) -> np.ndarray:
+    """행마다 글자 픽셀이 있으면 True 인 배열. (False 인 행이 글줄 사이 여백)"""
+    return _content_rows_cols(gray)[0]
+
+def _crop(gray: np.ndarray, transform: ImageTransform) -> np.ndarray:
+    """글자가 없는 가장자리를 잘라 인식할 픽셀 수를 줄입니다."""
+    row_mask, col_mask = _content_rows_cols(gray)
+    rows = np.flatnonzero(row_mask)
+    cols = np.flatnonzero(col_mask)
+    if rows.size == 0:
+        return gray
+    top, bottom = max(0, rows[0] - CROP_MARGIN_PX), min(gray.shape[0], rows[-1] + 1 + CROP_MARGIN_PX)
+    left, right = max(0, cols[0] - CROP_MARGIN_PX), min(gray.shape[1], cols[-1] + 1 + CROP_MARGIN_PX)
+    transform.left += left / transform.scale
+    transform.top += top / transform.scale
+    return gray[top:bottom, left:right]
+
+def line_spans(gray: np.ndarray) -> np.ndarray:
+    """가로 투영(행마다 글자 픽셀이 있는지)으로 찾은 글줄들의 [start, end) 행 배열 (N x 2). 3px 미만은 잡음으로 봅니다."""
+    inked = content_rows(gray)
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], inked, [False])).astype(np.int8))).reshape(-1, 2)
+    return edges[edges[:, 1] - edges[:, 0] >= 3]
+
+def estimate_line_height(gray: np.ndarray) -> float:
+    """글줄 높이의 중앙값을 구합니다. 글줄이 없으면 0."""
+    spans = line_spans(gray)
+    return float(np.median(spans[:, 1] - spans[:, 0])) if len(spans) else 0.0
+
+def _rescale(gray: np.ndarray, transform: ImageTransform) -> np.ndarray:
+    """글줄 높이가 TARGET_LINE_PX 에 가깝도록 이미지를 확대/축소합니다."""
+    line_px = estimate_line_height(gray)
+    if line_px <= 0:
+        return gray
+    scale = min(MAX_SCALE, max(MIN_SCALE, TARGET_LINE_PX / line_px))
+    if abs(scale - 1.0) < SCALE_TOLERANCE:
+        return gray
+    size = (max(1, round(gray.shape[1] * scale)), max(1, round(gray.shape[0] * scale)))
+    transform.scale *= size[0] / gray.shape[1]
+    if cv2 is not None:
+        return cv2.resize(gray, size, interpolation=cv2.INTER_CUBIC if scale > 1 else cv2.INTER_AREA)
+    resample = Image.Resampling.BICUBIC if scale > 1 else Image.Resampling.BOX
+    return np.asarray(Image.fromarray(gray).resize(size, resample))
+
+def _binarize(gray: np.ndarray, transform: ImageTransform) -> np.ndarray:
+    """주변 밝기에 맞춘 적응형 이진화. 그라데이션/반투명 배경 위의 글자도 흑백으로 분리합니다."""
+    return np.where(_dark_mask(gray, BINARIZE_OFFSET), 0, 255).astype(np.uint8)
+
+STEP_FUNCTIONS: Dict[str, Callable[[np.ndarray, ImageTransform], np.ndarray]] = {
+    "invert": _invert,
+    "crop": _crop,
+    "rescale": _rescale,
+    "binarize": _binarize,
+}
+
+def rotate(image: Image.Image, degrees: int, transform: ImageTransform) -> Image.Image:
+    """글자가 바로 서도록 이미지를 시계 방향으로 degrees(90/180/270) 만큼 돌립니다. 좌표 변환은 transform 에 기록합니다."""
+    method = _ROTATIONS.get(degrees % 360)
+    if method is None:
+        return image
+    transform.rotate = degrees % 360
+    transform.size = image.size
+    return image.transpose(method)
+
+def to_grayscale(image: Union[Image.Image, RawFrame]) -> np.ndarray:
+    if isinstance(image, RawFrame):
+        array = image.to_array()
+        if array.ndim == 2:
+            return array
+        if cv2 is not None:
+            return cv2.cvtColor(array, cv2.COLOR_BGRA2GRAY)
+        # ITU-R BT.601 가중치 (OpenCV 와 같음), 16비트 정수 연산
+        weighted = array[..., 0] * np.uint16(29) + array[..., 1] * np.uint16(150) + array[..., 2] * np.uint16(77)
+        return ((weighted + 128) >> 8).astype(np.uint8)
+    if cv2 is not None and image.mode in ("RGB", "RGBA"):
+        array = np.asarray(image)
+        return cv2.cvtColor(array, cv2.COLOR_RGBA2GRAY if image.mode == "RGBA" else cv2.COLOR_RGB2GRAY)
+    return np.asarray(image.convert("L"))
+
+class PreprocessStats:
+    """전처리 단계별 누적 시간과 입력/출력 픽셀 수."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._count = 0
+        self._step_s = {}
+        self._pixels_in = 0
+        self._pixels_out = 0
+
+    def record(self, timings: Dict[str, float], pixels_in: int, pixels_out: int):
+        with self._lock:
+            self._count += 1
+            for step, seconds in timings.items():
+                self._step_s[step] = self._step_s.get(step, 0.0) + seconds
+            self._pixels_in += pixels_in
+            self._pixels_out += pixels_out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._count
+            return {
+                "steps": STEPS,
+                "backend": "opencv" if cv2 is not None else "numpy",
+                "images": count,
+                "avg_step_ms": {step: round(s / count * 1000, 3) for step, s in self._step_s.items()} if count else {},
+                "pixel_ratio": round(self._pixels_out / self._pixels_in, 3) if self._pixels_in else 1.0,
+            }
+
+preprocess_stats = PreprocessStats()
+
+def preprocess(image: Union[Image.Image, RawFrame], steps: List[str] = None) -> Tuple[Image.Image, Dict[str, float], ImageTransform]:
+    """
+    흑백으로 변환한 뒤 STEPS 순서대로 전처리한 이미지, 단계별 소요 시간(초), 원본 좌표로 되돌리는 변환을 반환합니다.
+    전처리 단계가 없으면 원본 이미지를 그대로(원시 프레임은 흑백으로만 바꿔) 반환합니다.
+    """
+    steps = STEPS if steps is None else steps
+    transform = ImageTransform()
+    if not steps and not isinstance(image, RawFrame):
+        return image, {}, transform
+
+    timings = {}
+    started = time.perf_counter()
+    gray = to_grayscale(image)
+    timings["grayscale"] = time.perf_counter() - started
+    pixels_in = gray.size
+    for step in steps:
+        fn = STEP_FUNCTIONS.get(step)
+        if fn is None:
+            logger.warning(f"Unknown OCR preprocessing step '{step}'. Skipping.")
+            continue
+        started = time.perf_counter()
+        gray = fn(gray, transform)
+        timings[step] = time.perf_counter() - started
+
+    preprocess_stats.record(timings, pixels_in, gray.size)
+    return Image.fromarray(np.ascontiguousarray(gray)), timings, transform
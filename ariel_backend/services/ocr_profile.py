@@ -0,0 +1,206 @@
+# ariel_backend/services/ocr_profile.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+from ariel_backend.services import config
+from ariel_backend.services.executor import current_client
+from ariel_backend.services.ocr_engine import ocr_engine, DEFAULT_LANGUAGES, DEFAULT_PSM
+from ariel_backend.services.ocr_preprocess import line_spans
+
+logger = logging.getLogger("root")
+
+# 클라이언트 언어 코드(ISO 639-1 / DeepL 코드, 대소문자 무관) -> Tesseract traineddata 이름
+LANGUAGE_CODES = {
+    "en": "eng", "ko": "kor", "ja": "jpn", "zh": "chi_sim", "ar": "ara", "cs": "ces",
+    "de": "deu", "el": "ell", "es": "spa", "fr": "fra", "he": "heb", "id": "ind",
+    "it": "ita", "pt": "por", "ru": "rus", "tr": "tur", "uk": "ukr",
+}
+# 방향/문자 체계 감지(OSD)가 알려 준 문자 체계 -> 인식 언어. 없는 문자 체계는 DEFAULT_LANGUAGES 를 씁니다.
+SCRIPT_LANGUAGES = {
+    "Hangul": "kor",
+    "Japanese": "jpn",
+    "Katakana": "jpn",
+    "Hiragana": "jpn",
+    "Han": "chi_sim",
+    "Latin": "eng",
+    "Cyrillic": "rus",
+    "Greek": "ell",
+    "Arabic": "ara",
+    "Hebrew": "heb",
+}
+AUTO = "auto"
+
+# 감시 영역마다 기억할 프로필 수와 유효 시간(초). 유효 시간이 지나면 다시 감지합니다.
+MAX_PROFILES = config.get_int("ARIEL_OCR_REGION_PROFILES", 1024)
+PROFILE_TTL_S = config.get_float("ARIEL_OCR_REGION_PROFILE_TTL_S", 600.0)
+# 감지에 실패한 영역(osd.traineddata 가 없거나 글자가 너무 적은 화면)은 잠시 기본값을 쓰고 다시 시도합니다.
+FAILED_PROFILE_TTL_S = 30.0
+# 감지 결과를 믿을 최소 신뢰도. 이보다 낮으면 회전하지 않거나 문자 체계 대신 기본 언어를 씁니다.
+MIN_ORIENTATION_CONF = config.get_float("ARIEL_OCR_MIN_ORIENTATION_CONF", 2.0)
+MIN_SCRIPT_CONF = config.get_float("ARIEL_OCR_MIN_SCRIPT_CONF", 1.0)
+# 인식 결과의 평균 신뢰도가 이보다 낮으면 화면 내용이 바뀐 것으로 보고 영역의 프로필을 버립니다.
+MIN_RECOGNITION_CONF = config.get_float("ARIEL_OCR_PROFILE_MIN_CONFIDENCE", 40.0)
+
+# 페이지 분할 모드 (Tesseract --psm)
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+# 한 덩어리로 볼 최대 글줄 수와, 글줄 사이 여백이 글줄 높이의 몇 배 이하여야 하는지
+MAX_BLOCK_LINES = 8
+MAX_BLOCK_GAP_RATIO = 1.5
+
+def to_tesseract_languages(languages: Optional[str]) -> Optional[str]:
+    """
+    'JA', 'ko,en', 'kor+eng' 같은 언어 지정을 Tesseract 언어 조합('jpn', 'kor+eng')으로 바꿉니다.
+    비어 있거나 'auto' 이면 None (영역의 문자 체계로 정함). 모르는 코드는 ValueError 를 발생시킵니다.
+    """
+    if not languages or languages.strip().lower() == AUTO:
+        return None
+    result = []
+    for code in languages.replace(",", "+").split("+"):
+        code = code.strip()
+        if not code:
+            continue
+        # 'EN-US', 'PT-BR' 같은 DeepL 지역 코드는 언어 부분만 봅니다.
+        base = code.lower().split("-")[0]
+        tesseract = LANGUAGE_CODES.get(base)
+        if tesseract is None:
+            if not code.replace("_", "").isalpha() or len(code) < 3:
+                raise ValueError(f"Unknown OCR language '{code}'.")
+            # 이미 Tesseract 이름(jpn_vert, chi_tra ...)인 경우
+            tesseract = code
+        if tesseract not in result:
+            result.append(tesseract)
+    if not result:
+        return None
+
+    installed = ocr_engine.installed_languages()
+    if installed is not None:
+        missing = [language for language in result if language not in installed]
+        if missing:
+            raise ValueError(f"OCR language data is not installed: {', '.join(missing)}.")
+    return "+".join(result)
+
+def choose_psm(gray: np.ndarray) -> int:
+    """전처리된 이미지의 글줄 배치로 페이지 분할 모드를 고릅니다. (한 줄 -> 7, 고르게 붙은 몇 줄 -> 6, 그 외 -> 자동)"""
+    spans = line_spans(gray)
+    if len(spans) == 1:
+        return PSM_SINGLE_LINE
+    if 1 < len(spans) <= MAX_BLOCK_LINES:
+        heights = spans[:, 1] - spans[:, 0]
+        gaps = spans[1:, 0] - spans[:-1, 1]
+        if gaps.max() <= np.median(heights) * MAX_BLOCK_GAP_RATIO:
+            return PSM_SINGLE_BLOCK
+    return DEFAULT_PSM
+
+class RegionProfile:
+    """감시 영역 하나의 인식 설정: 언어 조합, 페이지 분할 모드, 회전 각도와 감지된 문자 체계."""
+    def __init__(self, languages: str, psm: int = DEFAULT_PSM, rotate: int = 0, script: Optional[str] = None,
+                 source: str = "default", ttl_s: float = PROFILE_TTL_S):
+        self.languages = languages
+        self.psm = psm
+        self.rotate = rotate
+        self.script = script
+        self.source = source
+        self.expires_at = time.monotonic() + ttl_s
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"languages": self.languages, "psm": self.psm, "rotate": self.rotate, "script": self.script, "source": self.source}
+
+class RegionProfileCache:
+    """
+    클라이언트의 감시 영역(region_id)별 인식 설정을 기억합니다.
+    영역을 처음 볼 때 한 번만 방향/문자 체계를 감지하고 글줄 배치로 분할 모드를 골라 두어,
+    이후 프레임은 감지를 건너뛰고 필요한 traineddata 만으로 인식합니다.
+    """
+    def __init__(self, max_profiles: int = MAX_PROFILES):
+        self.max_profiles = max_profiles
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._detections = 0
+        self._failures = 0
+        self._detect_s = 0.0
+
+    def _key(self, region_id: str, languages: Optional[str]):
+        return current_client.get(), region_id, languages
+
+    def resolve(self, image: Image.Image, languages: Optional[str] = None, region_id: Optional[str] = None) -> RegionProfile:
+        """
+        전처리된 이미지에 쓸 인식 설정을 반환합니다. languages 는 to_tesseract_languages() 로 바꾼 값(None 이면 자동)입니다.
+        region_id 가 없으면 감지하지 않고 요청한 언어(없으면 DEFAULT_LANGUAGES)와 기본 분할 모드를 씁니다.
+        """
+        if not region_id:
+            return RegionProfile(languages or DEFAULT_LANGUAGES)
+
+        key = self._key(region_id, languages)
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None and profile.expires_at > time.monotonic():
+                self._profiles.move_to_end(key)
+                self._hits += 1
+                return profile
+            self._misses += 1
+
+        profile = self._detect(image, languages)
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def _detect(self, image: Image.Image, languages: Optional[str]) -> RegionProfile:
+        psm = choose_psm(np.asarray(image if image.mode == "L" else image.convert("L")))
+        started = time.monotonic()
+        try:
+            osd = ocr_engine.detect_orientation(image)
+        except Exception as e:
+            logger.info(f"OCR orientation/script detection failed, using defaults: {e}")
+            with self._lock:
+                self._failures += 1
+            return RegionProfile(languages or DEFAULT_LANGUAGES, psm, source="fallback", ttl_s=FAILED_PROFILE_TTL_S)
+        finally:
+            elapsed = time.monotonic() - started
+            with self._lock:
+                self._detections += 1
+                self._detect_s += elapsed
+
+        rotate = osd["rotate"] if osd["orientation_conf"] >= MIN_ORIENTATION_CONF else 0
+        script = osd["script"]
+        if languages is None:
+            detected = SCRIPT_LANGUAGES.get(script) if osd["script_conf"] >= MIN_SCRIPT_CONF else None
+            installed = ocr_engine.installed_languages()
+            if detected is not None and installed is not None and detected not in installed:
+                detected = None
+            languages = detected or DEFAULT_LANGUAGES
+        logger.info(f"OCR region profile: script={script} rotate={rotate} psm={psm} languages={languages}")
+        return RegionProfile(languages, psm, rotate, script, source="detected")
+
+    def forget(self, region_id: Optional[str], languages: Optional[str] = None):
+        """영역의 프로필을 버려 다음 프레임에서 다시 감지하게 합니다."""
+        if not region_id:
+            return
+        with self._lock:
+            self._profiles.pop(self._key(region_id, languages), None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "profiles": len(self._profiles),
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "detections": self._detections,
+                "detection_failures": self._failures,
+                "avg_detect_ms": round(self._detect_s / self._detections * 1000, 3) if self._detections else 0.0,
+            }
+
+region_profiles = RegionProfileCache()
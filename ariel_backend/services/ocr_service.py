@@ -1,19 +1,68 @@
 # ariel_backend/services/ocr_service.py
-import pytesseract
 from PIL import Image
 import io
 import logging
+from typing import Any, Dict, Optional, Union
 
-def process_image_with_ocr(image_bytes: bytes) -> str:
+from ariel_backend.services.ocr_engine import ocr_engine, lines_to_text
+from ariel_backend.services.ocr_preprocess import preprocess, rotate, RawFrame
+from ariel_backend.services.ocr_profile import region_profiles, MIN_RECOGNITION_CONF
+from ariel_backend.services.ocr_tiling import TILE_MIN_PIXELS, recognize_tiled
+
+def _load_image(image_bytes: Union[bytes, RawFrame], languages: Optional[str], region_id: Optional[str]):
+    # 원시 프레임은 디코딩 없이 버퍼를 그대로 배열로 보고 흑백으로 바꿉니다.
+    image = image_bytes if isinstance(image_bytes, RawFrame) else Image.open(io.BytesIO(image_bytes))
+    processed, timings, transform = preprocess(image)
+    logging.debug(f"OCR 전처리 시간(ms): { {step: round(s * 1000, 2) for step, s in timings.items()} }")
+    profile = region_profiles.resolve(processed, languages, region_id)
+    processed = rotate(processed, profile.rotate, transform)
+    return image, processed, transform, profile
+
+def process_image_with_ocr(image_bytes: Union[bytes, RawFrame], languages: Optional[str] = None, region_id: Optional[str] = None) -> str:
     """
-    Bytes 형식의 이미지를 받아 OCR을 수행하고 텍스트를 반환합니다.
+    Bytes 형식의 이미지(PNG 등) 또는 원시 프레임(RawFrame)을 받아 OCR을 수행하고 텍스트를 반환합니다.
+    흑백 변환/반전/여백 자르기/크기 조정/이진화로 전처리한 뒤, 미리 초기화된 Tesseract 핸들 풀(ocr_engine)에서 인식합니다.
+    큰 이미지는 가로 띠로 나누어 병렬로 인식합니다. (ocr_tiling 참고)
+    languages 는 Tesseract 언어 조합(None 이면 자동), region_id 는 클라이언트의 감시 영역입니다.
+    영역마다 처음 한 번 감지한 언어/분할 모드/방향을 기억해 두고 이후 프레임에 씁니다. (ocr_profile 참고)
     """
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        # 필요 시, 여기서 이미지 전처리(흑백 변환 등)를 수행하면 인식률이 향상됩니다.
-        text = pytesseract.image_to_string(image, lang='kor+eng')
+        _, image, _, profile = _load_image(image_bytes, languages, region_id)
+        if image.width * image.height >= TILE_MIN_PIXELS:
+            text = lines_to_text(recognize_tiled(image, profile.languages, profile.psm))
+        else:
+            text = ocr_engine.recognize(image, profile.languages, profile.psm)
         logging.info(f"OCR 추출 성공: {text.strip()}")
         return text.strip()
     except Exception as e:
         logging.error(f"OCR 처리 중 오류 발생: {e}", exc_info=True)
-        return ""
\ No newline at end of file
+        return ""
+
+def process_image_with_layout(image_bytes: Union[bytes, RawFrame], languages: Optional[str] = None, region_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    process_image_with_ocr() 와 같지만 텍스트와 함께 글줄/단어별 위치와 신뢰도, 사용한 언어와 분할 모드를 반환합니다.
+    상자([x, y, w, h])는 전처리 전 원본 이미지 좌표입니다.
+    """
+    try:
+        original, image, transform, profile = _load_image(image_bytes, languages, region_id)
+        lines = recognize_tiled(image, profile.languages, profile.psm)
+        if lines and sum(line["confidence"] for line in lines) / len(lines) < MIN_RECOGNITION_CONF:
+            # 영역의 내용(언어/배치)이 바뀐 것으로 보고 다음 프레임에서 다시 감지합니다.
+            region_profiles.forget(region_id, languages)
+        for line in lines:
+            line["box"] = transform.to_original(line["box"])
+            for word in line["words"]:
+                word["box"] = transform.to_original(word["box"])
+        text = lines_to_text(lines)
+        logging.info(f"OCR 추출 성공 ({len(lines)} lines): {text}")
+        return {
+            "text": text,
+            "width": original.width,
+            "height": original.height,
+            "lines": lines,
+            "languages": profile.languages,
+            "psm": profile.psm,
+        }
+    except Exception as e:
+        logging.error(f"OCR 처리 중 오류 발생: {e}", exc_info=True)
+        return {"text": "", "lines": []}
@@ -0,0 +1,134 @@
+# ariel_backend/services/ocr_tiling.py
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+from ariel_backend.services import config
+from ariel_backend.services.ocr_engine import ocr_engine
+from ariel_backend.services.ocr_preprocess import content_rows
+
+logger = logging.getLogger("root")
+
+# 가로 띠를 동시에 인식할 스레드 수. Tesseract(tesserocr)는 인식 중 GIL 을 놓고, pytesseract 는 별도 프로세스에서
+# 인식하므로 스레드만으로도 여러 코어를 씁니다.
+TILE_WORKERS = config.get_int("ARIEL_OCR_TILE_WORKERS", os.cpu_count() or 1)
+# 전처리 후 이미지가 이 픽셀 수 이상일 때만 나눕니다. 작은 이미지는 띠마다 드는 고정 비용 때문에 한 번에 인식하는 편이 빠릅니다.
+# (bench_ocr_tiling 으로 배포 환경의 교차점을 측정해 조정)
+TILE_MIN_PIXELS = config.get_int("ARIEL_OCR_TILE_MIN_PIXELS", 2_000_000)
+# 띠 하나의 최소 높이(px). 이보다 잘게 나누지 않습니다.
+TILE_MIN_BAND_PX = config.get_int("ARIEL_OCR_TILE_MIN_BAND_PX", 256)
+# 이웃 띠와 겹치는 높이(px). 경계에 걸린 글줄이 적어도 한 띠에는 온전히 들어가도록 글줄 높이보다 크게 둡니다.
+TILE_OVERLAP_PX = config.get_int("ARIEL_OCR_TILE_OVERLAP_PX", 48)
+# 띠 경계의 빈 줄(글자 없는 행)을 찾을 범위 (띠 높이에 대한 비율)
+GAP_SEARCH_RATIO = 0.25
+# 띠 가장자리에서 이만큼(px) 안에 닿은 글줄은 잘린 것으로 봅니다.
+EDGE_PX = 1
+# 띠 번호마다 block 번호를 이만큼 띄워, 서로 다른 띠의 문단이 섞이지 않게 합니다.
+BLOCK_STRIDE = 1000
+
+_band_pool = ThreadPoolExecutor(max_workers=max(1, TILE_WORKERS), thread_name_prefix="ocr-band")
+
+def _nearest_gap(blank: np.ndarray, target: int, radius: int) -> Optional[int]:
+    """target 에서 radius 안에 있는 가장 가까운 빈 줄 구간의 가운데 행을 찾습니다."""
+    low, high = max(1, target - radius), min(len(blank) - 1, target + radius)
+    candidates = np.flatnonzero(blank[low:high]) + low
+    if candidates.size == 0:
+        return None
+    row = int(candidates[np.argmin(np.abs(candidates - target))])
+    top = row
+    while top > low and blank[top - 1]:
+        top -= 1
+    bottom = row
+    while bottom < high - 1 and blank[bottom + 1]:
+        bottom += 1
+    return (top + bottom) // 2
+
+def plan_bands(gray: np.ndarray, workers: int = TILE_WORKERS) -> List[Tuple[int, int]]:
+    """
+    이미지를 나눌 띠 목록 [(start, end), ...] 을 만듭니다. 실제로 인식할 때는 위아래로 TILE_OVERLAP_PX 씩 넓혀 자릅니다.
+    경계는 균등 분할 위치에서 가장 가까운 빈 줄(글줄 사이 여백)로 옮겨, 글줄이 잘리지 않게 합니다.
+    """
+    height = gray.shape[0]
+    if gray.size < TILE_MIN_PIXELS or workers <= 1:
+        return [(0, height)]
+    count = min(workers, height // max(1, TILE_MIN_BAND_PX))
+    if count <= 1:
+        return [(0, height)]
+
+    blank = ~content_rows(gray)
+    band_px = height / count
+    cuts = [0]
+    for k in range(1, count):
+        target = round(band_px * k)
+        gap = _nearest_gap(blank, target, round(band_px * GAP_SEARCH_RATIO))
+        cut = gap if gap is not None else target
+        if cut - cuts[-1] >= TILE_MIN_BAND_PX // 2:
+            cuts.append(cut)
+    cuts.append(height)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+def _overlap_ratio(a: List[int], b: List[int]) -> float:
+    """두 상자의 겹친 넓이를 작은 상자의 넓이로 나눈 값."""
+    width = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    height = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    return width * height / min(a[2] * a[3], b[2] * b[3])
+
+def _shift(line: Dict[str, Any], dy: int, band_index: int) -> Dict[str, Any]:
+    line["box"][1] += dy
+    for word in line["words"]:
+        word["box"][1] += dy
+    line["block"] += band_index * BLOCK_STRIDE
+    return line
+
+def merge_bands(extents: List[Tuple[int, int]], results: List[List[Dict[str, Any]]], height: int) -> List[Dict[str, Any]]:
+    """
+    띠별 인식 결과(이미 전체 이미지 좌표로 옮긴 글줄)를 읽는 순서대로 합칩니다. extents 는 띠마다 잘라 낸 [top, bottom) 행입니다.
+    띠 가장자리에 닿아 잘렸을 수 있는 글줄은 버리고(겹친 구간 덕분에 이웃 띠에는 온전히 들어 있음),
+    겹친 구간에서 두 띠가 모두 온전히 인식한 글줄은 신뢰도가 높은 쪽만 남깁니다.
+    """
+    merged = []
+    previous = []
+    for (top, bottom), lines in zip(extents, results):
+        kept = []
+        for line in lines:
+            x, y, w, h = line["box"]
+            if (top > 0 and y <= top + EDGE_PX) or (bottom < height and y + h >= bottom - EDGE_PX):
+                continue
+            duplicate = next((other for other in previous if _overlap_ratio(other["box"], line["box"]) > 0.5), None)
+            if duplicate is None:
+                kept.append(line)
+            elif line["confidence"] > duplicate["confidence"]:
+                merged[merged.index(duplicate)] = line
+        merged.extend(kept)
+        previous = kept
+    return merged
+
+def recognize_tiled(image: Image.Image, languages: Optional[str] = None, psm: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    큰 이미지를 빈 줄 위치에서 겹치는 가로 띠로 나누어 병렬로 인식하고, 글줄을 읽는 순서대로 합쳐 반환합니다.
+    작은 이미지는 나누지 않고 한 번에 인식합니다. 상자는 입력 이미지 좌표입니다.
+    """
+    gray = np.asarray(image if image.mode == "L" else image.convert("L"))
+    bands = plan_bands(gray)
+    if len(bands) == 1:
+        return ocr_engine.recognize_lines(image, languages, psm)
+
+    height = gray.shape[0]
+    extents = [(max(0, start - TILE_OVERLAP_PX), min(height, end + TILE_OVERLAP_PX)) for start, end in bands]
+    logger.debug(f"OCR tiling {image.width}x{image.height} into {len(bands)} bands: {extents}")
+
+    futures = [
+        _band_pool.submit(ocr_engine.recognize_lines, image.crop((0, top, image.width, bottom)), languages, psm)
+        for top, bottom in extents
+    ]
+    results = [
+        [_shift(line, top, index) for line in future.result()]
+        for index, ((top, _), future) in enumerate(zip(extents, futures))
+    ]
+    return merge_bands(extents, results, height)
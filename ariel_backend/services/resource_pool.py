@@ -0,0 +1,132 @@
+# ariel_backend/services/resource_pool.py
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger("root")
+
+class PoolTimeoutError(RuntimeError):
+    """풀에서 정해진 시간 안에 자원을 대여하지 못했을 때 발생합니다."""
+
+class ResourcePool:
+    """
+    스레드 안전한 체크아웃/체크인 방식의 자원 풀.
+    min_size 만큼 미리 생성해 두고, 모든 자원이 사용 중이면 max_size 까지 필요할 때 추가 생성합니다.
+    상한에 도달하면 다른 요청이 자원을 반납할 때까지 대기하며, 대기 시간을 통계로 기록합니다.
+    """
+    def __init__(self, name: str, factory: Callable[[], Any], min_size: int = 1, max_size: int = 1,
+                 reset: Optional[Callable[[Any], None]] = None):
+        self.name = name
+        self.max_size = max(1, max_size)
+        self.min_size = max(0, min(min_size, self.max_size))
+        self._factory = factory
+        self._reset = reset
+        self._idle = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+
+        # 통계
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait_s = 0.0
+        self._max_wait_s = 0.0
+        self._peak_in_use = 0
+
+        for _ in range(self.min_size):
+            self._idle.append(self._factory())
+            self._size += 1
+
+    @property
+    def in_use(self) -> int:
+        with self._cond:
+            return self._size - len(self._idle)
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """유휴 자원을 대여합니다. timeout 초 안에 대여하지 못하면 PoolTimeoutError 를 발생시킵니다."""
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        waited = False
+        create = False
+        resource = None
+
+        with self._cond:
+            while True:
+                if self._idle:
+                    resource = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # 자원 생성은 락 밖에서 수행하고, 자리만 먼저 예약합니다.
+                    self._size += 1
+                    create = True
+                    break
+                waited = True
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(f"Timed out waiting for a resource from pool '{self.name}'.")
+                self._cond.wait(remaining)
+
+        if create:
+            try:
+                resource = self._factory()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            logger.debug(f"Pool '{self.name}' grew to {self._size}/{self.max_size}.")
+
+        wait_s = time.monotonic() - start
+        with self._cond:
+            self._checkouts += 1
+            if waited:
+                self._waits += 1
+                self._total_wait_s += wait_s
+                self._max_wait_s = max(self._max_wait_s, wait_s)
+            self._peak_in_use = max(self._peak_in_use, self._size - len(self._idle))
+        return resource
+
+    def release(self, resource: Any, discard: bool = False):
+        """자원을 반납합니다. 초기화에 실패했거나 discard=True 이면 자원을 폐기합니다."""
+        if not discard and self._reset is not None:
+            try:
+                self._reset(resource)
+            except Exception as e:
+                logger.warning(f"Failed to reset resource from pool '{self.name}': {e}. Discarding it.")
+                discard = True
+
+        with self._cond:
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append(resource)
+            self._cond.notify()
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None):
+        """with 문으로 자원을 대여하고, 블록을 벗어나면 자동으로 반납합니다."""
+        resource = self.acquire(timeout)
+        try:
+            yield resource
+        except Exception:
+            self.release(resource, discard=True)
+            raise
+        else:
+            self.release(resource)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self._size,
+                "idle": idle,
+                "in_use": self._size - idle,
+                "max_size": self.max_size,
+                "peak_in_use": self._peak_in_use,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "avg_wait_ms": round(self._total_wait_s / self._waits * 1000, 3) if self._waits else 0.0,
+                "max_wait_ms": round(self._max_wait_s * 1000, 3),
+            }
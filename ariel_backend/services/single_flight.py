@@ -0,0 +1,81 @@
+# ariel_backend/services/single_flight.py
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+# 0 이면 같은 요청을 합치지 않고 모두 따로 처리합니다.
+ENABLED = config.get_int("ARIEL_SINGLE_FLIGHT", 1) > 0
+
+def flight_key(payload: bytes, *params: Any) -> Hashable:
+    """요청 본문의 해시와 결과에 영향을 주는 매개변수로 같은 요청인지 가르는 키를 만듭니다."""
+    return hashlib.blake2b(payload, digest_size=16).digest(), params
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    같은 키의 요청이 처리되는 동안 들어온 요청은 새로 계산하지 않고 진행 중인 계산의 결과를 함께 받습니다.
+    (결과를 저장해 두지는 않으므로 끝난 뒤에 온 요청은 다시 계산합니다)
+    마감 시각과 공정 큐 비용은 처음 요청(leader)의 것을 따르며, 기다리는 요청이 모두 떠나야 계산을 취소합니다.
+    이벤트 루프 스레드에서만 사용하므로 잠금이 필요 없습니다.
+    """
+    def __init__(self, name: str, enabled: bool = ENABLED):
+        self.name = name
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._leaders = 0
+        self._joined = 0
+        self._cancelled = 0
+        self._max_waiters = 0
+
+    async def run(self, key: Hashable, start: Callable[[], Awaitable[Any]]) -> Any:
+        """key 로 진행 중인 계산이 있으면 그 결과를, 없으면 start() 를 실행한 결과를 기다립니다."""
+        if not self.enabled:
+            return await start()
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = self._flights[key] = _Flight(asyncio.ensure_future(start()))
+            flight.task.add_done_callback(lambda _: self._finish(key, flight))
+            self._leaders += 1
+        else:
+            self._joined += 1
+        flight.waiters += 1
+        self._max_waiters = max(self._max_waiters, flight.waiters)
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                # 결과를 기다리는 요청이 더 없으므로 대기 중인 작업을 버립니다.
+                flight.task.cancel()
+                self._cancelled += 1
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _finish(self, key: Hashable, flight: _Flight):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self._leaders + self._joined
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._flights),
+            "computations": self._leaders,
+            "coalesced": self._joined,
+            "coalesce_rate": round(self._joined / requests, 4) if requests else 0.0,
+            "cancelled": self._cancelled,
+            "max_waiters": self._max_waiters,
+        }
+
+stt_flights = SingleFlight("stt")
+ocr_flights = SingleFlight("ocr")
@@ -0,0 +1,198 @@
+# ariel_backend/services/stt_engines.py
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from vosk import Model, KaldiRecognizer
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+# Docker 컨테이너 내 /app/models/vosk 를 기준으로 모델 경로 정의
+MODEL_BASE_DIR = "models/vosk"
+
+# 오디오 샘플링 레이트는 16000Hz로 고정
+SAMPLE_RATE = 16000
+
+# 지원할 16개 언어 및 모델 폴더명 정의 (정확도 우선 대형 모델)
+# 실제 폴더명과 일치해야 합니다.
+MODEL_PATHS = {
+    "ar": "vosk-model-ar-0.22-linto-1.1.0",
+    "cs": "vosk-model-cs-0.6-multi",
+    "de": "vosk-model-de-0.21",
+    "el": "vosk-model-el-gr-0.7",
+    "en": "vosk-model-en-us-0.22",
+    "es": "vosk-model-es-0.42",
+    "fr": "vosk-model-fr-0.22",
+    "he": "vosk-model-he-0.18",
+    "id": "vosk-model-id-0.4",
+    "it": "vosk-model-it-0.22",
+    "ja": "vosk-model-ja-0.22",
+    "ko": "vosk-model-ko-0.22",
+    "pt": "vosk-model-pt-0.3",
+    "ru": "vosk-model-ru-0.42",
+    "tr": "vosk-model-tr-0.3",
+    "uk": "vosk-model-uk-0.4-lbuild",
+}
+
+# 지연 시간 우선 소형 모델. 폴더가 없는 언어는 대형 모델로 대체됩니다.
+SMALL_MODEL_PATHS = {
+    "cs": "vosk-model-small-cs-0.4-rhasspy",
+    "de": "vosk-model-small-de-0.15",
+    "en": "vosk-model-small-en-us-0.15",
+    "es": "vosk-model-small-es-0.42",
+    "fr": "vosk-model-small-fr-0.22",
+    "it": "vosk-model-small-it-0.22",
+    "ja": "vosk-model-small-ja-0.22",
+    "ko": "vosk-model-small-ko-0.22",
+    "pt": "vosk-model-small-pt-0.3",
+    "ru": "vosk-model-small-ru-0.22",
+    "tr": "vosk-model-small-tr-0.3",
+    "uk": "vosk-model-small-uk-v3-small",
+}
+
+# 클라이언트 설정의 stt_model_size 값을 엔진에 대응시킵니다. 엔진 이름을 직접 보내도 됩니다.
+MODEL_SIZE_ENGINES = {
+    "tiny": "vosk-small",
+    "base": "vosk-small",
+    "small": "vosk-small",
+    "medium": "vosk",
+    "large": "vosk",
+}
+DEFAULT_ENGINE = os.getenv("ARIEL_STT_DEFAULT_ENGINE", "vosk")
+# 엔진별 recognizer 풀 크기 (예: "vosk-small:4"). 지정하지 않으면 ARIEL_STT_POOL_MIN_SIZE / MAX_SIZE 를 따릅니다.
+ENGINE_POOL_MIN_SIZES = config.get_int_mapping("ARIEL_STT_ENGINE_POOL_MIN_SIZES")
+ENGINE_POOL_MAX_SIZES = config.get_int_mapping("ARIEL_STT_ENGINE_POOL_MAX_SIZES")
+
+class LatencyStats:
+    """최근 window 개 요청의 디코딩 지연 시간 분포를 기록합니다."""
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=window)
+        self._count = 0
+        self._total_s = 0.0
+        self._max_s = 0.0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._recent.append(seconds)
+            self._count += 1
+            self._total_s += seconds
+            self._max_s = max(self._max_s, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            recent = sorted(self._recent)
+            count = self._count
+            total_s = self._total_s
+            max_s = self._max_s
+
+        def percentile(p: float) -> float:
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))] * 1000, 3) if recent else 0.0
+
+        return {
+            "count": count,
+            "avg_ms": round(total_s / count * 1000, 3) if count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(max_s * 1000, 3),
+        }
+
+class STTEngine:
+    """
+    STT 엔진(모델 계열) 하나에 대한 정의.
+    새 엔진은 이 클래스를 상속해 load_model() 과 create_recognizer() 를 구현하고 register_engine() 으로 등록합니다.
+    create_recognizer() 가 만드는 객체는 Vosk KaldiRecognizer 와 같은 메서드
+    (AcceptWaveform, Result, PartialResult, FinalResult, Reset)를 제공해야 합니다.
+    구문 목록 문법으로 어휘를 제한할 수 있는 엔진은 supports_grammar 를 True 로 두고 grammar 인자를 처리합니다.
+    """
+    supports_grammar = False
+
+    def __init__(self, name: str, tier: str, model_paths: Dict[str, str], base_dir: str = MODEL_BASE_DIR):
+        self.name = name
+        self.tier = tier
+        self.model_names = dict(model_paths)
+        self.model_paths = {}
+        self.latency = LatencyStats()
+
+        missing = []
+        for lang_code, model_name in self.model_names.items():
+            model_path = os.path.join(base_dir, model_name)
+            if os.path.exists(model_path):
+                self.model_paths[lang_code] = model_path
+            else:
+                missing.append(lang_code)
+        if missing:
+            logger.warning(f"STT engine '{name}': model path not found for {missing} under {base_dir}. Skipping.")
+
+    @property
+    def languages(self) -> List[str]:
+        return list(self.model_paths)
+
+    def pool_min_size(self, default: int) -> int:
+        return ENGINE_POOL_MIN_SIZES.get(self.name, default)
+
+    def pool_max_size(self, default: int) -> int:
+        return ENGINE_POOL_MAX_SIZES.get(self.name, default)
+
+    def load_model(self, model_path: str) -> Any:
+        raise NotImplementedError
+
+    def create_recognizer(self, model: Any, grammar: Optional[str] = None) -> Any:
+        """grammar 는 구문 목록의 JSON 문자열이며, 주어지면 그 구문만 인식하는 recognizer를 만듭니다."""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tier": self.tier, "languages": self.languages, "supports_grammar": self.supports_grammar,
+                "latency": self.latency.stats()}
+
+class VoskEngine(STTEngine):
+    supports_grammar = True
+
+    def load_model(self, model_path: str) -> Model:
+        return Model(model_path)
+
+    def create_recognizer(self, model: Model, grammar: Optional[str] = None) -> KaldiRecognizer:
+        if grammar is not None:
+            return KaldiRecognizer(model, SAMPLE_RATE, grammar)
+        return KaldiRecognizer(model, SAMPLE_RATE)
+
+_ENGINES: Dict[str, STTEngine] = {}
+
+def register_engine(engine: STTEngine):
+    """엔진을 레지스트리에 등록합니다. 같은 이름이 있으면 교체합니다."""
+    _ENGINES[engine.name] = engine
+    logger.info(f"Registered STT engine '{engine.name}' ({engine.tier}) with languages {engine.languages}")
+
+def get_engine(name: str) -> STTEngine:
+    if name not in _ENGINES:
+        raise ValueError(f"Unknown STT engine: {name}. Available: {list(_ENGINES)}")
+    return _ENGINES[name]
+
+def list_engines() -> List[STTEngine]:
+    return list(_ENGINES.values())
+
+def resolve_engine(language: str, model_size: Optional[str] = None) -> STTEngine:
+    """
+    요청한 모델 크기(또는 엔진 이름)에 맞는 엔진을 고릅니다.
+    해당 엔진에 그 언어의 모델이 없으면 등록 순서대로 다른 엔진으로 대체합니다.
+    """
+    if model_size in _ENGINES:
+        preferred = model_size
+    else:
+        preferred = MODEL_SIZE_ENGINES.get(model_size, DEFAULT_ENGINE) if model_size else DEFAULT_ENGINE
+
+    candidates = [preferred] + [name for name in _ENGINES if name != preferred]
+    for name in candidates:
+        engine = _ENGINES.get(name)
+        if engine is not None and language in engine.model_paths:
+            if name != preferred:
+                logger.debug(f"No '{preferred}' model for '{language}'. Falling back to '{name}'.")
+            return engine
+    raise ValueError(f"Unsupported or unloaded language: {language}")
+
+register_engine(VoskEngine("vosk", "accurate", MODEL_PATHS))
+register_engine(VoskEngine("vosk-small", "fast", SMALL_MODEL_PATHS))
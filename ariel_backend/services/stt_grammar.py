@@ -0,0 +1,83 @@
+# ariel_backend/services/stt_grammar.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List
+
+from ariel_backend.services import config
+
+logger = logging.getLogger("root")
+
+# 한 문법에 넣을 수 있는 최대 구문 수와, 등록해 둘 수 있는 문법 수 (초과 시 가장 오래 쓰지 않은 문법부터 삭제)
+MAX_PHRASES = config.get_int("ARIEL_STT_GRAMMAR_MAX_PHRASES", 1000)
+MAX_GRAMMARS = config.get_int("ARIEL_STT_GRAMMAR_MAX_COUNT", 256)
+# 문법에 없는 말은 이 토큰으로 인식되어, 엉뚱한 명령어로 잘못 맞춰지지 않게 합니다.
+UNKNOWN_TOKEN = "[unk]"
+
+class Grammar:
+    """
+    Vosk 구문 목록 문법. 구문을 정규화/정렬하여 같은 구문 집합이면 항상 같은 grammar_id 를 갖습니다.
+    """
+    def __init__(self, language: str, phrases: List[str]):
+        self.language = language
+        self.phrases = phrases
+        digest = hashlib.sha1("\n".join([language] + phrases).encode("utf-8")).hexdigest()
+        self.grammar_id = digest[:16]
+        self.json = json.dumps(phrases + [UNKNOWN_TOKEN], ensure_ascii=False)
+        self.created_at = time.time()
+
+    def info(self) -> Dict[str, Any]:
+        return {"grammar_id": self.grammar_id, "language": self.language, "phrases": len(self.phrases)}
+
+def normalize_phrases(phrases: Iterable[str]) -> List[str]:
+    """소문자로 바꾸고 공백을 정리한 뒤, 중복을 없애고 정렬합니다."""
+    return sorted({" ".join(str(phrase).lower().split()) for phrase in phrases} - {""})
+
+class GrammarRegistry:
+    """등록된 문법을 grammar_id 로 찾는 LRU 레지스트리."""
+    def __init__(self, max_size: int = MAX_GRAMMARS):
+        self.max_size = max_size
+        self._grammars = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, language: str, phrases: Iterable[str]) -> Grammar:
+        normalized = normalize_phrases(phrases)
+        if not normalized:
+            raise ValueError("A grammar needs at least one non-empty phrase.")
+        if len(normalized) > MAX_PHRASES:
+            raise ValueError(f"Too many phrases: {len(normalized)}. At most {MAX_PHRASES} are allowed.")
+
+        grammar = Grammar(language, normalized)
+        with self._lock:
+            existing = self._grammars.get(grammar.grammar_id)
+            if existing is not None:
+                self._grammars.move_to_end(grammar.grammar_id)
+                return existing
+            self._grammars[grammar.grammar_id] = grammar
+            while len(self._grammars) > self.max_size:
+                old_id, _ = self._grammars.popitem(last=False)
+                logger.info(f"Dropped least recently used STT grammar '{old_id}'.")
+        logger.info(f"Registered STT grammar '{grammar.grammar_id}' for '{language}' ({len(normalized)} phrases).")
+        return grammar
+
+    def get(self, grammar_id: str) -> Grammar:
+        with self._lock:
+            grammar = self._grammars.get(grammar_id)
+            if grammar is None:
+                raise ValueError(f"Unknown grammar_id: {grammar_id}. Register it with POST /stt/grammars first.")
+            self._grammars.move_to_end(grammar_id)
+            return grammar
+
+    def remove(self, grammar_id: str):
+        with self._lock:
+            if self._grammars.pop(grammar_id, None) is None:
+                raise ValueError(f"Unknown grammar_id: {grammar_id}")
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [grammar.info() for grammar in self._grammars.values()]
+
+grammar_registry = GrammarRegistry()
@@ -2,100 +2,705 @@
 import logging
 import os
 import json
-from vosk import Model, KaldiRecognizer
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+from ariel_backend.services import config
+from ariel_backend.services.stt_engines import (
+    SAMPLE_RATE, STTEngine, get_engine, list_engines, resolve_engine,
+)
+from ariel_backend.services.resource_pool import ResourcePool
+from ariel_backend.services.audio_gate import silence_gate
+from ariel_backend.services.audio_fingerprint import fingerprint, result_cache
+from ariel_backend.services.stt_grammar import Grammar, grammar_registry
+from ariel_backend.services.executor import WorkCancelledError, check_cancelled
+from ariel_backend.services.language_id import (
+    AUTO_LANGUAGE, AUTO_CANDIDATES, AutoSTTSession, CACHE_MIN_SCORE, confidence_score, decision_cache,
+)
 
 logger = logging.getLogger("root")
 
-# Docker 컨테이너 내 /app/models/vosk 를 기준으로 모델 경로 정의
-MODEL_BASE_DIR = "models/vosk"
-
-# 지원할 16개 언어 및 모델 폴더명 정의
-# 실제 폴더명과 일치해야 합니다.
-MODEL_PATHS = {
-    "ar": "vosk-model-ar-0.22-linto-1.1.0",
-    "cs": "vosk-model-cs-0.6-multi",
-    "de": "vosk-model-de-0.21",
-    "el": "vosk-model-el-gr-0.7",
-    "en": "vosk-model-en-us-0.22",
-    "es": "vosk-model-es-0.42",
-    "fr": "vosk-model-fr-0.22",
-    "he": "vosk-model-he-0.18",
-    "id": "vosk-model-id-0.4",
-    "it": "vosk-model-it-0.22",
-    "ja": "vosk-model-ja-0.22",
-    "ko": "vosk-model-ko-0.22",
-    "pt": "vosk-model-pt-0.3",
-    "ru": "vosk-model-ru-0.42",
-    "tr": "vosk-model-tr-0.3",
-    "uk": "vosk-model-uk-0.4-lbuild",
-}
+# 언어별 KaldiRecognizer 풀 크기. 시작 시 MIN 개를 만들고, 동시 요청이 몰리면 MAX 개까지 늘립니다.
+# ARIEL_STT_POOL_SIZES="ko:8,en:4" 처럼 언어별 최대 크기를 따로 지정할 수 있습니다.
+POOL_MIN_SIZE = config.get_int("ARIEL_STT_POOL_MIN_SIZE", 1)
+POOL_MAX_SIZE = config.get_int("ARIEL_STT_POOL_MAX_SIZE", os.cpu_count() or 1)
+POOL_SIZE_OVERRIDES = config.get_int_mapping("ARIEL_STT_POOL_SIZES")
+# 풀이 가득 찼을 때 recognizer 반납을 기다리는 최대 시간(초)
+POOL_ACQUIRE_TIMEOUT_S = config.get_float("ARIEL_STT_POOL_TIMEOUT_S", 10.0)
+
+# 로드된 모델 전체가 차지할 수 있는 메모리 예산(MB, 모델 폴더 크기 기준). 0 이면 제한하지 않습니다.
+MEMORY_BUDGET_MB = config.get_int("ARIEL_STT_MEMORY_BUDGET_MB", 0)
+# 시작 시 미리 로드하고 예산 초과 시에도 내리지 않을 언어 (예: "ko,en,ja" 또는 엔진 지정 "vosk-small:ko")
+PINNED_LANGUAGES = config.get_list("ARIEL_STT_PINNED_LANGUAGES")
+
+# 모델마다 유지할 문법 전용 recognizer 풀 수. 넘으면 쓰이지 않는 풀부터 LRU 순서로 버립니다.
+GRAMMAR_POOLS_PER_MODEL = config.get_int("ARIEL_STT_GRAMMAR_POOLS_PER_MODEL", 16)
+# 녹음 시각만 알려 준 요청은 녹음 후 이 시간(초)이 지나면 디코딩하지 않고 버립니다. (0 이면 사용하지 않음)
+MAX_AUDIO_AGE_S = config.get_float("ARIEL_STT_MAX_AUDIO_AGE_S", 10.0)
+
+# 긴 오디오를 recognizer에 나누어 넣는 조각 크기 (0.5초, 16-bit mono). 조각마다 발화 끝(endpoint)을 확인합니다.
+DECODE_SLICE_BYTES = SAMPLE_RATE
+
+def _pool_max_size(lang_code: str) -> int:
+    return POOL_SIZE_OVERRIDES.get(lang_code, POOL_MAX_SIZE)
+
+def _reset_recognizer(recognizer):
+    # 다음 인식을 위해 recognizer 상태 초기화
+    recognizer.Reset()
+
+class ModelCapacityError(RuntimeError):
+    """메모리 예산 안에서 모델을 올릴 공간을 확보하지 못했을 때 발생합니다."""
+
+def _model_key(engine: STTEngine, language: str) -> str:
+    return f"{engine.name}:{language}"
+
+def _result_key(engine: STTEngine, language: str, grammar: Optional[Grammar]) -> str:
+    # 결과 캐시 키. 같은 오디오라도 모델이나 문법이 다르면 결과가 다르므로 함께 구분합니다.
+    return _model_key(engine, language) + (f"#{grammar.grammar_id}" if grammar else "")
+
+class LoadedModel:
+    """메모리에 올라온 STT 모델과 그 recognizer 풀, 그리고 LRU 관리용 메타데이터."""
+    def __init__(self, engine: STTEngine, lang_code: str, model, pool: ResourcePool, size_bytes: int):
+        self.engine = engine
+        self.lang_code = lang_code
+        self.key = _model_key(engine, lang_code)
+        self.model = model
+        self.pool = pool
+        self.size_bytes = size_bytes
+        self.pinned = False
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        # grammar_id → 그 문법으로 만든 recognizer 풀 (LRU 순서)
+        self.grammar_pools = OrderedDict()
+
+    @property
+    def in_use(self) -> int:
+        return self.pool.in_use + sum(pool.in_use for pool in list(self.grammar_pools.values()))
+
+def _directory_size(path: str) -> int:
+    """모델 폴더의 디스크 크기를 메모리 사용량의 근사치로 사용합니다."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, file_name))
+            except OSError:
+                pass
+    return total
+
+class STTSession:
+    """
+    하나의 recognizer를 세션 수명 동안 대여하여 연속된 PCM 프레임을 이어서 디코딩합니다.
+    청크마다 Reset() 하지 않으므로 디코더 문맥이 유지되고, Vosk의 endpointer가 발화 끝을 감지하면 확정 결과를 냅니다.
+    track_confidence=True 이면 확정 결과의 단어 신뢰도를 모아 언어 자동 감지 점수(score)로 제공합니다.
+    """
+    def __init__(self, language: str, pool: ResourcePool, track_confidence: bool = False):
+        self.language = language
+        self._pool = pool
+        self._recognizer = pool.acquire(timeout=POOL_ACQUIRE_TIMEOUT_S)
+        self._pending = b""
+        self._last_partial = ""
+        self._closed = False
+        self._confidences = []
+        self._tracking = track_confidence and hasattr(self._recognizer, "SetWords")
+        if self._tracking:
+            self._recognizer.SetWords(True)
+
+    @property
+    def score(self) -> float:
+        return confidence_score(self._confidences)
+
+    def stop_tracking(self):
+        """단어 신뢰도 수집을 멈춥니다. (언어가 결정된 뒤에는 단어별 결과가 필요 없음)"""
+        if self._tracking:
+            self._recognizer.SetWords(False)
+            self._tracking = False
+
+    def _final_text(self, raw: str) -> str:
+        result = json.loads(raw)
+        if self._tracking:
+            self._confidences.extend(word.get('conf', 0.0) for word in result.get('result', []))
+        return result.get('text', '')
+
+    def accept(self, pcm: bytes) -> Optional[dict]:
+        """
+        PCM 프레임을 디코더에 넣습니다.
+        발화가 끝났으면 {"type": "final"}, 중간 결과가 바뀌었으면 {"type": "partial"} 결과를, 변화가 없으면 None 을 반환합니다.
+        """
+        data = self._pending + pcm
+        # 16-bit 샘플이 프레임 경계에서 잘린 경우, 남는 1바이트는 다음 프레임과 합칩니다.
+        if len(data) % 2:
+            self._pending, data = data[-1:], data[:-1]
+        else:
+            self._pending = b""
+        if not data:
+            return None
+
+        if self._recognizer.AcceptWaveform(data):
+            self._last_partial = ""
+            return {"type": "final", "text": self._final_text(self._recognizer.Result())}
+
+        partial = json.loads(self._recognizer.PartialResult()).get('partial', '')
+        if partial != self._last_partial:
+            self._last_partial = partial
+            return {"type": "partial", "text": partial}
+        return None
+
+    def finish(self) -> dict:
+        """남아 있는 오디오를 모두 디코딩하여 확정 결과를 반환합니다. 이후에도 세션은 계속 사용할 수 있습니다."""
+        self._last_partial = ""
+        return {"type": "final", "text": self._final_text(self._recognizer.FinalResult())}
+
+    def close(self):
+        """recognizer를 풀에 반납합니다. (반납 시 리셋됨)"""
+        if not self._closed:
+            self._closed = True
+            self.stop_tracking()
+            self._pool.release(self._recognizer)
+
+def accept_slices(session, pcm: bytes) -> List[str]:
+    """
+    PCM 을 DECODE_SLICE_BYTES 조각으로 나누어 세션에 넣고, 그 사이 확정된 발화의 텍스트 목록을 반환합니다.
+    조각마다 발화 끝을 확인하므로 긴 버퍼 안의 여러 발화가 하나로 합쳐지지 않습니다.
+    """
+    texts = []
+    for offset in range(0, len(pcm), DECODE_SLICE_BYTES):
+        check_cancelled()
+        result = session.accept(pcm[offset:offset + DECODE_SLICE_BYTES])
+        if result is not None and result["type"] == "final" and result["text"]:
+            texts.append(result["text"])
+    return texts
 
 class STTManager:
     """
-    Vosk STT 엔진을 총괄 관리하는 서비스.
-    애플리케이션 시작 시, 지원하는 모든 언어의 Vosk 모델을 로드하고
-    KaldiRecognizer를 미리 생성하여 요청에 신속하게 응답합니다.
+    STT 엔진 레지스트리(stt_engines)에 등록된 모델을 총괄 관리하는 서비스.
+    모델은 (엔진, 언어) 조합이 처음 요청될 때 로드하며(lazy loading), 메모리 예산(MEMORY_BUDGET_MB)을 넘으면
+    가장 오래 사용되지 않은 모델부터 내립니다(LRU). 고정(pin)된 모델은 시작 시 미리 로드되고 내려가지 않습니다.
+    동시에 들어온 같은 언어의 요청은 풀에서 각자 recognizer를 대여하므로 디코더 상태를 공유하지 않습니다.
     """
     def __init__(self):
-        self.models = {}
-        self.recognizers = {}
         self.supported_languages = []
+        self._loaded = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks = {}
+        self._reserved_bytes = 0
+        self._evictions = 0
 
-        logger.info("Initializing STT Manager with Vosk models...")
+        logger.info("Initializing STT Manager (models are loaded on first use)...")
 
-        for lang_code, model_name in MODEL_PATHS.items():
-            model_path = os.path.join(MODEL_BASE_DIR, model_name)
-            if not os.path.exists(model_path):
-                logger.warning(f"Model path not found for language '{lang_code}': {model_path}. Skipping.")
-                continue
+        for engine in list_engines():
+            for lang_code in engine.languages:
+                if lang_code not in self.supported_languages:
+                    self.supported_languages.append(lang_code)
 
+        for target in PINNED_LANGUAGES:
+            engine_name, _, lang_code = target.rpartition(":")
             try:
-                logger.info(f"Loading Vosk model for '{lang_code}' from {model_path}...")
-                model = Model(model_path)
-                self.models[lang_code] = model
-                
-                # 오디오 샘플링 레이트는 16000Hz로 고정
-                recognizer = KaldiRecognizer(model, 16000)
-                self.recognizers[lang_code] = recognizer
-                self.supported_languages.append(lang_code)
-                
-                logger.info(f"Successfully loaded model and created recognizer for '{lang_code}'.")
-
+                self.pin(lang_code, engine_name or None)
             except Exception as e:
-                logger.error(f"Failed to load model for language '{lang_code}': {e}", exc_info=True)
-        
-        logger.info(f"STT Manager initialized. Supported languages: {self.supported_languages}")
+                logger.error(f"Failed to preload pinned model '{target}': {e}", exc_info=True)
+
+        logger.info(f"STT Manager initialized. Supported languages: {self.supported_languages}, "
+                    f"loaded: {list(self._loaded)}, budget: {MEMORY_BUDGET_MB or 'unlimited'} MB")
+
+    # --- 모델 로드/언로드 ---
+    def _resolve(self, language: str, engine_name: Optional[str] = None, model_size: Optional[str] = None) -> STTEngine:
+        """엔진 이름이 주어지면 그 엔진을, 아니면 모델 크기에 맞는 엔진을 고릅니다."""
+        if engine_name:
+            engine = get_engine(engine_name)
+            if language not in engine.model_paths:
+                raise ValueError(f"Engine '{engine_name}' has no model for language: {language}")
+            return engine
+        try:
+            return resolve_engine(language, model_size)
+        except ValueError:
+            logger.error(f"Unsupported language request: {language}. Available: {self.supported_languages}")
+            raise
+
+    def _get_loaded(self, engine: STTEngine, language: str) -> LoadedModel:
+        """(엔진, 언어)의 모델을 반환합니다. 아직 로드되지 않았다면 이 시점에 로드합니다."""
+        key = _model_key(engine, language)
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None:
+                self._loaded.move_to_end(key)
+                entry.last_used = time.time()
+                return entry
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # 모델 로딩은 오래 걸리므로 모델별 락만 잡고 진행하여, 다른 모델의 요청은 막지 않습니다.
+        with load_lock:
+            with self._lock:
+                entry = self._loaded.get(key)
+                if entry is not None:
+                    return entry
+            return self._load(engine, language)
+
+    def _load(self, engine: STTEngine, language: str) -> LoadedModel:
+        key = _model_key(engine, language)
+        model_path = engine.model_paths[language]
+        size_bytes = _directory_size(model_path)
+        self._make_room(size_bytes, exclude=key)
+
+        try:
+            logger.info(f"Loading STT model '{key}' from {model_path} ({size_bytes / 2**20:.0f} MB)...")
+            model = engine.load_model(model_path)
+            pool = ResourcePool(
+                name=key,
+                factory=lambda model=model: engine.create_recognizer(model),
+                min_size=engine.pool_min_size(POOL_MIN_SIZE),
+                max_size=engine.pool_max_size(_pool_max_size(language)),
+                reset=_reset_recognizer,
+            )
+            entry = LoadedModel(engine, language, model, pool, size_bytes)
+            with self._lock:
+                self._loaded[key] = entry
+        finally:
+            with self._lock:
+                self._reserved_bytes -= size_bytes
+        logger.info(f"Successfully loaded model and created recognizer pool for '{key}' (max {pool.max_size}).")
+        return entry
+
+    def _loaded_bytes(self) -> int:
+        """로드된 모델과 로딩 중인 모델(예약분)이 차지하는 메모리 추정치."""
+        with self._lock:
+            return sum(entry.size_bytes for entry in self._loaded.values()) + self._reserved_bytes
+
+    def _make_room(self, size_bytes: int, exclude: str = None):
+        """
+        새 모델을 올릴 수 있도록, 예산을 넘는 만큼 고정되지 않고 사용 중이 아닌 모델을 LRU 순서로 내립니다.
+        공간을 확보하면 size_bytes 만큼을 예약하여, 동시에 로딩되는 다른 모델이 예산을 함께 초과하지 않게 합니다.
+        """
+        budget_bytes = MEMORY_BUDGET_MB * 2**20
+        with self._lock:
+            if MEMORY_BUDGET_MB <= 0:
+                self._reserved_bytes += size_bytes
+                return
+            for key in list(self._loaded):
+                if self._loaded_bytes() + size_bytes <= budget_bytes:
+                    break
+                entry = self._loaded[key]
+                if key == exclude or entry.pinned or entry.in_use > 0:
+                    continue
+                del self._loaded[key]
+                self._evictions += 1
+                logger.info(f"Evicted STT model '{key}' to stay within the memory budget.")
+
+            if self._loaded_bytes() + size_bytes > budget_bytes:
+                raise ModelCapacityError(
+                    f"Not enough STT memory budget to load a {size_bytes / 2**20:.0f} MB model "
+                    f"(budget {MEMORY_BUDGET_MB} MB, in use {self._loaded_bytes() / 2**20:.0f} MB)."
+                )
+            self._reserved_bytes += size_bytes
+
+    def _pool_for(self, entry: LoadedModel, grammar: Optional[Grammar]) -> ResourcePool:
+        """문법이 없으면 모델의 기본 풀을, 있으면 그 문법으로 만든 recognizer 풀을 반환합니다. (없으면 만듦)"""
+        if grammar is None:
+            return entry.pool
+        if grammar.language != entry.lang_code:
+            raise ValueError(f"Grammar '{grammar.grammar_id}' is for '{grammar.language}', not '{entry.lang_code}'.")
+        if not entry.engine.supports_grammar:
+            raise ValueError(f"STT engine '{entry.engine.name}' does not support grammars.")
+
+        with self._lock:
+            pool = entry.grammar_pools.get(grammar.grammar_id)
+            if pool is not None:
+                entry.grammar_pools.move_to_end(grammar.grammar_id)
+                return pool
+
+        # 문법 그래프 컴파일은 수십 ms 가 걸릴 수 있으므로 전역 락 밖에서 풀을 만듭니다.
+        pool = ResourcePool(
+            name=f"{entry.key}#{grammar.grammar_id}",
+            factory=lambda: entry.engine.create_recognizer(entry.model, grammar.json),
+            min_size=1,
+            max_size=entry.pool.max_size,
+            reset=_reset_recognizer,
+        )
+        with self._lock:
+            pool = entry.grammar_pools.setdefault(grammar.grammar_id, pool)
+            for grammar_id in list(entry.grammar_pools):
+                if len(entry.grammar_pools) <= GRAMMAR_POOLS_PER_MODEL:
+                    break
+                if grammar_id != grammar.grammar_id and entry.grammar_pools[grammar_id].in_use == 0:
+                    del entry.grammar_pools[grammar_id]
+        logger.info(f"Created grammar recognizer pool '{pool.name}' ({len(grammar.phrases)} phrases).")
+        return pool
+
+    def register_grammar(self, language: str, phrases: List[str]) -> dict:
+        """구문 목록 문법을 등록하고 grammar_id 를 반환합니다. 같은 구문 집합은 같은 grammar_id 와 recognizer 풀을 공유합니다."""
+        if language not in self.supported_languages:
+            raise ValueError(f"Unsupported or unloaded language: {language}")
+        return grammar_registry.register(language, phrases).info()
+
+    def _with_grammar(self, language: str, grammar_id: Optional[str]) -> Tuple[str, Optional[Grammar]]:
+        """grammar_id 를 문법으로 바꿉니다. 언어가 'auto' 이면 문법의 언어를 사용합니다."""
+        if not grammar_id:
+            return language, None
+        grammar = grammar_registry.get(grammar_id)
+        return (grammar.language if language == AUTO_LANGUAGE else language), grammar
 
-    def process_stt_request(self, audio_data: bytes, language: str) -> str:
+    def load(self, language: str, engine_name: Optional[str] = None) -> dict:
+        """언어 모델을 미리 로드합니다. (관리자용)"""
+        engine = self._resolve(language, engine_name)
+        self._get_loaded(engine, language)
+        return self.get_model_info(engine, language)
+
+    def unload(self, language: str, engine_name: Optional[str] = None) -> dict:
+        """언어 모델을 메모리에서 내립니다. 사용 중인 recognizer가 있으면 ValueError 를 발생시킵니다. (관리자용)"""
+        engine = self._resolve(language, engine_name)
+        key = _model_key(engine, language)
+        with self._lock:
+            entry = self._loaded.get(key)
+            if entry is not None:
+                if entry.in_use > 0:
+                    raise ValueError(f"Model '{key}' is in use and cannot be unloaded.")
+                del self._loaded[key]
+                logger.info(f"Unloaded STT model '{key}'.")
+        return self.get_model_info(engine, language)
+
+    def pin(self, language: str, engine_name: Optional[str] = None) -> dict:
+        """언어 모델을 로드하고 LRU 퇴출 대상에서 제외합니다."""
+        engine = self._resolve(language, engine_name)
+        entry = self._get_loaded(engine, language)
+        entry.pinned = True
+        return self.get_model_info(engine, language)
+
+    def unpin(self, language: str, engine_name: Optional[str] = None) -> dict:
+        """언어 모델의 고정을 해제하여 다시 LRU 퇴출 대상이 되게 합니다."""
+        engine = self._resolve(language, engine_name)
+        with self._lock:
+            entry = self._loaded.get(_model_key(engine, language))
+            if entry is not None:
+                entry.pinned = False
+        return self.get_model_info(engine, language)
+
+    def get_model_info(self, engine: STTEngine, language: str) -> dict:
+        with self._lock:
+            entry = self._loaded.get(_model_key(engine, language))
+            info = {
+                "engine": engine.name,
+                "language": language,
+                "model": engine.model_names.get(language),
+                "available": language in engine.model_paths,
+                "loaded": entry is not None,
+                "pinned": bool(entry and entry.pinned),
+            }
+            if entry is not None:
+                info.update({
+                    "size_mb": round(entry.size_bytes / 2**20, 1),
+                    "loaded_at": entry.loaded_at,
+                    "last_used": entry.last_used,
+                    "pool": entry.pool.stats(),
+                    "grammar_pools": len(entry.grammar_pools),
+                })
+            return info
+
+    def list_models(self) -> dict:
+        """모든 엔진의 언어 모델 로드 상태와 메모리 예산 사용량을 반환합니다."""
+        return {
+            "budget_mb": MEMORY_BUDGET_MB,
+            "loaded_mb": round(self._loaded_bytes() / 2**20, 1),
+            "evictions": self._evictions,
+            "models": [
+                self.get_model_info(engine, lang_code)
+                for engine in list_engines() for lang_code in engine.model_names
+            ],
+        }
+
+    def process_stt_request(self, audio_data: bytes, language: str, silence_threshold_db: Optional[float] = None,
+                            model_size: Optional[str] = None, session_id: Optional[str] = None,
+                            grammar_id: Optional[str] = None) -> str:
         """
         bytes 형태의 오디오 데이터를 받아 지정된 언어의 STT를 수행하고 텍스트를 반환합니다.
         오디오는 16kHz, 16-bit, Mono PCM 형식이어야 합니다.
+        풀이 가득 차 POOL_ACQUIRE_TIMEOUT_S 안에 recognizer를 대여하지 못하면 PoolTimeoutError 가 발생합니다.
+        처음 요청된 언어라면 모델을 로드하며, 메모리 예산이 부족하면 ModelCapacityError 가 발생합니다.
+        무음 게이트에 걸린 청크는 디코딩하지 않고 빈 문자열을 반환합니다.
+        같은 모델로 거의 같은 오디오를 이미 디코딩했다면 (스펙트럼 지문 캐시) 디코딩 없이 그 결과를 반환합니다.
+        model_size 는 'tiny'~'large' 또는 엔진 이름이며, 지연 시간과 정확도 중 무엇을 우선할지 정합니다.
+        language 가 'auto' 이면 후보 언어를 병렬로 디코딩해 언어를 감지하고, 결정된 언어는 session_id 별로 캐시합니다.
+        grammar_id 를 주면 등록된 구문만 인식하는 recognizer로 디코딩합니다. (명령어 등 어휘가 정해진 경우 더 빠르고 정확함)
         """
-        if language not in self.recognizers:
-            logger.error(f"Unsupported language request: {language}. Available: {self.supported_languages}")
-            raise ValueError(f"Unsupported or unloaded language: {language}")
+        language, grammar = self._with_grammar(language, grammar_id)
+        if language == AUTO_LANGUAGE:
+            return self._process_auto_request(audio_data, silence_threshold_db, model_size, session_id)
 
-        recognizer = self.recognizers[language]
+        engine = self._resolve(language, model_size=model_size)
+        if not silence_gate.is_speech(audio_data, language, silence_threshold_db):
+            logger.debug(f"Skipped silent chunk for '{language}' ({len(audio_data)} bytes).")
+            return ""
 
-        try:
-            if recognizer.AcceptWaveform(audio_data):
-                result = json.loads(recognizer.Result())
-                text = result.get('text', '')
-            else:
-                result = json.loads(recognizer.PartialResult())
-                text = result.get('partial', '')
+        model_key = _result_key(engine, language, grammar)
+        fp = fingerprint(audio_data) if result_cache.enabled else None
+        cached = result_cache.get(model_key, fp)
+        if cached is not None:
+            logger.debug(f"Result cache hit for '{model_key}': {cached}")
+            return cached
 
-            # 다음 인식을 위해 recognizer 상태 초기화
-            recognizer.Reset()
+        entry = self._get_loaded(engine, language)
+        pool = self._pool_for(entry, grammar)
 
-            logger.info(f"Transcription result for '{language}': {text}")
-            return text
+        # 반납 시 풀이 recognizer를 리셋하므로, 오류가 나도 다음 요청에 영향이 없습니다.
+        with pool.checkout(timeout=POOL_ACQUIRE_TIMEOUT_S) as recognizer:
+            try:
+                started = time.perf_counter()
+                if recognizer.AcceptWaveform(audio_data):
+                    result = json.loads(recognizer.Result())
+                    text = result.get('text', '')
+                else:
+                    result = json.loads(recognizer.PartialResult())
+                    text = result.get('partial', '')
+                elapsed = time.perf_counter() - started
+                silence_gate.record_decode(len(audio_data), elapsed)
+                engine.latency.record(elapsed)
+                result_cache.put(model_key, fp, text, elapsed)
+
+                logger.info(f"Transcription result for '{pool.name}': {text}")
+                return text
 
+            except Exception as e:
+                logger.error(f"Error during audio processing for language '{language}': {e}", exc_info=True)
+                return ""
+
+    def _process_auto_request(self, audio_data: bytes, silence_threshold_db: Optional[float],
+                              model_size: Optional[str], session_id: Optional[str]) -> str:
+        """언어 자동 감지 요청. 이 세션에서 이미 결정된 언어가 있으면 감지 없이 그 언어로 바로 디코딩합니다."""
+        cached = decision_cache.get(session_id)
+        if cached is not None:
+            return self.process_stt_request(audio_data, cached, silence_threshold_db, model_size)
+        if not silence_gate.is_speech(audio_data, AUTO_LANGUAGE, silence_threshold_db):
+            return ""
+
+        session = self.open_session(AUTO_LANGUAGE, model_size=model_size, session_id=session_id)
+        try:
+            texts = accept_slices(session, audio_data)
+            texts.append(session.finish()["text"])
+        except WorkCancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error during audio processing for language '{language}': {e}", exc_info=True)
-            # 문제가 발생해도 recognizer를 리셋하여 다음 요청에 영향이 없도록 함
-            recognizer.Reset()
+            logger.error(f"Error during automatic language detection: {e}", exc_info=True)
             return ""
+        finally:
+            session.close()
+
+        text = " ".join(t for t in texts if t)
+        logger.info(f"Transcription result for 'auto' ({session.language}): {text}")
+        return text
+
+    def process_stt_batch(self, segments: List[Tuple[int, bytes]], language: str,
+                          on_result: Callable[[int, str], None], silence_threshold_db: Optional[float] = None,
+                          model_size: Optional[str] = None, session_id: Optional[str] = None,
+                          grammar_id: Optional[str] = None):
+        """
+        같은 언어의 여러 오디오 세그먼트를 recognizer 하나로 차례대로 디코딩합니다.
+        세그먼트마다 완결된 발화로 보고 FinalResult()까지 받으며, 결과는 끝나는 즉시 on_result(index, text) 로 전달합니다.
+        recognizer 대여와 로그는 세그먼트가 아니라 배치 단위로 한 번만 수행합니다.
+        language 가 'auto' 이면 세그먼트마다 언어를 감지합니다. (같은 session_id 라면 첫 결정이 캐시되어 재사용됨)
+        """
+        language, grammar = self._with_grammar(language, grammar_id)
+        if language == AUTO_LANGUAGE:
+            for index, audio_data in segments:
+                check_cancelled()
+                on_result(index, self.process_stt_request(audio_data, language, silence_threshold_db,
+                                                          model_size, session_id))
+            return
+
+        engine = self._resolve(language, model_size=model_size)
+        entry = self._get_loaded(engine, language)
+        pool = self._pool_for(entry, grammar)
+        # 세그먼트를 FinalResult() 까지 확정하므로 단건 요청(중간 결과 포함)과 다른 캐시 키를 사용합니다.
+        cache_key = f"{pool.name}:final"
+        started = time.monotonic()
+
+        with pool.checkout(timeout=POOL_ACQUIRE_TIMEOUT_S) as recognizer:
+            for index, audio_data in segments:
+                # 배치를 기다리던 클라이언트가 떠났으면 남은 세그먼트를 디코딩하지 않습니다.
+                check_cancelled()
+                if not silence_gate.is_speech(audio_data, language, silence_threshold_db):
+                    on_result(index, "")
+                    continue
+                fp = fingerprint(audio_data) if result_cache.enabled else None
+                cached = result_cache.get(cache_key, fp)
+                if cached is not None:
+                    on_result(index, cached)
+                    continue
+                decode_started = time.perf_counter()
+                try:
+                    texts = []
+                    if recognizer.AcceptWaveform(audio_data):
+                        texts.append(json.loads(recognizer.Result()).get('text', ''))
+                    texts.append(json.loads(recognizer.FinalResult()).get('text', ''))
+                    text = " ".join(t for t in texts if t)
+                    elapsed = time.perf_counter() - decode_started
+                    silence_gate.record_decode(len(audio_data), elapsed)
+                    engine.latency.record(elapsed)
+                    result_cache.put(cache_key, fp, text, elapsed)
+                except Exception as e:
+                    logger.error(f"Error during batch segment {index} for language '{language}': {e}", exc_info=True)
+                    text = ""
+                finally:
+                    recognizer.Reset()
+                on_result(index, text)
+
+        logger.info(f"Batch transcription for '{pool.name}': {len(segments)} segments "
+                    f"in {(time.monotonic() - started) * 1000:.0f} ms")
+
+    def detect_language(self, audio_data: bytes, model_size: Optional[str] = None,
+                        session_id: Optional[str] = None) -> str:
+        """오디오 앞부분으로 언어를 감지합니다. session_id 에 캐시된 언어가 있으면 디코딩 없이 그 언어를 반환합니다."""
+        session = self.open_session(AUTO_LANGUAGE, model_size=model_size, session_id=session_id)
+        try:
+            for offset in range(0, len(audio_data), DECODE_SLICE_BYTES):
+                if session.language is not None:
+                    break
+                check_cancelled()
+                session.accept(audio_data[offset:offset + DECODE_SLICE_BYTES])
+            if session.language is None:
+                session.finish()
+            return session.language
+        finally:
+            session.close()
+
+    def transcribe_chunk(self, audio_data: bytes, language: str, offset_s: float = 0.0,
+                         silence_threshold_db: Optional[float] = None,
+                         model_size: Optional[str] = None) -> List[dict]:
+        """
+        긴 오디오의 한 조각을 디코딩하여 발화별 {"start", "end", "text"} 목록을 반환합니다. (시각은 offset_s 기준 초)
+        조각을 0.5초씩 나누어 넣어 발화 끝마다 결과를 받고, 단어 시각을 지원하는 엔진이면 단어 시각으로 구간을 정합니다.
+        """
+        engine = self._resolve(language, model_size=model_size)
+        if not silence_gate.is_speech(audio_data, language, silence_threshold_db):
+            return []
+        entry = self._get_loaded(engine, language)
+
+        utterances = []
+        with entry.pool.checkout(timeout=POOL_ACQUIRE_TIMEOUT_S) as recognizer:
+            with_words = hasattr(recognizer, "SetWords")
+            if with_words:
+                recognizer.SetWords(True)
+            started = time.perf_counter()
+            utterance_start = 0.0
+
+            def add(raw: str, fed_s: float):
+                nonlocal utterance_start
+                result = json.loads(raw)
+                words = result.get('result') or []
+                start = words[0].get('start', utterance_start) if words else utterance_start
+                end = words[-1].get('end', fed_s) if words else fed_s
+                if result.get('text'):
+                    utterances.append({"start": round(offset_s + start, 3), "end": round(offset_s + end, 3),
+                                       "text": result['text']})
+                utterance_start = fed_s
+
+            try:
+                for offset in range(0, len(audio_data), DECODE_SLICE_BYTES):
+                    check_cancelled()
+                    piece = audio_data[offset:offset + DECODE_SLICE_BYTES]
+                    if recognizer.AcceptWaveform(piece):
+                        add(recognizer.Result(), (offset + len(piece)) / 2 / SAMPLE_RATE)
+                add(recognizer.FinalResult(), len(audio_data) / 2 / SAMPLE_RATE)
+            finally:
+                if with_words:
+                    recognizer.SetWords(False)
+            elapsed = time.perf_counter() - started
+            silence_gate.record_decode(len(audio_data), elapsed)
+        return utterances
+
+    def process_raw_request(self, audio_data: bytes, language: str, model_size: Optional[str] = None,
+                            session_id: Optional[str] = None, grammar_id: Optional[str] = None,
+                            silence_threshold_db: Optional[float] = None) -> dict:
+        """
+        /stt/raw 로 받은 짧은 본문 전체를 세션 하나로 디코딩해 {"text", "language"} 를 반환합니다.
+        무음 게이트에 걸린 오디오는 recognizer를 대여하거나 모델을 로드하지 않고 빈 텍스트를 반환합니다.
+        언어가 정해져 있으면 process_stt_request 와 같은 키로 결과 캐시를 확인하고 채웁니다.
+        """
+        language, grammar = self._with_grammar(language, grammar_id)
+        if language == AUTO_LANGUAGE:
+            language = decision_cache.get(session_id) or AUTO_LANGUAGE
+        if not silence_gate.is_speech(audio_data, language, silence_threshold_db):
+            logger.debug(f"Skipped silent raw body for '{language}' ({len(audio_data)} bytes).")
+            return {"text": "", "language": language}
+
+        engine = model_key = fp = None
+        if language != AUTO_LANGUAGE:
+            engine = self._resolve(language, model_size=model_size)
+            model_key = _result_key(engine, language, grammar)
+            fp = fingerprint(audio_data) if result_cache.enabled else None
+            cached = result_cache.get(model_key, fp)
+            if cached is not None:
+                logger.debug(f"Result cache hit for '{model_key}': {cached}")
+                return {"text": cached, "language": language}
+
+        session = self.open_session(language, model_size, session_id, grammar_id)
+        try:
+            started = time.perf_counter()
+            texts = accept_slices(session, audio_data)
+            texts.append(session.finish()["text"])
+            elapsed = time.perf_counter() - started
+        finally:
+            session.close()
+        text = " ".join(t for t in texts if t)
+        silence_gate.record_decode(len(audio_data), elapsed)
+        if engine is not None:
+            engine.latency.record(elapsed)
+            result_cache.put(model_key, fp, text, elapsed)
+        return {"text": text, "language": session.language}
+
+    def open_session(self, language: str, model_size: Optional[str] = None, session_id: Optional[str] = None,
+                     grammar_id: Optional[str] = None):
+        """
+        스트리밍용 세션을 엽니다. 세션을 다 쓰면 반드시 close() 를 호출해야 recognizer가 풀로 돌아갑니다.
+        language 가 'auto' 이면 session_id 에 캐시된 언어의 세션을, 없으면 후보 언어를 병렬로 디코딩하는 AutoSTTSession 을 반환합니다.
+        grammar_id 를 주면 세션 전체를 그 문법의 recognizer로 디코딩합니다.
+        """
+        language, grammar = self._with_grammar(language, grammar_id)
+        if language == AUTO_LANGUAGE:
+            cached = decision_cache.get(session_id)
+            if cached is None:
+                return self._open_auto_session(model_size, session_id)
+            language = cached
+
+        engine = self._resolve(language, model_size=model_size)
+        entry = self._get_loaded(engine, language)
+        return STTSession(language, self._pool_for(entry, grammar))
+
+    def _open_auto_session(self, model_size: Optional[str], session_id: Optional[str]) -> AutoSTTSession:
+        sessions = {}
+        try:
+            for lang_code in AUTO_CANDIDATES:
+                if lang_code not in self.supported_languages:
+                    continue
+                engine = self._resolve(lang_code, model_size=model_size)
+                entry = self._get_loaded(engine, lang_code)
+                sessions[lang_code] = STTSession(lang_code, entry.pool, track_confidence=True)
+        except Exception:
+            for session in sessions.values():
+                session.close()
+            raise
+        if not sessions:
+            raise ValueError(f"No supported candidate languages for automatic detection: {AUTO_CANDIDATES}")
+
+        def remember(lang_code: str, score: float):
+            if score >= CACHE_MIN_SCORE:
+                decision_cache.put(session_id, lang_code)
+
+        return AutoSTTSession(sessions, on_decided=remember)
+
+    def get_pool_stats(self) -> dict:
+        """로드된 모델별 recognizer 풀의 크기, 사용 중인 개수, 대기 횟수 및 대기 시간을 반환합니다."""
+        with self._lock:
+            entries = list(self._loaded.values())
+        stats = {}
+        for entry in entries:
+            stats[entry.key] = entry.pool.stats()
+            for pool in list(entry.grammar_pools.values()):
+                stats[pool.name] = pool.stats()
+        return stats
+
+    def get_engine_stats(self) -> dict:
+        """엔진(지연 시간/정확도 등급)별 사용 가능한 언어와 디코딩 지연 시간 분포를 반환합니다."""
+        return {engine.name: engine.stats() for engine in list_engines()}
 
 # 애플리케이션 전역에서 사용할 싱글턴 인스턴스 생성
 stt_manager = STTManager()
\ No newline at end of file
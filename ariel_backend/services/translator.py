@@ -0,0 +1,181 @@
+# ariel_backend/services/translator.py
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from ariel_backend.services import config
+from ariel_backend.services.stt_engines import LatencyStats
+
+try:
+    import deepl
+except ImportError:
+    deepl = None
+
+logger = logging.getLogger("root")
+
+# 요청에서 번역기를 지정하지 않았을 때 쓰는 번역기 이름
+DEFAULT_TRANSLATOR = os.getenv("ARIEL_TRANSLATOR", "deepl")
+# 서버에 설정한 DeepL API 키. 요청의 X-Ariel-DeepL-Key 헤더가 있으면 그 키를 씁니다.
+DEEPL_API_KEY = os.getenv("ARIEL_DEEPL_API_KEY")
+# 캐시할 (번역기, 원문 언어, 대상 언어, 글줄) → 번역 항목 수. 바뀌지 않은 글줄은 다시 번역하지 않습니다.
+CACHE_SIZE = config.get_int("ARIEL_TRANSLATION_CACHE_SIZE", 4096)
+# 키마다 만들어 둘 DeepL 클라이언트 수 (HTTP 연결을 재사용하기 위해)
+MAX_DEEPL_CLIENTS = 64
+
+# 번역 API 호출(네트워크 대기)을 OCR 워커 밖에서 실행하는 전용 스레드 풀
+_translate_pool = ThreadPoolExecutor(
+    max_workers=config.get_int("ARIEL_TRANSLATION_WORKERS", 4),
+    thread_name_prefix="translate",
+)
+
+class TranslatorUnavailableError(RuntimeError):
+    """번역기를 쓸 수 없을 때(패키지 미설치, API 키 없음) 발생합니다. (503 으로 응답)"""
+
+class TranslationError(RuntimeError):
+    """번역 API 가 실패했을 때 발생합니다. (502 로 응답)"""
+
+class Translator:
+    """
+    번역기의 공통 인터페이스.
+    새 번역기는 이 클래스를 상속해 translate() 를 구현하고 register_translator() 로 등록합니다.
+    """
+    def __init__(self, name: str):
+        self.name = name
+
+    def translate(self, texts: List[str], source_lang: Optional[str], target_lang: str,
+                  api_key: Optional[str] = None) -> List[str]:
+        """글줄 목록을 한 번의 호출로 번역해 같은 순서로 반환합니다. source_lang 이 None 이면 자동 감지."""
+        raise NotImplementedError
+
+class DeepLTranslator(Translator):
+    def __init__(self, name: str = "deepl"):
+        super().__init__(name)
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _client(self, api_key: Optional[str]):
+        if deepl is None:
+            raise TranslatorUnavailableError("The 'deepl' package is not installed on the backend.")
+        api_key = api_key or DEEPL_API_KEY
+        if not api_key:
+            raise TranslatorUnavailableError("No DeepL API key. Set ARIEL_DEEPL_API_KEY or send X-Ariel-DeepL-Key.")
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                client = self._clients[api_key] = deepl.Translator(api_key)
+                while len(self._clients) > MAX_DEEPL_CLIENTS:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(api_key)
+            return client
+
+    def translate(self, texts: List[str], source_lang: Optional[str], target_lang: str,
+                  api_key: Optional[str] = None) -> List[str]:
+        client = self._client(api_key)
+        # DeepL 은 대상 언어 'EN' 을 받지 않으므로 'EN-US' 로 바꿉니다. (클라이언트 MTEngine 과 같은 규칙)
+        if target_lang.upper() == "EN":
+            target_lang = "EN-US"
+        # 원문 언어에는 지역 코드를 쓰지 않습니다. ('PT-BR' -> 'PT')
+        if source_lang:
+            source_lang = source_lang.split("-")[0]
+        try:
+            results = client.translate_text(texts, source_lang=source_lang, target_lang=target_lang)
+        except deepl.DeepLException as e:
+            raise TranslationError(f"DeepL translation failed: {e}") from e
+        return [result.text for result in results]
+
+class EchoTranslator(Translator):
+    """원문을 그대로 돌려주는 로컬 번역기. API 키 없이 개발/테스트하거나 OCR 결과만 확인할 때 씁니다."""
+    def translate(self, texts: List[str], source_lang: Optional[str], target_lang: str,
+                  api_key: Optional[str] = None) -> List[str]:
+        return list(texts)
+
+_TRANSLATORS: Dict[str, Translator] = {}
+
+def register_translator(translator: Translator):
+    """번역기를 이름으로 등록합니다. 같은 이름이 있으면 교체합니다."""
+    _TRANSLATORS[translator.name] = translator
+
+def get_translator(name: Optional[str] = None) -> Translator:
+    name = name or DEFAULT_TRANSLATOR
+    if name not in _TRANSLATORS:
+        raise ValueError(f"Unknown translator: {name}. Available: {list(_TRANSLATORS)}")
+    return _TRANSLATORS[name]
+
+register_translator(DeepLTranslator("deepl"))
+register_translator(EchoTranslator("echo"))
+
+class TranslationService:
+    """
+    번역기 앞의 글줄 단위 LRU 캐시. 캐시에 없는 글줄만 모아 번역기를 한 번 호출합니다.
+    화면 번역은 프레임마다 대부분의 글줄이 그대로이므로, 새로 나타난 글줄만 번역 API 로 보냅니다.
+    """
+    def __init__(self, max_size: int = CACHE_SIZE):
+        self.max_size = max_size
+        self.latency = LatencyStats()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._lines = 0
+        self._cached_lines = 0
+        self._calls = 0
+
+    def translate(self, texts: List[str], source_lang: Optional[str], target_lang: str,
+                  translator: Optional[str] = None, api_key: Optional[str] = None) -> List[str]:
+        """글줄 목록을 번역해 같은 순서로 반환합니다. 블로킹 호출이므로 _translate_pool 등 워커 스레드에서 실행합니다."""
+        engine = get_translator(translator)
+        source_lang = source_lang.upper() if source_lang else None
+        target_lang = target_lang.upper()
+        prefix = (engine.name, source_lang, target_lang)
+        cached = {}
+        pending = []
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                value = self._cache.get(prefix + (text,))
+                if value is None:
+                    pending.append(text)
+                else:
+                    self._cache.move_to_end(prefix + (text,))
+                    cached[text] = value
+            self._lines += len(texts)
+            self._cached_lines += sum(1 for text in texts if text in cached)
+
+        if pending:
+            started = time.monotonic()
+            translated = engine.translate(pending, source_lang, target_lang, api_key)
+            self.latency.record(time.monotonic() - started)
+            if len(translated) != len(pending):
+                raise TranslationError(f"Translator '{engine.name}' returned {len(translated)} results for {len(pending)} lines.")
+            cached.update(zip(pending, translated))
+            with self._lock:
+                self._calls += 1
+                for text, value in zip(pending, translated):
+                    self._cache[prefix + (text,)] = value
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+        return [cached[text] for text in texts]
+
+    async def translate_async(self, texts: List[str], source_lang: Optional[str], target_lang: str,
+                              translator: Optional[str] = None, api_key: Optional[str] = None) -> List[str]:
+        """translate() 를 번역 전용 스레드 풀에서 실행합니다. (번역 API 대기로 OCR/STT 워커를 막지 않도록)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_translate_pool, self.translate, texts, source_lang, target_lang, translator, api_key)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "default": DEFAULT_TRANSLATOR,
+                "translators": list(_TRANSLATORS),
+                "cache_size": len(self._cache),
+                "lines": self._lines,
+                "cached_lines": self._cached_lines,
+                "cache_hit_rate": round(self._cached_lines / self._lines, 4) if self._lines else 0.0,
+                "api_calls": self._calls,
+                "latency": self.latency.stats(),
+            }
+
+translation_service = TranslationService()
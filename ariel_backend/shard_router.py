@@ -0,0 +1,392 @@
+# ariel_backend/shard_router.py
+"""
+언어 친화(language-affinity) 샤딩 모드.
+
+    python -m ariel_backend.serve --shards 3 --port 8000
+
+지원 언어를 N 개의 샤드 프로세스에 나누어 맡기고, 공개 포트에서는 작은 ASGI 라우터가 요청의 언어를 보고
+그 언어를 맡은 샤드(127.0.0.1 의 내부 포트)로 전달합니다. 샤드마다 자기 언어의 모델만 올리므로 프로세스당
+메모리가 작고, 같은 언어의 요청이 같은 프로세스로 모여 recognizer가 CPU 캐시에 머무릅니다.
+한 언어에 요청이 몰리면 그 언어를 한가한 샤드에도 배정하여(복제) 부하를 나누고, 식으면 다시 원래 샤드로 모읍니다.
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import httpx
+import websockets
+
+from ariel_backend.services import config
+from ariel_backend.services.stt_engines import list_engines
+
+logger = logging.getLogger("root")
+
+# 요청량을 다시 계산하여 언어 배정을 조정하는 주기(초)
+REBALANCE_INTERVAL_S = config.get_float("ARIEL_ROUTER_REBALANCE_S", 10.0)
+# 한 언어의 요청률이 샤드당 평균의 이 배수를 넘으면 다른 샤드에도 복제 배정합니다.
+HOT_FACTOR = config.get_float("ARIEL_ROUTER_HOT_FACTOR", 1.5)
+# 요청률 지수 이동 평균의 가중치 (클수록 최근 구간을 중시)
+RATE_SMOOTHING = config.get_float("ARIEL_ROUTER_RATE_SMOOTHING", 0.5)
+# 언어를 지정하지 않은 요청은 엔드포인트 기본값과 같은 언어로 봅니다.
+DEFAULT_LANGUAGE = "ko"
+# 언어가 본문(multipart/JSON 폼)에만 있는 STT 요청은 이 경로들에서 본문을 읽어 언어를 찾습니다.
+STT_PATH_PREFIX = "/api/v1/stt"
+STATS_PATH = "/api/v1/admin/shards"
+
+_HOP_BY_HOP = {b"connection", b"keep-alive", b"transfer-encoding", b"te", b"trailer", b"upgrade",
+               b"proxy-authorization", b"proxy-authenticate", b"host"}
+_MULTIPART_LANGUAGE = re.compile(rb'name="language"\r\n(?:[^\r\n]+\r\n)*\r\n([^\r\n]*)\r\n')
+
+def assign_languages(languages: List[str], shard_count: int) -> List[List[str]]:
+    """언어를 샤드에 번갈아 배정합니다."""
+    owned = [[] for _ in range(shard_count)]
+    for i, lang_code in enumerate(languages):
+        owned[i % shard_count].append(lang_code)
+    return owned
+
+def language_from_body(body: bytes, content_type: str) -> Optional[str]:
+    """multipart/form-data, application/x-www-form-urlencoded, JSON 본문에서 language 필드를 찾습니다."""
+    if content_type.startswith("multipart/form-data"):
+        match = _MULTIPART_LANGUAGE.search(body)
+        return match.group(1).decode("utf-8", "replace").strip() if match else None
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        values = parse_qs(body.decode("latin-1")).get("language")
+        return values[0] if values else None
+    if content_type.startswith("application/json"):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return None
+        return data.get("language") if isinstance(data, dict) else None
+    return None
+
+class Shard:
+    """샤드 워커 프로세스 하나. serve.py 를 단일 워커로 127.0.0.1 의 내부 포트에 띄웁니다."""
+    def __init__(self, index: int, port: int, languages: List[str], worker_args: List[str]):
+        self.index = index
+        self.port = port
+        self.languages = languages
+        self.worker_args = worker_args
+        self.process = None
+        self.restarts = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+
+    def start(self):
+        command = [sys.executable, "-m", "ariel_backend.serve", "--host", "127.0.0.1", "--port", str(self.port),
+                   "--workers", "1", "--preload", ",".join(self.languages)] + self.worker_args
+        # 샤드는 자기 언어만 미리 로드해야 하므로, 전역 고정 언어 설정은 물려주지 않습니다.
+        env = dict(os.environ, ARIEL_STT_PINNED_LANGUAGES="")
+        self.process = subprocess.Popen(command, env=env)
+        logger.info(f"Started STT shard {self.index} (pid {self.process.pid}, port {self.port}) for {self.languages}.")
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.poll() is None
+
+    def stop(self):
+        if self.alive:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+    def stats(self) -> Dict:
+        return {
+            "port": self.port,
+            "pid": self.process.pid if self.process else None,
+            "alive": self.alive,
+            "owned_languages": self.languages,
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+            "restarts": self.restarts,
+        }
+
+class ShardRouter:
+    """
+    요청의 언어에 따라 샤드로 HTTP/WebSocket 요청을 전달하는 ASGI 앱.
+    언어는 ?language= → X-Ariel-Language 헤더 → (STT 폼/JSON 요청이면) 본문의 language 필드 순으로 찾습니다.
+    언어와 무관한 요청(OCR, 통계 등)은 처리 중인 요청이 가장 적은 샤드로 보냅니다.
+    """
+    def __init__(self, shards: List[Shard]):
+        self.shards = shards
+        # 언어 → 그 언어를 처리하는 샤드 번호 목록. 첫 번째가 원래 담당 샤드이고, 나머지는 복제 배정입니다.
+        self.routes: Dict[str, List[int]] = {
+            lang_code: [shard.index] for shard in shards for lang_code in shard.languages
+        }
+        # 샤드가 맡은 언어(모델이 있는 언어)만 세고 배정합니다.
+        self.languages = frozenset(self.routes)
+        self._counts: Dict[str, int] = {}
+        self.rates: Dict[str, float] = {}
+        self.rebalances = 0
+        self._client = None
+        self._tasks = []
+        self._stopping = False
+
+    # --- 샤드 선택과 재배정 ---
+    def _route(self, language: Optional[str]) -> str:
+        """
+        요청 언어를 세고 그 언어로 라우팅합니다. 샤드가 맡지 않은 언어('auto' 포함)는 세지 않고 기본 언어의 샤드로 보냅니다.
+        (클라이언트가 보낸 임의의 언어 값이 요청률/배정 표에 쌓이지 않도록)
+        """
+        language = language or DEFAULT_LANGUAGE
+        if language not in self.languages:
+            return DEFAULT_LANGUAGE
+        self._counts[language] = self._counts.get(language, 0) + 1
+        return language
+
+    def _pick(self, language: Optional[str]) -> Shard:
+        candidates = self.routes.get(language) or [shard.index for shard in self.shards]
+        alive = [i for i in candidates if self.shards[i].alive] or candidates
+        return min((self.shards[i] for i in alive), key=lambda shard: shard.in_flight)
+
+    def _shard_loads(self) -> List[float]:
+        loads = [0.0] * len(self.shards)
+        for lang_code, indices in self.routes.items():
+            for i in indices:
+                loads[i] += self.rates.get(lang_code, 0.0) / len(indices)
+        return loads
+
+    def rebalance(self, elapsed_s: float):
+        """지난 구간의 언어별 요청률로, 뜨거운 언어는 샤드를 늘리고 식은 언어는 원래 샤드로 되돌립니다."""
+        counts, self._counts = self._counts, {}
+        for lang_code in set(self.rates) | set(counts):
+            current = counts.get(lang_code, 0) / elapsed_s
+            self.rates[lang_code] = RATE_SMOOTHING * current + (1 - RATE_SMOOTHING) * self.rates.get(lang_code, 0.0)
+
+        total = sum(self.rates.values())
+        if total <= 0 or len(self.shards) < 2:
+            return
+        fair_share = total / len(self.shards)
+        for lang_code, rate in sorted(self.rates.items(), key=lambda item: -item[1]):
+            indices = self.routes[lang_code]
+            wanted = 1
+            if rate > fair_share * HOT_FACTOR:
+                wanted = min(len(self.shards), math.ceil(rate / fair_share))
+            while len(indices) < wanted:
+                loads = self._shard_loads()
+                spare = min((i for i in range(len(self.shards)) if i not in indices), key=lambda i: loads[i])
+                indices.append(spare)
+                self.rebalances += 1
+                logger.info(f"Language '{lang_code}' is hot ({rate:.1f} req/s). Also routing it to shard {spare}.")
+            while len(indices) > wanted:
+                removed = indices.pop()
+                self.rebalances += 1
+                logger.info(f"Language '{lang_code}' cooled down ({rate:.1f} req/s). Stopped routing it to shard {removed}.")
+
+    async def _rebalance_loop(self):
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(REBALANCE_INTERVAL_S)
+            now = time.monotonic()
+            self.rebalance(now - last)
+            last = now
+
+    async def _supervise_loop(self):
+        """죽은 샤드를 같은 포트와 언어로 다시 띄웁니다."""
+        while not self._stopping:
+            await asyncio.sleep(1.0)
+            for shard in self.shards:
+                if not shard.alive and not self._stopping:
+                    logger.warning(f"STT shard {shard.index} exited with status {shard.process.returncode}. Restarting.")
+                    shard.restarts += 1
+                    shard.start()
+
+    def stats(self) -> Dict:
+        return {
+            "shards": [shard.stats() for shard in self.shards],
+            "routes": self.routes,
+            "rates": {lang_code: round(rate, 3) for lang_code, rate in self.rates.items()},
+            "rebalances": self.rebalances,
+        }
+
+    # --- ASGI ---
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._proxy_http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._proxy_websocket(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._client = httpx.AsyncClient(timeout=httpx.Timeout(None, connect=5.0))
+                self._tasks = [asyncio.ensure_future(self._rebalance_loop()),
+                               asyncio.ensure_future(self._supervise_loop())]
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self._stopping = True
+                for task in self._tasks:
+                    task.cancel()
+                await self._client.aclose()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    def _request_language(scope) -> Optional[str]:
+        values = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("language")
+        if values:
+            return values[0]
+        for name, value in scope.get("headers", []):
+            if name == b"x-ariel-language":
+                return value.decode("latin-1")
+        return None
+
+    async def _send_json(self, send, status: int, payload: Dict, headers=None):
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+                       + (headers or []),
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def _proxy_http(self, scope, receive, send):
+        if scope["path"] == STATS_PATH and scope["method"] == "GET":
+            await self._send_json(send, 200, self.stats())
+            return
+
+        headers = [(name, value) for name, value in scope["headers"] if name not in _HOP_BY_HOP]
+        content_type = dict(scope["headers"]).get(b"content-type", b"").decode("latin-1")
+        language = self._request_language(scope)
+        body = None
+        is_stt = scope["path"].startswith(STT_PATH_PREFIX)
+        if language is None and is_stt and content_type.startswith(
+                ("multipart/form-data", "application/x-www-form-urlencoded", "application/json")):
+            # 폼 필드로 언어를 보내는 요청만 본문을 모아 읽습니다. (크기는 RequestSizeLimitMiddleware 가 제한)
+            chunks = []
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    break
+            body = b"".join(chunks)
+            language = language_from_body(body, content_type)
+        if is_stt:
+            language = self._route(language)
+
+        async def stream_body():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    return
+                yield message.get("body", b"")
+                if not message.get("more_body"):
+                    return
+
+        shard = self._pick(language)
+        url = f"http://127.0.0.1:{shard.port}{scope['path']}"
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+
+        shard.in_flight += 1
+        shard.requests += 1
+        try:
+            request = self._client.build_request(
+                scope["method"], url, headers=headers, content=body if body is not None else stream_body(),
+            )
+            try:
+                response = await self._client.send(request, stream=True)
+            except httpx.TransportError as e:
+                shard.errors += 1
+                logger.warning(f"STT shard {shard.index} is unavailable: {e}")
+                await self._send_json(send, 503, {"detail": f"Shard {shard.index} is unavailable."},
+                                      headers=[(b"retry-after", b"1")])
+                return
+            try:
+                await send({
+                    "type": "http.response.start",
+                    "status": response.status_code,
+                    "headers": [(name, value) for name, value in response.headers.raw
+                                if name.lower() not in _HOP_BY_HOP],
+                })
+                async for chunk in response.aiter_raw():
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b""})
+            finally:
+                await response.aclose()
+        finally:
+            shard.in_flight -= 1
+
+    async def _proxy_websocket(self, scope, receive, send):
+        shard = self._pick(self._route(self._request_language(scope)))
+        url = f"ws://127.0.0.1:{shard.port}{scope['path']}"
+        if scope.get("query_string"):
+            url += "?" + scope["query_string"].decode("latin-1")
+
+        await receive()  # websocket.connect
+        try:
+            upstream = await websockets.connect(url, max_size=None, open_timeout=5)
+        except Exception as e:
+            shard.errors += 1
+            logger.warning(f"STT shard {shard.index} refused the stream: {e}")
+            await send({"type": "websocket.close", "code": 1013})
+            return
+        await send({"type": "websocket.accept"})
+
+        async def client_to_upstream():
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    return
+                if message.get("bytes") is not None:
+                    await upstream.send(message["bytes"])
+                elif message.get("text") is not None:
+                    await upstream.send(message["text"])
+
+        async def upstream_to_client():
+            try:
+                async for data in upstream:
+                    if isinstance(data, bytes):
+                        await send({"type": "websocket.send", "bytes": data})
+                    else:
+                        await send({"type": "websocket.send", "text": data})
+            except websockets.ConnectionClosed:
+                pass
+            await send({"type": "websocket.close", "code": upstream.close_code or 1000})
+
+        shard.in_flight += 1
+        shard.requests += 1
+        tasks = [asyncio.ensure_future(client_to_upstream()), asyncio.ensure_future(upstream_to_client())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await upstream.close()
+            shard.in_flight -= 1
+
+def start_shards(shard_count: int, base_port: int, worker_args: List[str]) -> List[Shard]:
+    """지원 언어를 샤드에 나누어 배정하고 샤드 프로세스를 띄웁니다."""
+    languages = []
+    for engine in list_engines():
+        for lang_code in engine.languages:
+            if lang_code not in languages:
+                languages.append(lang_code)
+    shard_count = max(1, min(shard_count, len(languages) or 1))
+    shards = [Shard(i, base_port + i, owned, worker_args)
+              for i, owned in enumerate(assign_languages(languages, shard_count))]
+    for shard in shards:
+        shard.start()
+    return shards
+
+def stop_shards(shards: List[Shard]):
+    for shard in shards:
+        shard.stop()
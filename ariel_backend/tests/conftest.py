@@ -0,0 +1,6 @@
+# ariel_backend/tests/conftest.py
+import os
+import sys
+
+# 저장소 루트에서 'pytest' 만 실행해도 ariel_backend 패키지를 import 할 수 있도록 합니다.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
@@ -0,0 +1,133 @@
+# ariel_backend/tests/test_audio_codec.py
+import io
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from ariel_backend.services import audio_codec
+from ariel_backend.services.audio_codec import (
+    MuLawDecoder, PcmDecoder, WavDecoder, ZlibDeltaDecoder,
+    decode_audio, make_decoder, mulaw_decode, mulaw_encode, zlib_delta_encode,
+)
+
+def tone(seconds: float = 0.5, amplitude: int = 12000, channels: int = 1) -> np.ndarray:
+    t = np.arange(int(audio_codec.SAMPLE_RATE * seconds)) / audio_codec.SAMPLE_RATE
+    samples = (amplitude * np.sin(2 * np.pi * 440 * t)).astype("<i2")
+    return np.repeat(samples[:, None], channels, axis=1) if channels > 1 else samples
+
+def stream(decoder, data: bytes, size: int) -> bytes:
+    """data 를 size 바이트씩 잘라 스트리밍 디코더에 넣은 결과."""
+    return b"".join(decoder.decode(data[i:i + size]) for i in range(0, len(data), size)) + decoder.flush()
+
+def wav_bytes(samples: np.ndarray, sample_rate: int = audio_codec.SAMPLE_RATE, channels: int = 1) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(2)
+        writer.setframerate(sample_rate)
+        writer.writeframes(samples.tobytes())
+    return buffer.getvalue()
+
+def riff(*chunks: bytes) -> bytes:
+    body = b"WAVE" + b"".join(chunks)
+    return b"RIFF" + struct.pack("<I", len(body)) + body
+
+def chunk(chunk_id: bytes, data: bytes) -> bytes:
+    return chunk_id + struct.pack("<I", len(data)) + data + b"\0" * (len(data) & 1)
+
+def fmt_chunk(audio_format: int = 1, channels: int = 1, sample_rate: int = audio_codec.SAMPLE_RATE, bits: int = 16) -> bytes:
+    block_align = channels * bits // 8
+    return chunk(b"fmt ", struct.pack("<HHIIHH", audio_format, channels, sample_rate, sample_rate * block_align, block_align, bits))
+
+# --- 코덱 왕복 ---
+def test_mulaw_round_trip_stays_within_quantization_error():
+    samples = np.arange(-32767, 32768, 7, dtype=np.int32)
+    decoded = np.frombuffer(mulaw_decode(mulaw_encode(samples.astype("<i2").tobytes())), dtype="<i2")
+    # mu-law 는 크기에 비례하는 간격으로 양자화합니다. (큰 값일수록 오차가 커짐)
+    assert np.all(np.abs(decoded - samples) <= np.abs(samples) / 16 + 8)
+    assert len(mulaw_encode(samples.astype("<i2").tobytes())) == len(samples)
+
+def test_mulaw_decoder_streams_one_byte_per_sample():
+    encoded = mulaw_encode(tone().tobytes())
+    assert stream(MuLawDecoder(), encoded, 333) == mulaw_decode(encoded)
+
+def test_zlib_delta_round_trip_is_lossless_across_chunk_boundaries():
+    # 최댓값과 최솟값을 오가는 구간은 차분이 int16 범위를 넘어 순환(wrap)합니다.
+    samples = np.concatenate([tone(), np.array([32767, -32768, 32767, 0, -32768], dtype="<i2")])
+    encoded = zlib_delta_encode(samples.tobytes())
+    for size in (1, 3, 4096, len(encoded)):
+        assert stream(ZlibDeltaDecoder(), encoded, size) == samples.tobytes()
+
+def test_zlib_delta_rejects_a_chunk_that_inflates_past_the_limit(monkeypatch):
+    monkeypatch.setattr(audio_codec, "MAX_INFLATE_BYTES", 1024)
+    encoded = zlib_delta_encode(np.zeros(4096, dtype="<i2").tobytes())
+    with pytest.raises(ValueError, match="expands beyond"):
+        ZlibDeltaDecoder().decode(encoded)
+
+def test_zlib_delta_rejects_a_corrupt_stream():
+    with pytest.raises(ValueError, match="Invalid zlib-delta"):
+        ZlibDeltaDecoder().decode(b"not zlib at all")
+
+def test_pcm_decoder_joins_samples_split_across_chunks():
+    pcm = tone().tobytes()
+    assert stream(PcmDecoder(), pcm, 3) == pcm
+
+def test_pcm_decoder_converts_f32le_to_s16le():
+    floats = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 2.0], dtype="<f4")
+    decoded = np.frombuffer(stream(PcmDecoder("f32le"), floats.tobytes(), 5), dtype="<i2")
+    assert decoded.tolist() == [0, 16383, -16383, 32767, -32767, 32767]
+
+def test_flac_round_trip():
+    soundfile = pytest.importorskip("soundfile")
+    samples = tone()
+    buffer = io.BytesIO()
+    soundfile.write(buffer, samples, audio_codec.SAMPLE_RATE, format="FLAC", subtype="PCM_16")
+    assert decode_audio(buffer.getvalue(), "flac") == samples.tobytes()
+
+def test_flac_rejects_other_sample_rates():
+    soundfile = pytest.importorskip("soundfile")
+    buffer = io.BytesIO()
+    soundfile.write(buffer, tone(), 8000, format="FLAC", subtype="PCM_16")
+    with pytest.raises(ValueError, match="sample rate"):
+        decode_audio(buffer.getvalue(), "flac")
+
+def test_make_decoder_rejects_unknown_encodings():
+    with pytest.raises(ValueError, match="Unsupported audio encoding"):
+        make_decoder("mp3")
+    with pytest.raises(ValueError, match="Unsupported sample format"):
+        make_decoder("pcm", "s24le")
+
+# --- WAV ---
+def test_wav_decoder_streams_the_data_chunk():
+    samples = tone()
+    assert stream(WavDecoder(), wav_bytes(samples), 7) == samples.tobytes()
+
+def test_wav_decoder_downmixes_to_mono():
+    stereo = tone(channels=2)
+    stereo[:, 1] = 0
+    decoded = np.frombuffer(stream(WavDecoder(), wav_bytes(stereo, channels=2), 1001), dtype="<i2")
+    assert np.array_equal(decoded, (stereo[:, 0] / 2).astype("<i2"))
+
+def test_wav_decoder_skips_metadata_and_stops_at_the_end_of_data():
+    samples = tone(0.1)
+    data = riff(fmt_chunk(), chunk(b"LIST", b"INFOtest"), chunk(b"data", samples.tobytes()), chunk(b"id3 ", b"\xff" * 64))
+    assert stream(WavDecoder(), data, 5) == samples.tobytes()
+
+@pytest.mark.parametrize("data, message", [
+    (b"RIFX\0\0\0\0WAVE", "missing RIFF/WAVE"),
+    (riff(chunk(b"fmt ", b"\x01\x00\x01\x00\x80\x3e\x00\x00")), "too short"),
+    (riff(chunk(b"data", b"\0\0"), fmt_chunk()), "before 'fmt '"),
+    (riff(fmt_chunk(sample_rate=44100), chunk(b"data", b"\0\0")), "sample rate"),
+    (riff(fmt_chunk(bits=8), chunk(b"data", b"\0\0")), "Unsupported WAV format"),
+    (riff(fmt_chunk()), "stream ended before"),
+])
+def test_wav_decoder_rejects_invalid_headers(data, message):
+    with pytest.raises(ValueError, match=message):
+        decode_audio(data, "wav")
+
+def test_wav_decoder_rejects_oversized_metadata_chunks():
+    header = riff(fmt_chunk()) + b"LIST" + struct.pack("<I", audio_codec.MAX_WAV_HEADER_BYTES)
+    with pytest.raises(ValueError, match="too large"):
+        WavDecoder().decode(header)
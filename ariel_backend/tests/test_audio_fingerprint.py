@@ -0,0 +1,65 @@
+# ariel_backend/tests/test_audio_fingerprint.py
+import numpy as np
+
+from ariel_backend.services.audio_fingerprint import BITS_PER_FRAME, SAMPLE_RATE, ResultCache, fingerprint
+
+def broadband(seed: int, seconds: float = 1.0) -> np.ndarray:
+    """모든 대역에 에너지가 있고 프레임마다 대역 에너지가 달라지는 신호. (지문 비트가 고르게 섞이도록)"""
+    return np.random.default_rng(seed).normal(0, 5000, int(SAMPLE_RATE * seconds))
+
+def pcm(samples: np.ndarray) -> bytes:
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+def bit_errors(a: np.ndarray, b: np.ndarray) -> int:
+    return int(np.unpackbits(a ^ b).sum())
+
+def test_fingerprint_shape_and_short_audio():
+    fp = fingerprint(pcm(broadband(0)))
+    assert fp.dtype == np.uint8
+    assert fp.shape[1] * 8 == BITS_PER_FRAME
+    assert fingerprint(b"\0" * 600) is None
+
+def test_fingerprint_ignores_volume_and_tolerates_light_noise():
+    samples = broadband(0)
+    fp = fingerprint(pcm(samples))
+    assert np.array_equal(fingerprint(pcm(samples * 0.5)), fp)
+    noisy = samples + np.random.default_rng(1).normal(0, 100, len(samples))
+    assert bit_errors(fingerprint(pcm(noisy)), fp) < 0.05 * fp.size * 8
+    assert bit_errors(fingerprint(pcm(broadband(2))), fp) > 0.3 * fp.size * 8
+
+def test_fingerprint_ignores_energy_above_3khz():
+    samples = broadband(0)
+    t = np.arange(len(samples)) / SAMPLE_RATE
+    # 가장 높은 대역(3kHz) 위에서 세기가 바뀌는 성분은 지문에 영향을 주지 않습니다.
+    whistle = 3000 * np.sin(2 * np.pi * 6000 * t) * (1 + np.sin(2 * np.pi * 3 * t))
+    assert np.array_equal(fingerprint(pcm(samples + whistle)), fingerprint(pcm(samples)))
+
+def test_result_cache_hits_exact_and_near_repeats_per_model():
+    cache = ResultCache(max_size=8, max_bit_error_rate=0.1)
+    samples = broadband(0)
+    cache.put("vosk:ko", fingerprint(pcm(samples)), "안녕하세요", 0.2)
+    noisy = samples + np.random.default_rng(1).normal(0, 100, len(samples))
+
+    assert cache.get("vosk:ko", fingerprint(pcm(samples))) == "안녕하세요"
+    assert cache.get("vosk:ko", fingerprint(pcm(noisy))) == "안녕하세요"
+    assert cache.get("vosk:en", fingerprint(pcm(samples))) is None
+    assert cache.get("vosk:ko", fingerprint(pcm(broadband(2)))) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["near_hits"], stats["misses"]) == (2, 1, 2)
+
+def test_result_cache_evicts_the_least_recently_used_entry():
+    cache = ResultCache(max_size=2, max_bit_error_rate=0)
+    prints = [fingerprint(pcm(broadband(seed))) for seed in range(3)]
+    cache.put("model", prints[0], "zero", 0.1)
+    cache.put("model", prints[1], "one", 0.1)
+    assert cache.get("model", prints[0]) == "zero"
+    cache.put("model", prints[2], "two", 0.1)
+    assert cache.get("model", prints[1]) is None
+    assert [cache.get("model", fp) for fp in (prints[0], prints[2])] == ["zero", "two"]
+
+def test_disabled_result_cache_stores_nothing():
+    cache = ResultCache(max_size=0)
+    fp = fingerprint(pcm(broadband(0)))
+    cache.put("model", fp, "text", 0.1)
+    assert cache.get("model", fp) is None
+    assert cache.stats()["size"] == 0
@@ -0,0 +1,49 @@
+# ariel_backend/tests/test_audio_gate.py
+import numpy as np
+
+from ariel_backend.services import audio_gate
+from ariel_backend.services.audio_gate import SAMPLE_RATE, SilenceGate
+
+def pcm(samples: np.ndarray) -> bytes:
+    return np.clip(samples, -32768, 32767).astype("<i2").tobytes()
+
+def voice(seconds: float = 0.5, amplitude: float = 8000.0) -> np.ndarray:
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+def test_silence_is_skipped_and_counted():
+    gate = SilenceGate()
+    assert not gate.is_speech(pcm(np.zeros(SAMPLE_RATE)), "ko")
+    stats = gate.stats()
+    assert stats["checked"] == 1
+    assert stats["skipped"] == 1
+    assert stats["skipped_audio_s"] == 1.0
+
+def test_voiced_audio_passes():
+    assert SilenceGate().is_speech(pcm(voice()), "ko")
+
+def test_loud_hiss_is_treated_as_noise():
+    # 큰 백색 잡음은 레벨은 높지만 영교차율이 높아 음성으로 보지 않습니다.
+    hiss = np.random.default_rng(0).normal(0, 8000, SAMPLE_RATE // 2)
+    assert not SilenceGate().is_speech(pcm(hiss), "ko")
+
+def test_a_short_burst_needs_the_minimum_number_of_voiced_frames():
+    frame = audio_gate.FRAME_SAMPLES
+    burst = np.zeros(SAMPLE_RATE // 2)
+    burst[:frame] = voice()[:frame]
+    gate = SilenceGate()
+    assert not gate.is_speech(pcm(burst), "ko")
+    burst[:frame * audio_gate.MIN_SPEECH_FRAMES] = voice()[:frame * audio_gate.MIN_SPEECH_FRAMES]
+    assert gate.is_speech(pcm(burst), "ko")
+
+def test_threshold_prefers_request_then_language_then_default(monkeypatch):
+    monkeypatch.setattr(audio_gate, "THRESHOLD_DB_OVERRIDES", {"en": "-40", "ja": "loud"})
+    gate = SilenceGate()
+    assert gate.threshold_for("en", -30.0) == -30.0
+    assert gate.threshold_for("en") == -40.0
+    assert gate.threshold_for("ko") == audio_gate.DEFAULT_THRESHOLD_DB
+    # 잘못된 언어별 설정은 기본값으로 대체합니다.
+    assert gate.threshold_for("ja") == audio_gate.DEFAULT_THRESHOLD_DB
+    # 임계값을 높이면 조용한 음성도 무음으로 봅니다.
+    assert not gate.is_speech(pcm(voice(amplitude=300.0)), "en")
+    assert gate.is_speech(pcm(voice(amplitude=300.0)), "ko")
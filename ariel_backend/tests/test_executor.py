@@ -0,0 +1,175 @@
+# ariel_backend/tests/test_executor.py
+import asyncio
+import threading
+
+import pytest
+
+from ariel_backend.services import executor
+from ariel_backend.services.executor import BoundedExecutor, DeadlineExceededError, QueueFullError, current_client
+
+WAIT_S = 5.0
+
+class FakeClock:
+    """실행기의 시계(time.monotonic/time.time)를 대신합니다. 작업이 advance() 한 만큼만 시간이 흐릅니다."""
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(executor, "time", fake)
+    return fake
+
+def submit_as(pool: BoundedExecutor, client_id: str, fn, *args, **kwargs) -> asyncio.Task:
+    """client_id 클라이언트의 요청으로 작업을 제출합니다. (current_client 는 태스크를 만들 때의 값이 복사됨)"""
+    token = current_client.set(client_id)
+    try:
+        return asyncio.ensure_future(pool.submit(fn, args, **kwargs))
+    finally:
+        current_client.reset(token)
+
+async def start_blocker(pool: BoundedExecutor, client_id: str = "blocker"):
+    """워커 하나를 붙잡아 두는 작업을 제출하고, 실행이 시작될 때까지 기다립니다. (해제 이벤트, 태스크) 를 반환합니다."""
+    started, release = threading.Event(), threading.Event()
+
+    def block():
+        started.set()
+        release.wait(WAIT_S)
+
+    task = submit_as(pool, client_id, block)
+    assert await asyncio.to_thread(started.wait, WAIT_S)
+    return release, task
+
+def test_fair_share_runs_a_light_client_before_a_flooding_one(clock):
+    async def main():
+        pool = BoundedExecutor("test", max_workers=1, max_queue=16)
+        release, blocker = await start_blocker(pool)
+        order = []
+
+        def job(name):
+            order.append(name)
+            clock.advance(0.01)
+
+        tasks = [submit_as(pool, "flood", job, f"flood-{i}") for i in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(submit_as(pool, "light", job, "light-0"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        return order
+
+    # 먼저 대기열에 4개를 쌓은 클라이언트가 있어도, 나중에 온 클라이언트는 두 번째로 실행됩니다.
+    assert asyncio.run(main()) == ["flood-0", "light-0", "flood-1", "flood-2", "flood-3"]
+
+def test_fair_share_follows_client_weights(clock, monkeypatch):
+    monkeypatch.setitem(executor.CLIENT_WEIGHTS, "heavy", "3")
+
+    async def main():
+        pool = BoundedExecutor("test", max_workers=1, max_queue=16)
+        release, blocker = await start_blocker(pool)
+        order = []
+
+        def job(name):
+            order.append(name)
+            clock.advance(0.03)
+
+        tasks = []
+        for i in range(4):
+            tasks.append(submit_as(pool, "heavy", job, "heavy"))
+            tasks.append(submit_as(pool, "normal", job, "normal"))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(blocker, *tasks)
+        return order
+
+    # 가중치 3 인 클라이언트는 같은 워커 시간 동안 가중치 1 인 클라이언트보다 세 배의 작업을 실행합니다.
+    assert asyncio.run(main())[:4] == ["heavy", "normal", "heavy", "heavy"]
+
+def test_client_concurrency_cap_leaves_workers_for_other_clients():
+    async def main():
+        pool = BoundedExecutor("test", max_workers=2, max_queue=16, client_max_concurrency=1)
+        release, first = await start_blocker(pool, "greedy")
+        started = []
+
+        def job(name):
+            started.append(name)
+
+        second = submit_as(pool, "greedy", job, "greedy")
+        other = submit_as(pool, "other", job, "other")
+        # 'greedy' 는 이미 워커 하나를 쓰고 있으므로, 남은 워커는 'other' 의 작업이 씁니다.
+        await asyncio.wait_for(other, WAIT_S)
+        assert started == ["other"]
+        assert not second.done()
+
+        release.set()
+        await asyncio.wait_for(asyncio.gather(first, second), WAIT_S)
+        return started
+
+    assert asyncio.run(main()) == ["other", "greedy"]
+
+def test_client_queue_cap_rejects_with_retry_after():
+    async def main():
+        pool = BoundedExecutor("test", max_workers=1, max_queue=16, client_max_queue=1)
+        release, blocker = await start_blocker(pool, "greedy")
+        queued = submit_as(pool, "greedy", lambda: "queued")
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError) as error:
+            await submit_as(pool, "greedy", lambda: "rejected")
+        assert error.value.retry_after >= 1
+        # 다른 클라이언트는 같은 실행기에 계속 작업을 넣을 수 있습니다.
+        other = submit_as(pool, "other", lambda: "other")
+        release.set()
+        return await asyncio.gather(queued, other, blocker), pool.client_stats()["greedy"]["rejected"]
+
+    results, rejected = asyncio.run(main())
+    assert results[:2] == ["queued", "other"]
+    assert rejected == 1
+
+def test_expired_deadline_is_rejected_at_submit(clock):
+    async def main():
+        pool = BoundedExecutor("test", max_workers=1, max_queue=16)
+        with pytest.raises(DeadlineExceededError):
+            await pool.submit(lambda: "late", deadline=clock.now - 1)
+        return pool.stats()
+
+    stats = asyncio.run(main())
+    assert stats["shed"] == 1
+    assert stats["submitted"] == 0
+
+def test_deadline_passing_in_the_queue_sheds_without_running(clock):
+    async def main():
+        pool = BoundedExecutor("test", max_workers=1, max_queue=16)
+        release, blocker = await start_blocker(pool)
+        ran = []
+        stale = submit_as(pool, "client", ran.append, "stale", deadline=clock.now + 1)
+        fresh = submit_as(pool, "client", ran.append, "fresh", deadline=clock.now + 10)
+        await asyncio.sleep(0)
+        clock.advance(2)
+        release.set()
+        await blocker
+        with pytest.raises(DeadlineExceededError):
+            await stale
+        await fresh
+        return ran, pool.stats()
+
+    ran, stats = asyncio.run(main())
+    assert ran == ["fresh"]
+    assert stats["shed"] == 1
+
+def test_work_sees_the_submitting_request_context():
+    async def main():
+        pool = BoundedExecutor("test", max_workers=1, max_queue=16)
+        return await asyncio.gather(submit_as(pool, "kiosk-1", current_client.get),
+                                    submit_as(pool, "kiosk-2", current_client.get))
+
+    # 워커 스레드에서도 current_client 는 작업을 제출한 요청의 값입니다. (영역 프로필 캐시 키 등에 사용)
+    assert asyncio.run(main()) == ["kiosk-1", "kiosk-2"]
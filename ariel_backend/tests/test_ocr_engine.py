@@ -0,0 +1,38 @@
+# ariel_backend/tests/test_ocr_engine.py
+from ariel_backend.services.ocr_engine import TSV_COLUMNS, lines_to_text, parse_tsv
+
+def tsv(*words) -> str:
+    """(block, paragraph, line, x, y, w, h, confidence, text) 단어들로 Tesseract TSV 를 만듭니다."""
+    rows = ["\t".join(TSV_COLUMNS)]
+    # 단어가 아닌 행(페이지/블록 등)과 빈 단어는 건너뛰어야 합니다.
+    rows.append("\t".join(["1", "1", "0", "0", "0", "0", "0", "0", "640", "480", "-1", ""]))
+    for block, paragraph, line, x, y, w, h, confidence, text in words:
+        rows.append("\t".join(str(value) for value in (5, 1, block, paragraph, line, 1, x, y, w, h, confidence, text)))
+    return "\n".join(rows)
+
+def test_parse_tsv_groups_words_into_lines_with_union_boxes():
+    lines = parse_tsv(tsv(
+        (1, 1, 1, 10, 12, 40, 20, 90, "Hello"),
+        (1, 1, 1, 60, 10, 50, 24, 80, "world"),
+        (1, 1, 2, 10, 50, 30, 20, 70, "next"),
+    ))
+    assert [line["text"] for line in lines] == ["Hello world", "next"]
+    assert lines[0]["box"] == [10, 10, 100, 24]
+    assert lines[0]["confidence"] == 85.0
+    assert [word["text"] for word in lines[0]["words"]] == ["Hello", "world"]
+
+def test_parse_tsv_skips_blank_and_unrecognized_words():
+    lines = parse_tsv(tsv(
+        (1, 1, 1, 10, 10, 40, 20, -1, "ghost"),
+        (1, 1, 1, 60, 10, 40, 20, 95, "  "),
+        (1, 1, 1, 110, 10, 40, 20, 88, "kept"),
+    ) + "\nmalformed\trow")
+    assert [line["text"] for line in lines] == ["kept"]
+
+def test_lines_to_text_separates_paragraphs_with_a_blank_line():
+    lines = parse_tsv(tsv(
+        (1, 1, 1, 10, 10, 40, 20, 90, "one"),
+        (1, 1, 2, 10, 40, 40, 20, 90, "two"),
+        (2, 1, 1, 10, 90, 40, 20, 90, "three"),
+    ))
+    assert lines_to_text(lines) == "one\ntwo\n\nthree"
@@ -0,0 +1,51 @@
+# ariel_backend/tests/test_ocr_preprocess.py
+import numpy as np
+import pytest
+
+from ariel_backend.services import ocr_preprocess
+from ariel_backend.services.ocr_preprocess import RawFrame, line_spans, raw_frame_bytes, to_grayscale
+
+def test_raw_frame_wraps_a_padded_buffer_without_copying():
+    # 2x2 BGRA 프레임, 행마다 4 바이트 여백
+    rows = [bytes([0, 0, 255, 255, 255, 255, 255, 255]) + b"\xee" * 4,
+            bytes([255, 0, 0, 255, 0, 0, 0, 255]) + b"\xee" * 4]
+    buffer = b"".join(rows)
+    frame = RawFrame(buffer, 2, 2, "BGRA", stride=12)
+    array = frame.to_array()
+    assert array.shape == (2, 2, 4)
+    assert array[1, 0].tolist() == [255, 0, 0, 255]
+    assert np.shares_memory(array, np.frombuffer(buffer, dtype=np.uint8))
+    # 빨강(R=255)과 파랑(B=255)을 BT.601 가중치로 흑백 변환합니다.
+    assert to_grayscale(frame).tolist() == [[76, 255], [29, 0]]
+
+def test_raw_frame_accepts_a_buffer_without_padding_after_the_last_row():
+    frame = RawFrame(b"\x10" * (8 + 4), 4, 2, "gray", stride=8)
+    assert frame.to_array().tolist() == [[16] * 4] * 2
+
+@pytest.mark.parametrize("args, message", [
+    ((b"\0" * 4, 2, 2, "rgb"), "Unknown pixel format"),
+    ((b"\0" * 4, 0, 2, "gray"), "Invalid frame size"),
+    ((b"\0" * 4, 2, 2, "gray", 1), "smaller than the row size"),
+    ((b"\0" * 3, 2, 2, "gray"), "expected 4"),
+])
+def test_raw_frame_rejects_invalid_geometry(args, message):
+    with pytest.raises(ValueError, match=message):
+        RawFrame(*args)
+
+def test_raw_frame_bytes_bounds_the_body_size(monkeypatch):
+    assert raw_frame_bytes(4, 3, "bgra") == 48
+    assert raw_frame_bytes(4, 3, "gray", stride=8) == 24
+    monkeypatch.setattr(ocr_preprocess, "MAX_FRAME_PIXELS", 100)
+    with pytest.raises(ValueError, match="Invalid frame size"):
+        raw_frame_bytes(20, 10, "gray")
+    monkeypatch.setattr(ocr_preprocess, "MAX_FRAME_BYTES", 400)
+    with pytest.raises(ValueError, match="larger than 400 bytes"):
+        raw_frame_bytes(10, 10, "gray", stride=1000)
+
+def test_line_spans_finds_text_rows_and_ignores_specks():
+    gray = np.full((100, 200), 255, dtype=np.uint8)
+    gray[10:22, 20:180:3] = 0
+    gray[40:55, 20:180:3] = 0
+    # 2px 높이의 잡음 점은 글줄로 보지 않습니다.
+    gray[80:82, 20:180:3] = 0
+    assert line_spans(gray).tolist() == [[10, 22], [40, 55]]
@@ -0,0 +1,55 @@
+# ariel_backend/tests/test_ocr_tiling.py
+import numpy as np
+
+from ariel_backend.services import ocr_tiling
+from ariel_backend.services.ocr_tiling import merge_bands, plan_bands
+
+def line(text: str, y: int, confidence: float = 90.0, x: int = 10, w: int = 200, h: int = 20, block: int = 1):
+    """전체 이미지 좌표의 인식 글줄 하나."""
+    return {"text": text, "box": [x, y, w, h], "confidence": confidence, "block": block, "paragraph": 1,
+            "words": [{"text": text, "box": [x, y, w, h], "confidence": confidence}]}
+
+def test_line_recognized_in_both_overlapping_bands_is_kept_once():
+    # 띠 0 은 [0, 130), 띠 1 은 [70, 200) 을 인식했고, y=90 의 글줄은 겹친 구간에 온전히 들어 있습니다.
+    extents = [(0, 130), (70, 200)]
+    results = [
+        [line("first", 20), line("shared", 90, confidence=70.0)],
+        [line("shared", 90, confidence=85.0), line("last", 150)],
+    ]
+    merged = merge_bands(extents, results, height=200)
+    assert [item["text"] for item in merged] == ["first", "shared", "last"]
+    # 두 띠가 모두 인식한 글줄은 신뢰도가 높은 쪽을 남깁니다.
+    assert merged[1]["confidence"] == 85.0
+
+def test_lines_cut_by_a_band_edge_are_dropped_in_favour_of_the_neighbour():
+    extents = [(0, 130), (70, 200)]
+    results = [
+        # 띠 0 의 아래 가장자리에 닿은 글줄 (잘렸을 수 있음)
+        [line("first", 20), line("cut", 115, h=15)],
+        # 띠 1 의 위 가장자리에 닿은 글줄과, 온전히 인식한 같은 글줄
+        [line("top-cut", 70, h=10), line("whole", 115, h=20)],
+    ]
+    merged = merge_bands(extents, results, height=200)
+    assert [item["text"] for item in merged] == ["first", "whole"]
+
+def test_lines_side_by_side_in_the_overlap_are_not_treated_as_duplicates():
+    extents = [(0, 130), (70, 200)]
+    results = [[line("left", 90, x=0, w=100)], [line("right", 90, x=150, w=100)]]
+    assert [item["text"] for item in merge_bands(extents, results, height=200)] == ["left", "right"]
+
+def test_small_images_are_recognized_in_one_band():
+    gray = np.full((300, 400), 255, dtype=np.uint8)
+    assert plan_bands(gray, workers=4) == [(0, 300)]
+
+def test_bands_are_cut_in_the_blank_rows_between_lines(monkeypatch):
+    monkeypatch.setattr(ocr_tiling, "TILE_MIN_PIXELS", 0)
+    monkeypatch.setattr(ocr_tiling, "TILE_MIN_BAND_PX", 100)
+    gray = np.full((400, 300), 255, dtype=np.uint8)
+    # 40px 마다 16px 높이의 글줄(192~208 등). 균등 분할 위치 200 은 글줄 안이므로 가장 가까운 여백으로 옮겨 자릅니다.
+    for top in range(32, 400, 40):
+        gray[top:top + 16, 20:280:4] = 0
+    bands = plan_bands(gray, workers=2)
+    assert len(bands) == 2
+    cut = bands[0][1]
+    assert bands == [(0, cut), (cut, 400)]
+    assert not ocr_tiling.content_rows(gray)[cut]
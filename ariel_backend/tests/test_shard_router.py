@@ -0,0 +1,53 @@
+# ariel_backend/tests/test_shard_router.py
+import json
+
+from ariel_backend.shard_router import DEFAULT_LANGUAGE, Shard, ShardRouter, assign_languages, language_from_body
+
+def router(*owned) -> ShardRouter:
+    """샤드 프로세스를 띄우지 않은 라우터. (샤드는 살아 있지 않으므로 모든 후보가 그대로 쓰입니다)"""
+    return ShardRouter([Shard(i, 9000 + i, list(languages), []) for i, languages in enumerate(owned)])
+
+def send(shard_router: ShardRouter, language, count: int = 1):
+    for _ in range(count):
+        shard_router._route(language)
+
+def test_languages_are_dealt_to_shards_in_turn():
+    assert assign_languages(["ko", "en", "ja", "zh", "fr"], 2) == [["ko", "ja", "fr"], ["en", "zh"]]
+
+def test_language_is_read_from_form_and_json_bodies():
+    boundary = b"--x\r\nContent-Disposition: form-data; name=\"language\"\r\n\r\nja\r\n--x--\r\n"
+    assert language_from_body(boundary, "multipart/form-data; boundary=x") == "ja"
+    assert language_from_body(b"language=en&model_size=small", "application/x-www-form-urlencoded") == "en"
+    assert language_from_body(json.dumps({"language": "ko"}).encode(), "application/json") == "ko"
+    assert language_from_body(b"{not json", "application/json") is None
+    assert language_from_body(b"\0\1", "application/octet-stream") is None
+
+def test_requests_go_to_the_shard_that_owns_the_language():
+    shard_router = router(["ko", "ja"], ["en"])
+    assert shard_router._pick(shard_router._route("en")).index == 1
+    assert shard_router._pick(shard_router._route("ja")).index == 0
+    assert shard_router._counts == {"en": 1, "ja": 1}
+
+def test_unknown_languages_use_the_default_shard_without_being_recorded():
+    shard_router = router(["en"], [DEFAULT_LANGUAGE])
+    for language in ("auto", "xx" * 100, None):
+        assert shard_router._pick(shard_router._route(language)).index == 1
+    assert shard_router._counts == {DEFAULT_LANGUAGE: 1}
+    shard_router.rebalance(1.0)
+    assert set(shard_router.routes) == {"en", DEFAULT_LANGUAGE}
+    assert set(shard_router.rates) == {DEFAULT_LANGUAGE}
+
+def test_hot_language_is_replicated_and_gathered_back_when_it_cools():
+    shard_router = router(["ko"], ["en"], ["ja"])
+    send(shard_router, "ko", 90)
+    send(shard_router, "en", 5)
+    send(shard_router, "ja", 5)
+    shard_router.rebalance(1.0)
+    assert sorted(shard_router.routes["ko"]) == [0, 1, 2]
+    assert shard_router.routes["ko"][0] == 0
+
+    for _ in range(10):
+        for language in ("ko", "en", "ja"):
+            send(shard_router, language, 30)
+        shard_router.rebalance(1.0)
+    assert shard_router.routes == {"ko": [0], "en": [1], "ja": [2]}
@@ -0,0 +1,102 @@
+# ariel_backend/tests/test_single_flight.py
+import asyncio
+
+import pytest
+
+from ariel_backend.services.single_flight import SingleFlight, flight_key
+
+class Computation:
+    """start() 가 불린 횟수를 세고, 테스트가 finish() 할 때까지 끝나지 않는 계산."""
+    def __init__(self):
+        self.starts = 0
+        self.cancelled = False
+        self._done = asyncio.Event()
+
+    async def start(self):
+        self.starts += 1
+        try:
+            await self._done.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return "result"
+
+    def finish(self):
+        self._done.set()
+
+def test_flight_key_depends_on_payload_and_params():
+    assert flight_key(b"audio", "ko", None) == flight_key(b"audio", "ko", None)
+    assert flight_key(b"audio", "ko", None) != flight_key(b"audio", "en", None)
+    assert flight_key(b"audio", "ko", None) != flight_key(b"other", "ko", None)
+
+def test_concurrent_requests_share_one_computation():
+    async def main():
+        flights = SingleFlight("test", enabled=True)
+        work = Computation()
+        waiters = [asyncio.ensure_future(flights.run("key", work.start)) for _ in range(3)]
+        await asyncio.sleep(0)
+        work.finish()
+        return await asyncio.gather(*waiters), work.starts, flights.stats()
+
+    results, starts, stats = asyncio.run(main())
+    assert results == ["result"] * 3
+    assert starts == 1
+    assert stats["coalesced"] == 2
+    assert stats["in_flight"] == 0
+
+def test_computation_survives_until_the_last_waiter_leaves():
+    async def main():
+        flights = SingleFlight("test", enabled=True)
+        work = Computation()
+        first = asyncio.ensure_future(flights.run("key", work.start))
+        second = asyncio.ensure_future(flights.run("key", work.start))
+        await asyncio.sleep(0)
+
+        # 처음 요청(leader)이 떠나도 다른 요청이 기다리고 있으므로 계산은 계속됩니다.
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.sleep(0)
+        assert not work.cancelled
+        assert flights.stats()["cancelled"] == 0
+
+        # 마지막 요청이 떠나면 아무도 결과를 기다리지 않으므로 계산을 취소합니다.
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+        await asyncio.sleep(0)
+        return work.cancelled, flights.stats()
+
+    cancelled, stats = asyncio.run(main())
+    assert cancelled
+    assert stats["cancelled"] == 1
+    assert stats["in_flight"] == 0
+
+def test_remaining_waiter_gets_the_result_after_the_leader_leaves():
+    async def main():
+        flights = SingleFlight("test", enabled=True)
+        work = Computation()
+        leader = asyncio.ensure_future(flights.run("key", work.start))
+        follower = asyncio.ensure_future(flights.run("key", work.start))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        work.finish()
+        return await follower, work.starts
+
+    assert asyncio.run(main()) == ("result", 1)
+
+def test_disabled_single_flight_runs_every_request():
+    starts = []
+
+    async def start():
+        starts.append(1)
+        await asyncio.sleep(0)
+        return len(starts)
+
+    async def main():
+        flights = SingleFlight("test", enabled=False)
+        return await asyncio.gather(flights.run("key", start), flights.run("key", start))
+
+    assert sorted(asyncio.run(main())) == [2, 2]
+    assert len(starts) == 2
@@ -0,0 +1,45 @@
+# ariel_backend/tests/test_stt_grammar.py
+import json
+
+import pytest
+
+from ariel_backend.services import stt_grammar
+from ariel_backend.services.stt_grammar import UNKNOWN_TOKEN, GrammarRegistry, normalize_phrases
+
+def test_normalize_phrases_lowercases_collapses_spaces_and_dedupes():
+    assert normalize_phrases(["Next  Slide", "next slide", " ", "STOP"]) == ["next slide", "stop"]
+
+def test_same_phrases_in_any_order_share_one_grammar():
+    registry = GrammarRegistry()
+    first = registry.register("en", ["stop", "Next slide"])
+    second = registry.register("en", ["next  slide", "STOP"])
+    assert second is first
+    assert json.loads(first.json) == ["next slide", "stop", UNKNOWN_TOKEN]
+    # 언어가 다르면 다른 문법입니다.
+    assert registry.register("ko", ["stop", "next slide"]).grammar_id != first.grammar_id
+
+def test_registry_drops_the_least_recently_used_grammar():
+    registry = GrammarRegistry(max_size=2)
+    a = registry.register("en", ["a"])
+    b = registry.register("en", ["b"])
+    registry.get(a.grammar_id)
+    registry.register("en", ["c"])
+    assert registry.get(a.grammar_id) is a
+    with pytest.raises(ValueError, match="Unknown grammar_id"):
+        registry.get(b.grammar_id)
+
+def test_register_rejects_empty_and_oversized_phrase_lists(monkeypatch):
+    registry = GrammarRegistry()
+    with pytest.raises(ValueError, match="at least one"):
+        registry.register("en", ["", "   "])
+    monkeypatch.setattr(stt_grammar, "MAX_PHRASES", 2)
+    with pytest.raises(ValueError, match="Too many phrases"):
+        registry.register("en", ["a", "b", "c"])
+
+def test_remove_unknown_grammar_raises():
+    registry = GrammarRegistry()
+    grammar = registry.register("en", ["yes", "no"])
+    registry.remove(grammar.grammar_id)
+    assert registry.list() == []
+    with pytest.raises(ValueError):
+        registry.remove(grammar.grammar_id)
@@ -0,0 +1,58 @@
+# ariel_backend/tests/test_translator.py
+import pytest
+
+from ariel_backend.services import translator
+from ariel_backend.services.translator import TranslationError, TranslationService, Translator
+
+class RecordingTranslator(Translator):
+    """받은 글줄 목록을 기록하고, 글줄마다 '<대상 언어>:<원문>' 을 돌려주는 번역기."""
+    def __init__(self, name: str = "recording"):
+        super().__init__(name)
+        self.calls = []
+
+    def translate(self, texts, source_lang, target_lang, api_key=None):
+        self.calls.append(list(texts))
+        return [f"{target_lang}:{text}" for text in texts]
+
+@pytest.fixture
+def recording(monkeypatch):
+    engine = RecordingTranslator()
+    monkeypatch.setitem(translator._TRANSLATORS, engine.name, engine)
+    return engine
+
+def test_only_new_lines_are_sent_to_the_translator(recording):
+    service = TranslationService(max_size=16)
+    assert service.translate(["a", "b", "a"], "ja", "ko", "recording") == ["KO:a", "KO:b", "KO:a"]
+    assert service.translate(["b", "c"], "JA", "KO", "recording") == ["KO:b", "KO:c"]
+    # 같은 프레임 안의 중복 글줄과 이전 프레임에서 번역한 글줄은 다시 보내지 않습니다.
+    assert recording.calls == [["a", "b"], ["c"]]
+    stats = service.stats()
+    assert (stats["lines"], stats["cached_lines"], stats["api_calls"]) == (5, 1, 2)
+
+def test_cache_is_keyed_by_language_pair(recording):
+    service = TranslationService(max_size=16)
+    service.translate(["a"], "ja", "ko", "recording")
+    assert service.translate(["a"], "ja", "en-us", "recording") == ["EN-US:a"]
+    assert service.translate(["a"], None, "ko", "recording") == ["KO:a"]
+    assert len(recording.calls) == 3
+
+def test_cache_keeps_the_most_recently_used_lines(recording):
+    service = TranslationService(max_size=2)
+    service.translate(["a", "b"], "ja", "ko", "recording")
+    service.translate(["a"], "ja", "ko", "recording")
+    service.translate(["c"], "ja", "ko", "recording")
+    service.translate(["a", "b"], "ja", "ko", "recording")
+    assert recording.calls == [["a", "b"], ["c"], ["b"]]
+
+def test_translator_returning_the_wrong_number_of_lines_is_an_error(monkeypatch):
+    class Short(RecordingTranslator):
+        def translate(self, texts, source_lang, target_lang, api_key=None):
+            return super().translate(texts, source_lang, target_lang)[:-1]
+
+    monkeypatch.setitem(translator._TRANSLATORS, "short", Short("short"))
+    with pytest.raises(TranslationError):
+        TranslationService().translate(["a", "b"], "ja", "ko", "short")
+
+def test_unknown_translator_is_rejected():
+    with pytest.raises(ValueError, match="Unknown translator"):
+        TranslationService().translate(["a"], "ja", "ko", "missing")
@@ -1,32 +1,134 @@
 # ariel_client/src/api_client.py
 import logging
+import time
+import uuid
 import requests
 from typing import Optional, Dict, Any
+from urllib.parse import urlparse
+
+from . import audio_codec, frame_codec
+from .frame_codec import RawFrame
 
 logger = logging.getLogger(__name__)
 
+# STT 요청 타임아웃(초). 백엔드에도 같은 값을 마감으로 알려, 응답을 기다리지 않게 된 요청은 디코딩하지 않게 합니다.
+STT_TIMEOUT_S = 20
+
 class APIClient:
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, audio_encoding: str = "auto", client_id: Optional[str] = None,
+                 frame_encoding: str = "auto"):
         if not base_url:
             raise ValueError("API 서버의 URL이 설정되지 않았습니다.")
         self.base_url = base_url
         self.session = requests.Session()
+        self.preferred_audio_encoding = audio_encoding
+        self._audio_encoding = None
+        self.preferred_frame_encoding = frame_encoding
+        self._frame_encoding = None
+        # 백엔드가 원시 프레임(/ocr/raw 등)을 받는지. 없다는 응답(404)을 받으면 PNG 로 보냅니다.
+        self.supports_raw_frames = True
+        # 언어 자동 감지('auto') 결과를 백엔드가 이 클라이언트 세션 동안 재사용하도록 보내는 식별자
+        self.session_id = uuid.uuid4().hex
+        # 설치마다 고정된 클라이언트 ID. 백엔드는 이 값으로 클라이언트 간에 처리 시간을 공정하게 나누고 사용량을 집계합니다.
+        if client_id:
+            self.session.headers['X-Ariel-Client-Id'] = client_id
+        # 백엔드가 OCR+번역 통합 엔드포인트를 쓸 수 있는지. 엔드포인트(404)나 번역기(503)가 없으면 OCR 과 번역을 따로 요청합니다.
+        self.supports_ocr_translate = True
+        # 마지막 ocr_translate() 실패의 HTTP 상태 코드 (연결 실패/시간 초과면 None). 502 는 번역 API 실패, 429 는 과부하입니다.
+        self.ocr_translate_status = None
         logger.info(f"API 클라이언트가 서버({self.base_url})를 대상으로 초기화되었습니다.")
 
-    def stt(self, audio_bytes: bytes, language: str) -> Optional[Dict[str, Any]]:
+    @property
+    def is_local(self) -> bool:
+        return (urlparse(self.base_url).hostname or "") in ("127.0.0.1", "localhost", "::1")
+
+    @property
+    def is_secure(self) -> bool:
+        """API 키 같은 비밀 값을 보내도 되는 연결인지. (같은 PC 의 백엔드이거나 HTTPS)"""
+        return self.is_local or urlparse(self.base_url).scheme == "https"
+
+    @property
+    def audio_encoding(self) -> str:
+        """서버와 협상한 오디오 전송 인코딩. 첫 STT 요청 시 한 번만 서버에 지원 목록을 묻습니다."""
+        if self._audio_encoding is None:
+            try:
+                response = self.session.get(f"{self.base_url}/api/v1/stt/encodings", timeout=5)
+                response.raise_for_status()
+                server_encodings = response.json().get("encodings", ["pcm"])
+            except (requests.exceptions.RequestException, ValueError) as e:
+                logger.warning(f"오디오 인코딩 협상 실패, 압축 없이 전송합니다: {e}")
+                server_encodings = ["pcm"]
+            self._audio_encoding = audio_codec.choose_encoding(self.preferred_audio_encoding, server_encodings, self.is_local)
+            logger.info(f"STT 오디오 전송 인코딩: {self._audio_encoding}")
+        return self._audio_encoding
+
+    @property
+    def frame_encoding(self) -> str:
+        """화면 프레임 전송 형식. (gray/bgra: 원시 픽셀, png: 압축) 백엔드가 원시 프레임을 받지 않으면 png."""
+        if not self.supports_raw_frames:
+            return "png"
+        if self._frame_encoding is None:
+            self._frame_encoding = frame_codec.choose_encoding(self.preferred_frame_encoding, self.is_local)
+            logger.info(f"OCR 프레임 전송 형식: {self._frame_encoding}")
+        return self._frame_encoding
+
+    def encode_frame(self, frame: RawFrame):
+        """캡처한 프레임을 전송 형식(원시 프레임 또는 PNG bytes)으로 바꿉니다."""
+        return frame_codec.encode(frame, self.frame_encoding)
+
+    def _post_image(self, path: str, image, params: dict, headers: Optional[dict], timeout: float) -> requests.Response:
+        """
+        이미지를 보냅니다. RawFrame 이면 픽셀 버퍼를 그대로 path + '/raw' 로, bytes(PNG) 이면 multipart 로 보냅니다.
+        백엔드가 원시 프레임을 받지 않으면(404) PNG 로 바꿔 다시 보내고, 이후에도 PNG 를 씁니다.
+        """
+        if isinstance(image, RawFrame):
+            raw_params = dict(params, width=image.width, height=image.height, format=image.pixel_format, stride=image.stride)
+            raw_headers = dict(headers or {}, **{'Content-Type': 'application/octet-stream'})
+            response = self.session.post(f"{self.base_url}{path}/raw", data=image.data, params=raw_params,
+                                         headers=raw_headers, timeout=timeout)
+            if response.status_code != 404:
+                return response
+            logger.info("백엔드가 원시 프레임을 받지 않습니다. PNG 로 보냅니다.")
+            self.supports_raw_frames = False
+            image = image.to_png()
+        files = {'image_file': ('capture.png', image, 'image/png')}
+        return self.session.post(f"{self.base_url}{path}", files=files, params=params, headers=headers, timeout=timeout)
+
+    def stt(self, audio_bytes: bytes, language: str, sample_rate: int = 16000, channels: int = 1,
+            model_size: Optional[str] = None, captured_at: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         오디오 데이터와 언어 코드를 백엔드 서버로 보내고, STT 결과를 받아옵니다.
-        이 메소드는 새로운 백엔드 API 명세에 맞춰 수정되었습니다.
+        multipart 업로드 대신 raw PCM 본문(application/octet-stream)을 보내고,
+        언어와 샘플 형식은 헤더로 전달하여 백엔드가 본문을 받는 대로 디코딩하게 합니다.
+        본문은 서버와 협상한 인코딩(pcm/zlib-delta/mulaw)으로 압축하여 보냅니다.
+        model_size 를 주면 백엔드가 그 크기에 맞는 STT 엔진(소형: 저지연, 대형: 고정확도)을 사용합니다.
+        language 가 'auto' 이면 백엔드가 언어를 감지하며, 결과의 'language' 에 감지된 언어가 담깁니다.
+        captured_at 은 오디오 녹음 시각(epoch 초, 기본값: 지금)으로, 백엔드가 과부하 시 최신 오디오를 먼저 처리하고
+        너무 오래된 오디오는 버리는 데 사용합니다.
         """
+        if channels != 1:
+            logger.error(f"STT는 Mono 오디오만 지원합니다. (channels={channels})")
+            return None
+
         try:
-            stt_url = f"{self.base_url}/api/v1/stt"
-            # 백엔드는 'audio_file'과 'language' 두 파라미터를 기대합니다.
-            files = {'audio_file': ('recorded_audio.wav', audio_bytes, 'audio/wav')}
-            data = {'language': language}
+            stt_url = f"{self.base_url}/api/v1/stt/raw"
+            headers = {
+                'Content-Type': 'application/octet-stream',
+                'X-Ariel-Language': language,
+                'X-Ariel-Sample-Rate': str(sample_rate),
+                'X-Ariel-Sample-Format': 's16le',
+                'X-Ariel-Audio-Encoding': self.audio_encoding,
+                'X-Ariel-Session-Id': self.session_id,
+                'X-Ariel-Capture-Time': f"{captured_at if captured_at is not None else time.time():.3f}",
+                'X-Ariel-Timeout-Ms': str(STT_TIMEOUT_S * 1000),
+            }
+            if model_size:
+                headers['X-Ariel-Model-Size'] = model_size
+            body = audio_codec.encode(audio_bytes, self.audio_encoding)
 
             logger.debug(f"STT API 요청 전송: url={stt_url}, language={language}")
             # 백엔드 모델 로딩 시간을 고려하여 타임아웃을 20초로 유지합니다.
-            response = self.session.post(stt_url, files=files, data=data, timeout=20)
+            response = self.session.post(stt_url, data=body, headers=headers, timeout=STT_TIMEOUT_S)
             response.raise_for_status()
 
             result = response.json()
@@ -44,16 +146,25 @@ class APIClient:
             logger.error(f"STT 응답 처리 중 알 수 없는 오류 발생: {e}", exc_info=True)
             return None
 
-    def ocr(self, image_bytes: bytes) -> Optional[Dict[str, Any]]:
+    def ocr(self, image, layout: bool = False, languages: Optional[str] = None,
+            region_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
-        이미지 데이터를 백엔드 서버로 보내고, OCR 결과를 받아옵니다.
+        이미지 데이터(PNG bytes 또는 RawFrame)를 백엔드 서버로 보내고, OCR 결과를 받아옵니다.
+        layout=True 이면 결과의 'lines' 에 글줄별 텍스트와 위치(box: 이미지 기준 [x, y, w, h])가 담깁니다.
+        languages 는 원문 언어 코드(DeepL 코드, 예: 'JA'), region_id 는 감시 영역을 구분하는 값입니다.
+        같은 region_id 의 화면은 백엔드가 처음 한 번 감지한 인식 설정(언어/방향/분할 모드)을 다시 씁니다.
         """
         try:
-            ocr_url = f"{self.base_url}/api/v1/ocr"
-            files = {'image_file': ('capture.png', image_bytes, 'image/png')}
+            params = {}
+            if layout:
+                params['layout'] = 'true'
+            if languages:
+                params['languages'] = languages
+            if region_id:
+                params['region_id'] = region_id
             
             logger.debug("OCR API 요청 전송")
-            response = self.session.post(ocr_url, files=files, timeout=10)
+            response = self._post_image("/api/v1/ocr", image, params, None, timeout=10)
             response.raise_for_status()
 
             result = response.json()
@@ -65,4 +176,43 @@ class APIClient:
             return None
         except Exception as e:
             logger.error(f"OCR 응답 처리 중 알 수 없는 오류 발생: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
+
+    def ocr_translate(self, image, target_lang: str, source_lang: Optional[str] = None,
+                      region_id: Optional[str] = None, deepl_api_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        이미지(PNG bytes 또는 RawFrame)를 보내 OCR 과 번역을 한 번의 요청으로 처리합니다.
+        결과의 'patches' 에 글줄마다 원문, 번역, 위치(box: 이미지 기준 [x, y, w, h])가 담깁니다.
+        백엔드가 이 엔드포인트나 번역기를 지원하지 않으면 supports_ocr_translate 를 False 로 바꾸고 None 을 반환합니다.
+        그 밖의 실패도 None 을 반환하며, 실패한 응답의 상태 코드는 ocr_translate_status 에 남깁니다.
+        deepl_api_key 는 평문 HTTP 로는 보내지 않으며, 이때 서버는 자신의 ARIEL_DEEPL_API_KEY 를 씁니다.
+        """
+        self.ocr_translate_status = None
+        try:
+            params = {'target_lang': target_lang}
+            if source_lang:
+                params['source_lang'] = source_lang
+            if region_id:
+                params['region_id'] = region_id
+            headers = {'X-Ariel-DeepL-Key': deepl_api_key} if deepl_api_key and self.is_secure else None
+
+            logger.debug("OCR 번역 API 요청 전송")
+            response = self._post_image("/api/v1/ocr/translate", image, params, headers, timeout=15)
+            if not response.ok:
+                self.ocr_translate_status = response.status_code
+            if response.status_code in (404, 503):
+                logger.info(f"백엔드에서 OCR 번역을 쓸 수 없습니다({response.status_code}). OCR 과 번역을 따로 요청합니다.")
+                self.supports_ocr_translate = False
+                return None
+            response.raise_for_status()
+
+            result = response.json()
+            logger.info(f"OCR 번역 결과 수신: {result.get('timings_ms')}")
+            return result
+
+        except requests.exceptions.RequestException as e:
+            logger.error(f"OCR 번역 API 요청 실패: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"OCR 번역 응답 처리 중 알 수 없는 오류 발생: {e}", exc_info=True)
+            return None
@@ -0,0 +1,45 @@
+# ariel_client/src/audio_codec.py
+import zlib
+
+import numpy as np
+
+# 백엔드(ariel_backend/services/audio_codec.py)와 짝을 이루는 오디오 전송 인코더.
+# 백엔드가 GET /api/v1/stt/encodings 로 알려준 목록 중에서 하나를 골라 사용합니다.
+
+_MULAW_BIAS = 0x84
+_MULAW_CLIP = 32635
+
+def mulaw_encode(pcm: bytes) -> bytes:
+    """16-bit PCM을 8-bit G.711 mu-law 로 압축합니다. (손실, 대역폭 1/2)"""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2).astype(np.int32)
+    sign = (samples < 0).astype(np.int32) << 7
+    magnitude = np.minimum(np.abs(samples), _MULAW_CLIP) + _MULAW_BIAS
+    exponent = np.clip(np.floor(np.log2(magnitude)).astype(np.int32) - 7, 0, 7)
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+
+def zlib_delta_encode(pcm: bytes, level: int = 6) -> bytes:
+    """인접 샘플의 차이를 zlib 으로 압축합니다. (무손실)"""
+    samples = np.frombuffer(pcm, dtype="<i2", count=len(pcm) // 2)
+    deltas = np.diff(samples, prepend=np.int16(0)).astype("<i2")
+    return zlib.compress(deltas.tobytes(), level)
+
+ENCODERS = {
+    "pcm": lambda pcm: pcm,
+    "zlib-delta": zlib_delta_encode,
+    "mulaw": mulaw_encode,
+}
+
+def choose_encoding(preferred: str, server_encodings: list, is_local: bool) -> str:
+    """
+    설정값과 서버가 지원하는 인코딩으로 실제 사용할 인코딩을 고릅니다.
+    'auto' 이면 로컬 서버에는 압축하지 않은 pcm 을, 원격 서버에는 무손실 zlib-delta 를 사용합니다.
+    """
+    if preferred == "auto":
+        preferred = "pcm" if is_local else "zlib-delta"
+    if preferred in ENCODERS and preferred in server_encodings:
+        return preferred
+    return "pcm"
+
+def encode(pcm: bytes, encoding: str) -> bytes:
+    return ENCODERS[encoding](pcm)
@@ -52,6 +52,10 @@ class ConfigManager(QObject):
             "stt_available_models": ["tiny", "base", "small", "medium"],
             "stt_device": "auto",
             "stt_compute_type": "auto",
+            # STT 오디오 전송 인코딩: auto(로컬은 pcm, 원격은 zlib-delta), pcm, zlib-delta, mulaw
+            "stt_audio_encoding": "auto",
+            # OCR 화면 프레임 전송 형식: auto(로컬은 gray, 원격은 png), gray, bgra, png
+            "ocr_frame_encoding": "auto",
 
             # 번역 설정
             "stt_source_language": "auto",
@@ -4,13 +4,14 @@ from PySide6.QtCore import QObject, Slot, Signal, QThread, QRect
 from mss import mss
 import numpy as np
 from skimage.metrics import structural_similarity as ssim
-from PIL import Image
-import io
+
+from ..frame_codec import RawFrame
 
 logger = logging.getLogger(__name__)
 
 class ScreenMonitor(QObject):
-    image_changed = Signal(bytes)
+    # 캡처 프레임(RawFrame, 인코딩하지 않은 BGRA 버퍼)과, 프레임이 차지하는 화면 영역
+    image_changed = Signal(object, QRect)
     finished = Signal()
     status_updated = Signal(str)
 
@@ -20,6 +21,7 @@ class ScreenMonitor(QObject):
             raise ValueError("유효하지 않은 감시 영역입니다.")
         
         self.monitor_rect = {'top': rect.top(), 'left': rect.left(), 'width': rect.width(), 'height': rect.height()}
+        self.region = QRect(rect)
         self.get_stt_overlay_geometry = stt_overlay_getter
         self._is_running = False
         self.last_image_np = None
@@ -59,8 +61,8 @@ class ScreenMonitor(QObject):
                             similarity = ssim(self.last_image_np, current_image_np, channel_axis=2, data_range=255)
                             if similarity < self.similarity_threshold:
                                 logger.info(f"화면 변경 감지 (유사도: {similarity:.4f}). 이미지 처리 요청.")
-                                img_bytes = self.to_bytes(sct_img)
-                                self.image_changed.emit(img_bytes)
+                                # PNG 인코딩은 전송 형식이 png 일 때만 번역 워커에서 합니다.
+                                self.image_changed.emit(RawFrame.from_mss(sct_img), self.region)
                         
                         self.last_image_np = current_image_np
                         QThread.msleep(self.check_interval_ms)
@@ -76,9 +78,3 @@ class ScreenMonitor(QObject):
             self.last_image_np = None
             logger.info("화면 감시가 종료되었습니다.")
             self.finished.emit()
-
-    def to_bytes(self, sct_img) -> bytes:
-        img = Image.frombytes("RGB", sct_img.size, sct_img.bgra, "raw", "BGRX")
-        img_byte_arr = io.BytesIO()
-        img.save(img_byte_arr, format='PNG')
-        return img_byte_arr.getvalue()
\ No newline at end of file
@@ -1,14 +1,19 @@
 # ariel_client/src/core/translation_worker.py (이 코드로 전체 교체)
 import pandas as pd
+from collections import OrderedDict
 from PySide6.QtCore import QObject, Slot, Signal, QRect, QLocale, QCoreApplication
 import logging
 
 from ..config_manager import ConfigManager
 from ..mt_engine import MTEngine
 from ..api_client import APIClient
+from ..frame_codec import RawFrame
 
 logger = logging.getLogger(__name__)
 
+# 화면 번역에서 글줄별 번역 결과를 재사용할 최대 글줄 수. 바뀌지 않은 글줄은 다시 번역하지 않습니다.
+OCR_TRANSLATION_CACHE_SIZE = 512
+
 class TranslationWorker(QObject):
     stt_chunk_translated = Signal(str, str)
     ocr_patches_ready = Signal(list)
@@ -22,6 +27,7 @@ class TranslationWorker(QObject):
         self.config_manager = config_manager
         self._mt_engine = None
         self._api_client = None
+        self._ocr_translations = OrderedDict()
         
         self.is_stt_enabled = False
         self.current_stt_language = "auto"
@@ -38,7 +44,11 @@ class TranslationWorker(QObject):
     def api_client(self):
         if not self._api_client:
             api_url = self.config_manager.get("api_base_url", "http://127.0.0.1:8000")
-            self._api_client = APIClient(base_url=api_url)
+            audio_encoding = self.config_manager.get("stt_audio_encoding", "auto")
+            client_id = self.config_manager.get("client_id", "unknown_client")
+            frame_encoding = self.config_manager.get("ocr_frame_encoding", "auto")
+            self._api_client = APIClient(base_url=api_url, audio_encoding=audio_encoding, client_id=client_id,
+                                         frame_encoding=frame_encoding)
         return self._api_client
     
     @Slot(bool)
@@ -69,16 +79,14 @@ class TranslationWorker(QObject):
             return
 
         try:
-            # [핵심 수정] ConfigManager에서 model_size와 client_id를 가져옴
+            # [핵심 수정] ConfigManager에서 model_size를 가져옴 (client_id 는 APIClient 가 모든 요청에 헤더로 보냄)
             model_size = self.config_manager.get("stt_model_size", "medium")
-            client_id = self.config_manager.get("client_id", "unknown_client")
             
             stt_response = self.api_client.stt(
                 audio_bytes=audio_chunk,
                 sample_rate=16000,
                 channels=1,
                 model_size=model_size,      # [추가]
-                client_id=client_id,        # [추가]
                 language=self.current_stt_language
             )
 
@@ -102,36 +110,104 @@ class TranslationWorker(QObject):
             logger.error(f"STT 오디오 청크 처리 중 예외 발생: {e}", exc_info=True)
             self.error_occurred.emit(f"STT Error: {e}")
 
-    @Slot(bytes)
-    def process_ocr_image(self, image_bytes: bytes):
+    def _translate_ocr_lines(self, texts: list, source_lang, target_lang: str) -> bool:
+        """번역 캐시에 없는 글줄만 한 번에 번역하여 캐시에 넣습니다. 번역에 실패하면 False."""
+        pending = [text for text in dict.fromkeys(texts) if (target_lang, text) not in self._ocr_translations]
+        if pending:
+            logger.debug(f"OCR 글줄 {len(texts)}개 중 {len(pending)}개를 새로 번역합니다.")
+            translated = self.mt_engine.translate_text(pending, source_lang, target_lang)
+            if not translated:
+                return False
+            for text, result in zip(pending, translated):
+                self._ocr_translations[(target_lang, text)] = result
+        for text in texts:
+            self._ocr_translations.move_to_end((target_lang, text))
+        while len(self._ocr_translations) > OCR_TRANSLATION_CACHE_SIZE:
+            self._ocr_translations.popitem(last=False)
+        return True
+
+    @Slot(object, QRect)
+    def process_ocr_image(self, frame, region: QRect = QRect()):
+        """화면 프레임(RawFrame 또는 PNG bytes)을 인식/번역하여 패치를 내보냅니다."""
         try:
+            # 로컬 백엔드에는 PNG 로 압축하지 않고 픽셀 버퍼를 그대로(또는 흑백으로 줄여) 보냅니다.
+            image = self.api_client.encode_frame(frame) if isinstance(frame, RawFrame) else frame
             target_lang = self._resolve_target_language(self.config_manager.get('ocr_target_language', 'auto'))
             self.ocr_status_updated.emit(self.tr("Extracting text from image..."))
-            ocr_response = self.api_client.ocr(image_bytes)
+            # [핵심 수정] OCR 부분에도 동일한 로직 적용
+            source_lang_from_cfg = self.config_manager.get("ocr_source_language", "auto")
+            source_lang_for_api = None if source_lang_from_cfg == 'auto' else source_lang_from_cfg
+
+            # 원문 언어를 정했으면 그 언어로만 인식하고, 감시 영역별로 백엔드가 인식 설정을 기억하게 합니다.
+            region_id = f"{region.x()},{region.y()},{region.width()},{region.height()}" if region.isValid() else None
+            if self.api_client.supports_ocr_translate:
+                # 백엔드가 인식과 번역을 한 번에 처리합니다. (왕복 한 번)
+                result = self.api_client.ocr_translate(image, target_lang, source_lang_for_api, region_id,
+                                                       self.config_manager.get("deepl_api_key") or None)
+                if result is not None:
+                    self._emit_translated_patches(result["patches"], region)
+                    return
+                status = self.api_client.ocr_translate_status
+                if status == 502:
+                    self.error_occurred.emit(self.tr("Translation failed. Check API key and usage."))
+                    return
+                if status == 429:
+                    self.error_occurred.emit(self.tr("The OCR server is busy. Retrying with the next capture."))
+                    return
+                # 시간 초과, OCR 오류 등 번역 API 와 상관없는 실패는 OCR 과 번역을 따로 요청해 봅니다.
+
+            ocr_response = self.api_client.ocr(image, layout=True, languages=source_lang_for_api, region_id=region_id)
             if ocr_response is None or not ocr_response.get("text"):
                 self.ocr_patches_ready.emit([])
                 self.ocr_status_updated.emit("")
                 return
             original_text = ocr_response.get("text")
             self.ocr_status_updated.emit(self.tr("Translating text..."))
-            
-            # [핵심 수정] OCR 부분에도 동일한 로직 적용
-            source_lang_from_cfg = self.config_manager.get("ocr_source_language", "auto")
-            source_lang_for_api = None if source_lang_from_cfg == 'auto' else source_lang_from_cfg
-            
-            translated_text = self.mt_engine.translate_text(original_text, source_lang_for_api, target_lang)
-            
-            if not translated_text:
+
+            lines = ocr_response.get("lines")
+            if lines is None:
+                # 글줄 위치를 주지 않는 이전 버전의 백엔드: 전체 텍스트를 감시 영역 하나로 번역합니다.
+                translated_text = self.mt_engine.translate_text(original_text, source_lang_for_api, target_lang)
+                if not translated_text:
+                    self.error_occurred.emit(self.tr("Translation failed. Check API key and usage."))
+                    return
+                rect = region if region.isValid() else QRect(0, 0, 100, 50)
+                self.ocr_patches_ready.emit([{'original': original_text, 'translated': translated_text, 'rect': rect}])
+                self.ocr_status_updated.emit("")
+                return
+
+            # 글줄마다 패치를 만들고, 이전 화면에서 이미 번역한 글줄은 캐시된 번역을 씁니다.
+            texts = [line["text"] for line in lines]
+            if not self._translate_ocr_lines(texts, source_lang_for_api, target_lang):
                 self.error_occurred.emit(self.tr("Translation failed. Check API key and usage."))
                 return
-                
-            mock_rect = QRect(0, 0, 100, 50)
-            patches = [{'original': original_text, 'translated': translated_text, 'rect': mock_rect}]
+
+            patches = []
+            for line in lines:
+                x, y, w, h = line["box"]
+                patches.append({
+                    'original': line["text"],
+                    'translated': self._ocr_translations[(target_lang, line["text"])],
+                    'rect': QRect(region.left() + x, region.top() + y, w, h),
+                })
             self.ocr_patches_ready.emit(patches)
             self.ocr_status_updated.emit("")
         except Exception as e:
             logger.error(f"OCR 이미지 처리 중 예외 발생: {e}", exc_info=True)
             self.error_occurred.emit(f"OCR Error: {e}")
 
+    def _emit_translated_patches(self, patches: list, region: QRect):
+        """백엔드가 번역까지 마친 패치(이미지 기준 box)를 화면 좌표의 패치로 바꿔 내보냅니다."""
+        result = []
+        for patch in patches:
+            x, y, w, h = patch["box"]
+            result.append({
+                'original': patch["original"],
+                'translated': patch["translated"],
+                'rect': QRect(region.left() + x, region.top() + y, w, h),
+            })
+        self.ocr_patches_ready.emit(result)
+        self.ocr_status_updated.emit("")
+
     def tr(self, text: str) -> str:
         return QCoreApplication.translate("TranslationWorker", text)
\ No newline at end of file
@@ -0,0 +1,60 @@
+# ariel_client/src/frame_codec.py
+import io
+
+import numpy as np
+from PIL import Image
+
+# 백엔드(ariel_backend/services/ocr_preprocess.py 의 RawFrame)와 짝을 이루는 화면 프레임 전송 형식.
+#   bgra: mss 캡처 버퍼를 그대로 (인코딩 비용 없음, 픽셀당 4바이트)
+#   gray: 8비트 흑백으로 줄여서 (OCR 은 흑백으로 인식하므로 손실 없음, 픽셀당 1바이트)
+#   png : PNG 로 압축 (원격/저대역폭 연결용, 인코딩/디코딩 CPU 비용이 큼)
+FRAME_ENCODINGS = ("gray", "bgra", "png")
+
+class RawFrame:
+    """화면 캡처 픽셀 버퍼. 행마다 stride 바이트이며 각 행의 앞 width * 픽셀 크기 바이트가 픽셀입니다."""
+    def __init__(self, data, width: int, height: int, pixel_format: str = "bgra", stride: int = None):
+        self.data = data
+        self.width = width
+        self.height = height
+        self.pixel_format = pixel_format
+        self.stride = stride or width * (4 if pixel_format == "bgra" else 1)
+
+    @classmethod
+    def from_mss(cls, sct_img) -> "RawFrame":
+        """mss 캡처 결과의 BGRA 버퍼를 복사하지 않고 감쌉니다."""
+        return cls(sct_img.raw, sct_img.width, sct_img.height, "bgra")
+
+    def to_gray(self) -> "RawFrame":
+        """BGRA 프레임을 8비트 흑백 프레임으로 줄입니다. (ITU-R BT.601 가중치, 백엔드와 같은 정수 연산)"""
+        if self.pixel_format == "gray":
+            return self
+        rows = np.frombuffer(self.data, dtype=np.uint8, count=self.stride * self.height).reshape(self.height, self.stride)
+        pixels = rows[:, :self.width * 4].reshape(self.height, self.width, 4)
+        weighted = pixels[..., 0] * np.uint16(29) + pixels[..., 1] * np.uint16(150) + pixels[..., 2] * np.uint16(77)
+        return RawFrame(((weighted + 128) >> 8).astype(np.uint8).tobytes(), self.width, self.height, "gray")
+
+    def to_png(self) -> bytes:
+        if self.pixel_format == "gray":
+            image = Image.frombytes("L", (self.width, self.height), bytes(self.data), "raw", "L", self.stride)
+        else:
+            image = Image.frombytes("RGB", (self.width, self.height), bytes(self.data), "raw", "BGRX", self.stride)
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        return buffer.getvalue()
+
+def choose_encoding(preferred: str, is_local: bool) -> str:
+    """
+    설정값으로 실제 사용할 프레임 전송 형식을 고릅니다.
+    'auto' 이면 로컬 서버에는 흑백 원시 프레임을, 원격 서버에는 PNG 를 사용합니다.
+    """
+    if preferred == "auto":
+        return "gray" if is_local else "png"
+    return preferred if preferred in FRAME_ENCODINGS else "png"
+
+def encode(frame: RawFrame, encoding: str):
+    """프레임을 전송 형식으로 바꿉니다. png 이면 PNG bytes, 아니면 RawFrame 을 반환합니다."""
+    if encoding == "png":
+        return frame.to_png()
+    if encoding == "gray":
+        return frame.to_gray()
+    return frame